@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""End-to-end benchmark suite for the orchestrator graph.
+
+This script measures the framework overhead of the agent system offline by
+running it against the FakeLlm backend with zero simulated latency, so every
+millisecond reported is spent in our code or the ADK rather than in a model.
+
+Benchmarks:
+- import_time: Cold ``import my_agent_system`` in a fresh interpreter
+- construction: Building the whole root agent graph with an empty agent
+  cache, and creating each cached sub-agent again (an agent cache hit)
+- turn_overhead: One turn through OrchestratorAgent -> AgentTool(SearchAgent)
+  and one through ModularResearchAssistant (researcher -> analyzer -> responder)
+- tool_dispatch: Direct FunctionTool dispatch, and a data_formatter call
+  with and without the tool result cache
+- session_growth: Events and serialized session size after many turns
+- sentiment: Per-text cost of the batch sentiment analyzer against scoring
+  one text at a time and against the original substring scan, and of small
+  batches with and without the per-text fallback
+- key_points: Sentence segmentation, TextRank key-point extraction and
+  MinHash/LSH near-duplicate removal for a research report of 2,000 sentences
+- session_store: SqliteSessionService append throughput, and session-load
+  latency and events decoded per load for a session with 10,000 events
+
+Results are compared against ``baselines.json``; a metric regresses when it
+exceeds its baseline by more than the tolerance stored there. Reference
+metrics (the timings of code kept only for comparison, such as the original
+sentiment scan) are reported for information but never stored or compared.
+
+Usage:
+    python benchmarks/run_benchmarks.py                  # run and compare
+    python benchmarks/run_benchmarks.py --update-baselines
+    python benchmarks/run_benchmarks.py --only turn_overhead --iterations 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import yaml
+
+benchmarks_dir = os.path.abspath(os.path.dirname(__file__))
+project_root = os.path.dirname(benchmarks_dir)
+sys.path.insert(0, project_root)
+
+BASELINES_PATH = os.path.join(benchmarks_dir, "baselines.json")
+
+# Tolerance used for metrics that have no explicit entry in baselines.json
+DEFAULT_TOLERANCE = 0.5
+
+# Prefixes of informational metrics that time reference implementations
+REFERENCE_METRIC_PREFIXES = ("sentiment_legacy", "sentiment_small_vectorized")
+
+
+def is_reference_metric(metric: str) -> bool:
+    """Return True if ``metric`` is informational and never compared."""
+    return metric.startswith(REFERENCE_METRIC_PREFIXES)
+
+
+def write_offline_config() -> str:
+    """Write a copy of config.yaml that selects the zero-latency fake model.
+
+    The optional optimizations, which config.yaml ships disabled, are
+    enabled, so the baselines measure the optimized graph.
+
+    Returns:
+        The path of the temporary config file
+    """
+    with open(os.path.join(project_root, "config.yaml"), "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+    config.setdefault("agent_settings", {})["model"] = "fake/bench"
+    config["fake_llm"] = {"seed": 0, "latency": {"distribution": "fixed", "mean_ms": 0}, "tokens_per_second": 0}
+    config["note_store"] = {"path": ":memory:"}
+    for section in ("budgets", "context_compaction", "session_state", "search_cache", "tool_cache"):
+        config.setdefault(section, {})["enabled"] = True
+    handle, path = tempfile.mkstemp(prefix="bench_config_", suffix=".yaml")
+    with os.fdopen(handle, "w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f)
+    return path
+
+
+def _timed(fn, iterations: int) -> list:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def _timed_async(fn, iterations: int) -> list:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _ms(samples: list) -> float:
+    """Median of ``samples`` in milliseconds."""
+    return round(statistics.median(samples) * 1000, 3)
+
+
+def bench_import_time(iterations: int) -> dict:
+    """Measure a cold import of the package in a fresh interpreter."""
+    code = "import my_agent_system"
+    samples = _timed(
+        lambda: subprocess.run([sys.executable, "-c", code], cwd=project_root, check=True,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL),
+        max(1, iterations // 10),
+    )
+    return {"import_time_ms": _ms(samples)}
+
+
+def bench_construction(iterations: int) -> dict:
+    """Measure building the root agent graph and agent cache hits.
+
+    ``build_root_agent()`` builds the research stages uncached, so it cannot
+    show the agent cache; hits are measured on the cached sub-agents
+    directly. Both are sub-millisecond, so many more samples are taken.
+    """
+    from my_agent_system import agent as agent_module
+    from agents.base_agent import BaseAgent
+
+    agents = [
+        agent_module.search_agent, agent_module.researcher_agent, agent_module.parallel_researcher_agent,
+        agent_module.compactor_agent, agent_module.analyzer_agent, agent_module.responder_agent,
+    ]
+
+    def _graph():
+        BaseAgent.invalidate_agent_cache()
+        agent_module.build_root_agent()
+
+    def _cache_hits():
+        for agent in agents:
+            agent.create_agent()
+
+    samples = iterations * 10
+    graph = _timed(_graph, samples)
+    _cache_hits()
+    hits = _timed(_cache_hits, samples)
+    return {
+        "construction_graph_ms": _ms(graph),
+        "construction_cache_hit_us": round(statistics.median(hits) / len(agents) * 1e6, 2),
+    }
+
+
+def bench_turn_overhead(iterations: int) -> dict:
+    """Measure per-turn framework overhead for tool delegation and research transfer."""
+    from my_agent_system import agent as agent_module
+    from my_agent_system.services.runner_service import RunnerService
+
+    async def _main():
+        service = RunnerService(agent_module.root_agent, max_concurrency=1)
+
+        async def _turn(text):
+            session = await service.create_session("bench")
+            result = await service.run_turn("bench", session.id, text)
+            if result.error:
+                raise RuntimeError(result.error)
+
+        search = await _timed_async(lambda: _turn("What is the tallest mountain?"), iterations)
+        research = await _timed_async(lambda: _turn("Research renewable energy adoption"), iterations)
+        await service.close()
+        return {"turn_search_tool_ms": _ms(search), "turn_research_pipeline_ms": _ms(research)}
+
+    return asyncio.run(_main())
+
+
+def bench_tool_dispatch(iterations: int) -> dict:
+    """Measure dispatching a FunctionTool outside of any model turn, plain and memoized."""
+    import my_agent_system  # noqa: F401  (sets up the package import paths)
+    from google.adk.tools import FunctionTool
+    from shared.tool_cache import MemoizedFunctionTool, ToolResultCache
+    from tools.custom_tools import data_formatter, sentiment_analyzer
+
+    tool = FunctionTool(func=sentiment_analyzer)
+    formatter = FunctionTool(func=data_formatter)
+    memoized = MemoizedFunctionTool(formatter, ToolResultCache())
+
+    async def _main():
+        args = {"text": "I love this great product"}
+        samples = await _timed_async(lambda: tool.run_async(args=args, tool_context=None), iterations)
+        records = json.dumps([{"id": i, "name": f"item {i}", "tags": ["a", "b"]} for i in range(200)])
+        format_args = {"data": records, "format_type": "xml"}
+        plain = await _timed_async(lambda: formatter.run_async(args=format_args, tool_context=None), iterations)
+        cached = await _timed_async(lambda: memoized.run_async(args=format_args, tool_context=None), iterations)
+        return {
+            "tool_dispatch_us": round(statistics.median(samples) * 1e6, 2),
+            "tool_format_200_records_us": round(statistics.median(plain) * 1e6, 2),
+            "tool_format_200_records_memoized_us": round(statistics.median(cached) * 1e6, 2),
+        }
+
+    return asyncio.run(_main())
+
+
+def _legacy_sentiment(text: str, positive_words: list, negative_words: list) -> dict:
+    """The original sentiment_analyzer: one substring scan per lexicon word."""
+    text_lower = text.lower()
+    positive_count = sum(1 for word in positive_words if word in text_lower)
+    negative_count = sum(1 for word in negative_words if word in text_lower)
+    if positive_count > negative_count:
+        sentiment = "positive"
+        score = positive_count / (positive_count + negative_count + 1)
+    elif negative_count > positive_count:
+        sentiment = "negative"
+        score = -negative_count / (positive_count + negative_count + 1)
+    else:
+        sentiment = "neutral"
+        score = 0
+    return {
+        "sentiment": sentiment,
+        "score": round(score, 2),
+        "explanation": f"Identified {positive_count} positive and {negative_count} negative sentiment words."
+    }
+
+
+def bench_sentiment(iterations: int) -> dict:
+    """Measure sentiment scoring of 5,000 review-sized texts, in us per text.
+
+    All implementations run with the default 20-word lexicon and with a
+    2,000-word lexicon, where the substring scan pays for every word. The
+    texts are also scored in batches of 4, below VECTORIZE_MIN_BATCH, to show
+    what the per-text fallback saves over forcing NumPy on small batches.
+    """
+    import my_agent_system  # noqa: F401  (sets up the package import paths)
+    from tools.sentiment import DEFAULT_LEXICON, SentimentAnalyzer
+
+    words = ("the battery life is great but the screen is poor and the support was "
+             "disappointing although I like the design and the price is good").split()
+    texts = [" ".join(words[i % 7:] + words[:i % 7]) for i in range(5000)]
+    large = dict(DEFAULT_LEXICON)
+    large.update({f"term{i}": 1.0 if i % 2 else -1.0 for i in range(len(large), 2000)})
+    rounds = max(1, iterations // 4)
+
+    results = {}
+    for name, lexicon in (("", DEFAULT_LEXICON), ("_2k_lexicon", large)):
+        positive_words = [word for word, weight in lexicon.items() if weight > 0]
+        negative_words = [word for word, weight in lexicon.items() if weight < 0]
+        analyzer = SentimentAnalyzer(lexicon)
+        legacy = _timed(lambda: [_legacy_sentiment(t, positive_words, negative_words) for t in texts], rounds)
+        per_text = _timed(lambda: [analyzer.analyze(t) for t in texts], rounds)
+        batch = _timed(lambda: analyzer.analyze_batch(texts), rounds)
+        results[f"sentiment_legacy{name}_us"] = round(statistics.median(legacy) / len(texts) * 1e6, 3)
+        results[f"sentiment_per_text{name}_us"] = round(statistics.median(per_text) / len(texts) * 1e6, 3)
+        results[f"sentiment_batch{name}_us"] = round(statistics.median(batch) / len(texts) * 1e6, 3)
+
+    small_batches = [texts[i:i + 4] for i in range(0, len(texts), 4)]
+    for name, analyzer in (("", SentimentAnalyzer()), ("_vectorized", SentimentAnalyzer(min_batch=0))):
+        small = _timed(lambda: [analyzer.analyze_batch(b) for b in small_batches], rounds)
+        results[f"sentiment_small{name}_us"] = round(statistics.median(small) / len(texts) * 1e6, 3)
+    return results
+
+
+def bench_key_points(iterations: int) -> dict:
+    """Measure segmenting, ranking and deduplicating a 2,000-sentence report, in ms."""
+    import my_agent_system  # noqa: F401  (sets up the package import paths)
+    from shared.dedup import deduplicate
+    from shared.utils import extract_key_points, split_sentences
+
+    topics = ["qubit error correction", "superconducting circuits", "trapped ion clocks",
+              "photonic networks", "quantum advantage claims", "cryogenic cooling costs"]
+    text = " ".join(
+        f"Study {i} (e.g. Fig. {i % 9}) reports {i % 13}.5% gains in {topics[i % len(topics)]}. "
+        for i in range(2000)
+    )
+    sentences = split_sentences(text)
+    rounds = max(1, iterations // 4)
+    return {
+        "key_points_segment_ms": _ms(_timed(lambda: split_sentences(text), rounds)),
+        "key_points_textrank_ms": _ms(_timed(lambda: extract_key_points(text, 12), rounds)),
+        "key_points_dedup_ms": _ms(_timed(lambda: deduplicate(sentences, 0.6, shingle_size=2), rounds)),
+    }
+
+
+def bench_session_growth(iterations: int) -> dict:
+    """Measure how a single session grows over many research turns."""
+    from my_agent_system import agent as agent_module
+    from my_agent_system.services.runner_service import RunnerService
+
+    async def _main():
+        service = RunnerService(agent_module.root_agent)
+        session = await service.create_session("bench")
+        turns = max(1, iterations // 2)
+        for i in range(turns):
+            await service.run_turn("bench", session.id, f"Research topic number {i}")
+        stored = await service.session_service.get_session(
+            app_name=service.app_name, user_id="bench", session_id=session.id
+        )
+        await service.close()
+        session_bytes = len(stored.model_dump_json())
+        state_bytes = len(json.dumps(stored.state, default=str))
+        return {
+            "session_events_per_turn": round(len(stored.events) / turns, 2),
+            "session_bytes_per_turn": round(session_bytes / turns, 1),
+            "session_state_bytes": state_bytes,
+        }
+
+    return asyncio.run(_main())
+
+
+def bench_session_store(iterations: int) -> dict:
+    """Measure event appends and session loads of the SQLite session service."""
+    import my_agent_system  # noqa: F401  (sets up the package import paths)
+    from google.adk.events import Event, EventActions
+    from google.genai import types
+    from my_agent_system.services.sqlite_session_service import SqliteSessionService
+
+    events = 10_000
+    text = "Quantum computing uses qubits to explore many states at once. " * 4
+
+    async def _main(path):
+        # The config.yaml defaults: snapshot every 100 events, keep 500 live
+        service = SqliteSessionService(path, snapshot_interval=100, keep_events=500)
+        session = await service.create_session(app_name="bench", user_id="bench")
+        start = time.perf_counter()
+        for i in range(events):
+            await service.append_event(session, Event(
+                author="ResearcherAgent",
+                invocation_id=f"inv-{i // 10}",
+                content=types.Content(role="model", parts=[types.Part(text=text)]),
+                actions=EventActions(state_delta={"turn": i, "research_output": text}),
+            ))
+        await service.flush()
+        append = time.perf_counter() - start
+        loads = await _timed_async(
+            lambda: service.get_session(app_name="bench", user_id="bench", session_id=session.id),
+            iterations,
+        )
+        rehydration = service.rehydration.summary()
+        service.close()
+        return {
+            "session_append_us": round(append / events * 1e6, 2),
+            "session_load_ms": _ms(loads),
+            "session_load_events": rehydration["events_decoded_per_load"],
+        }
+
+    with tempfile.TemporaryDirectory() as directory:
+        return asyncio.run(_main(os.path.join(directory, "sessions.db")))
+
+
+BENCHMARKS = {
+    "import_time": bench_import_time,
+    "construction": bench_construction,
+    "turn_overhead": bench_turn_overhead,
+    "tool_dispatch": bench_tool_dispatch,
+    "session_growth": bench_session_growth,
+    "sentiment": bench_sentiment,
+    "key_points": bench_key_points,
+    "session_store": bench_session_store,
+}
+
+
+def load_baselines() -> dict:
+    """Load stored baselines, or an empty set if none exist yet."""
+    if not os.path.exists(BASELINES_PATH):
+        return {"tolerance": {}, "metrics": {}}
+    with open(BASELINES_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(results: dict, baselines: dict) -> list:
+    """Return a list of (metric, value, baseline, limit) for regressed metrics."""
+    regressions = []
+    tolerances = baselines.get("tolerance", {})
+    for metric, value in results.items():
+        if is_reference_metric(metric):
+            continue
+        baseline = baselines.get("metrics", {}).get(metric)
+        if baseline is None:
+            continue
+        limit = baseline * (1 + tolerances.get(metric, DEFAULT_TOLERANCE))
+        if value > limit:
+            regressions.append((metric, value, baseline, round(limit, 3)))
+    return regressions
+
+
+def main() -> int:
+    """Run the selected benchmarks and compare them with the baselines."""
+    parser = argparse.ArgumentParser(description="Benchmark the agent graph offline.")
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), help="Benchmarks to run")
+    parser.add_argument("--iterations", type=int, default=20, help="Samples per benchmark")
+    parser.add_argument("--update-baselines", action="store_true", help="Store results as the new baselines")
+    args = parser.parse_args()
+
+    # The config path must be set before the agent system is imported
+    config_path = write_offline_config()
+    os.environ["AGENT_SYSTEM_CONFIG"] = config_path
+
+    results = {}
+    try:
+        for name in args.only or list(BENCHMARKS):
+            print(f"Running {name}...", flush=True)
+            results.update(BENCHMARKS[name](args.iterations))
+    finally:
+        os.remove(config_path)
+
+    baselines = load_baselines()
+    print()
+    print(f"{'metric':<32}{'value':>14}{'baseline':>14}")
+    for metric, value in results.items():
+        if is_reference_metric(metric):
+            baseline = "(reference)"
+        else:
+            baseline = baselines.get("metrics", {}).get(metric, "-")
+        print(f"{metric:<32}{value:>14}{baseline:>14}")
+
+    if args.update_baselines:
+        baselines.setdefault("metrics", {}).update(
+            (metric, value) for metric, value in results.items() if not is_reference_metric(metric)
+        )
+        with open(BASELINES_PATH, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nBaselines written to {BASELINES_PATH}")
+        return 0
+
+    regressions = compare(results, baselines)
+    if regressions:
+        print("\nRegressions:")
+        for metric, value, baseline, limit in regressions:
+            print(f"  {metric}: {value} exceeds {limit} (baseline {baseline})")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,50 +12,127 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Evaluation script for the agent system."""
+"""Evaluation script for the agent system.
 
+Runs a JSON Lines dataset (one ``{"id", "input", "expected"}`` object per
+line) through the root agent with the EvalHarness: cases run concurrently
+on a pool of workers, optionally rate limited, and responses are cached by
+prompt and agent configuration, so re-running after a change only executes
+the affected cases. Each case is scored against its expected answer and the
+report lists scores alongside latency percentiles. Defaults come from the
+``evaluation`` section of config.yaml.
+
+Usage:
+    python eval/test_eval.py [DATASET.jsonl] [--workers N] [--rate PER_SECOND]
+                             [--limit N] [--output RESULTS.jsonl] [--no-cache]
+"""
+
+import argparse
 import asyncio
+import json
+import os
+import sys
+from dataclasses import asdict
+from itertools import islice
+
+# Add the project root to the path to enable imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
 import dotenv
 dotenv.load_dotenv()
 
-from google.adk.evaluators import AgentEvaluator
-from google.adk.evaluators.scores import response_match_score
-from google.genai.types import Part, UserContent
-from ..my_agent_system.agent import root_agent
+from my_agent_system.agent import root_agent
+from my_agent_system.services.eval_harness import EvalHarness, ResponseCache, load_cases
+# Imported via the same path as the agents so the shared instance is reused
+from shared.config import config_service
+
+DEFAULT_DATASET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "research_cases.jsonl")
+
+
+def _config_relative(path: str) -> str:
+    """Resolve a path relative to config.yaml."""
+    if os.path.isabs(path):
+        return path
+    return os.path.join(os.path.dirname(os.path.abspath(config_service.path)), path)
 
 
-async def evaluate_agent():
-    """Run evaluation on the agent."""
-    # Create an evaluator
-    evaluator = AgentEvaluator(
-        agent=root_agent,
-        scores=[response_match_score],
+async def evaluate_agent(
+    dataset: str = DEFAULT_DATASET,
+    workers: int = None,
+    rate_limit: float = None,
+    limit: int = None,
+    output: str = None,
+    use_cache: bool = True,
+):
+    """Run the evaluation dataset against the root agent and print a report.
+
+    Args:
+        dataset: Path of the JSON Lines dataset
+        workers: Concurrent cases; defaults to ``evaluation.workers``
+        rate_limit: Maximum case starts per second
+        limit: Only run the first ``limit`` cases
+        output: Write one JSON result per case to this file
+        use_cache: Reuse responses cached by earlier runs
+    """
+    config = config_service.get()
+    cache_path = config_service.get_str('evaluation.cache_path', '')
+    cache = ResponseCache(_config_relative(cache_path)) if use_cache and cache_path else None
+    harness = EvalHarness.from_config(
+        root_agent, config, workers=workers, rate_limit=rate_limit, cache=cache
     )
-    
-    # Define test cases
-    test_cases = [
-        {
-            "input": UserContent(parts=[Part(text="Research the benefits of renewable energy")]),
-            "expected": "Renewable energy has environmental and economic benefits"
-        },
-        {
-            "input": UserContent(parts=[Part(text="Analyze the impact of AI on job markets")]),
-            "expected": "AI has both positive and negative impacts on employment"
-        }
-    ]
-    
-    # Run evaluation
-    results = await evaluator.evaluate(test_cases=test_cases)
-    
-    # Print results
+
+    results_file = open(output, "w", encoding="utf-8") if output else None
+
+    def _report(result):
+        status = "ERROR" if result.error else "PASS" if result.passed else "FAIL"
+        score = "-" if result.score is None else f"{result.score:.3f}"
+        source = "cached" if result.cached else "run"
+        print(f"[{status}] {result.id}: score {score}, {result.latency_s * 1000:.0f} ms ({source})")
+        if results_file is not None:
+            results_file.write(json.dumps(asdict(result), ensure_ascii=False) + "\n")
+
+    cases = load_cases(dataset)
+    if limit is not None:
+        cases = islice(cases, limit)
+    try:
+        report = await harness.run(cases, on_result=_report)
+    finally:
+        if results_file is not None:
+            results_file.close()
+
+    print()
     print("Evaluation Results:")
-    for i, result in enumerate(results):
-        print(f"Test Case {i+1}:")
+    for result in report.results:
+        print(f"Test Case {result.id}:")
         print(f"  Score: {result.score}")
-        print(f"  Input: {test_cases[i]['input'].parts[0].text}")
-        print(f"  Output: {result.output.content.parts[0].text[:100]}...")
+        print(f"  Input: {result.input}")
+        print(f"  Output: {(result.error or result.response)[:100]}...")
         print()
+    print("Summary:")
+    print(json.dumps(report.summary(), indent=2))
+    return report
+
+
+def main():
+    """Parse command line arguments and run the evaluation."""
+    parser = argparse.ArgumentParser(description="Evaluate the agent system on a JSONL dataset.")
+    parser.add_argument("dataset", nargs="?", default=DEFAULT_DATASET, help="JSON Lines dataset")
+    parser.add_argument("--workers", type=int, help="Cases run concurrently")
+    parser.add_argument("--rate", type=float, help="Maximum case starts per second")
+    parser.add_argument("--limit", type=int, help="Only run the first N cases")
+    parser.add_argument("--output", help="Write per-case results to this JSONL file")
+    parser.add_argument("--no-cache", action="store_true", help="Run every case, ignoring cached responses")
+    args = parser.parse_args()
+    asyncio.run(evaluate_agent(
+        args.dataset,
+        workers=args.workers,
+        rate_limit=args.rate,
+        limit=args.limit,
+        output=args.output,
+        use_cache=not args.no_cache,
+    ))
 
 
 if __name__ == "__main__":
-    asyncio.run(evaluate_agent())
\ No newline at end of file
+    main()
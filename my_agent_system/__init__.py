@@ -23,6 +23,7 @@ Agent Development Kit (ADK). It includes:
 - A base agent class for creating new agents
 - Shared utilities for common functionality
 - MCP agents for interacting with external systems
+- Runtime services for serving many sessions concurrently
 
 The system is designed to be easily extensible by adding new sub-agents and tools.
 """
@@ -32,6 +33,7 @@ from . import agents
 from . import tools
 from . import shared
 from . import mcp
+from . import services
 
 # Export the main agent
 root_agent = agent.root_agent
@@ -42,5 +44,6 @@ __all__ = [
     "tools",
     "shared",
     "mcp",
+    "services",
     "root_agent",
 ]
\ No newline at end of file
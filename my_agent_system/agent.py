@@ -21,7 +21,6 @@ sub-agents for sequential workflows.
 
 import sys
 import os
-import yaml
 
 # Add the project root and subdirectories to the path
 project_root = os.path.abspath(os.path.dirname(__file__))
@@ -37,67 +36,155 @@ from google.adk.code_executors import BuiltInCodeExecutor
 # LOAD CONFIGURATION
 # =============================================================================
 
-with open(os.path.join(project_root, '..', 'config.yaml'), 'r', encoding='utf-8') as f:
-    config = yaml.safe_load(f)
-model_name = config['agent_settings']['model']
-
-
-# =============================================================================
-# 1. DEFINE SPECIALIZED AGENTS (THE "EXPERTS")
-# =============================================================================
+# config.yaml is parsed once by the shared config service and hot-reloaded.
+from shared.config import config_service
+from shared.response_cache import SemanticResponseCache
+from shared.model_routing import resolve_model, usage_recorder
+from shared.pre_router import PreRouter
+from shared.session_state import SessionStateManager
+from agents.base_agent import merge_callbacks
+from llm import is_fake_model
+from tools.session_tools import remember_note_session
 
 # Import the simple, single-purpose agents
 from agents.sub_agents.search_agent import search_agent
 
-# An agent that can only execute code.
-coding_agent = Agent(
-    name="CodingAgent",
-    model=model_name,
-    description="A coding specialist. Use this for math, logic, or coding tasks.",
-    code_executor=BuiltInCodeExecutor(),
-)
-
-# The sequential agent for complex research tasks.
+# The agents used by the sequential research workflow.
 from agents.sub_agents.researcher import researcher_agent
+from agents.sub_agents.parallel_researcher import parallel_researcher_agent
+from agents.sub_agents.compactor import compactor_agent
 from agents.sub_agents.analyzer import analyzer_agent
-from agents.sub_agents.responder import responder_agent
-
-main_research_agent = SequentialAgent(
-    name="ModularResearchAssistant",
-    description=(
-        "A modular agentic system that researches topics, analyzes information, "
-        "and generates well-structured responses. Use this for complex, multi-step research tasks."
-    ),
-    sub_agents=[
-        researcher_agent.create_agent(),
-        analyzer_agent.create_agent(),
-        responder_agent.create_agent(),
-    ],
-)
+from agents.sub_agents.responder import responder_agent, is_valid_final_response
 
-# =============================================================================
-# 2. DEFINE THE ORCHESTRATOR (ROOT AGENT)
-# =============================================================================
+# Near-duplicate research prompts are answered from this cache when enabled.
+# It lives at module level so cached responses survive graph rebuilds, and is
+# only recreated when its own settings change.
+response_cache = SemanticResponseCache.from_config(
+    config_service.get('response_cache'), validate=is_valid_final_response
+)
 
-# This root agent uses the hybrid model of orchestration.
-root_agent = Agent(
-    name="OrchestratorAgent",
-    model=model_name,
-    instruction="""You are a master orchestrator. Your job is to delegate tasks.
+# Routes obvious requests before the orchestrator's model call when enabled.
+# Its classifier is trained once here, and its stats() cover every graph built.
+pre_router = PreRouter.from_config(config_service.get('pre_router'))
+
+# Keeps session state bounded by evicting stale intermediate outputs at the
+# end of every turn when enabled.
+session_state_manager = SessionStateManager.from_config(config_service.get('session_state'))
+
+
+def build_root_agent() -> Agent:
+    """Build the orchestrator agent graph from the current configuration."""
+    config = config_service.get()
+    coding_model = resolve_model(config, "CodingAgent")
+
+    # =========================================================================
+    # 1. DEFINE SPECIALIZED AGENTS (THE "EXPERTS")
+    # =========================================================================
+
+    # An agent that can only execute code. The built-in code executor needs a
+    # Gemini model, so it is left out when running against the fake backend.
+    coding_agent = Agent(
+        name="CodingAgent",
+        model=coding_model,
+        description="A coding specialist. Use this for math, logic, or coding tasks.",
+        code_executor=None if is_fake_model(coding_model) else BuiltInCodeExecutor(),
+        **usage_recorder.callbacks(),
+    )
+
+    # The first research stage either issues searches one at a time
+    # (sequential) or plans sub-questions and searches them concurrently.
+    if config_service.get_str('research_pipeline.mode', 'sequential') == 'parallel':
+        research_stage = parallel_researcher_agent
+    else:
+        research_stage = researcher_agent
+
+    # Downstream stages work from compacted findings rather than the raw
+    # research transcript when context compaction is enabled.
+    stages = [research_stage.create_agent(use_cache=False)]
+    if config_service.get_bool('context_compaction.enabled', False):
+        stages.append(compactor_agent.create_agent(use_cache=False))
+    stages.append(analyzer_agent.create_agent(use_cache=False))
+    stages.append(responder_agent.create_agent(use_cache=False))
+
+    # Serve near-duplicate research prompts without running the pipeline
+    cache_callbacks = {}
+    if config_service.get_bool('response_cache.enabled', False):
+        cache_callbacks = {
+            'before_agent_callback': response_cache.before_agent_callback,
+            'after_agent_callback': response_cache.after_agent_callback,
+        }
+
+    # The sequential agent for complex research tasks. Its stages are built
+    # uncached because an ADK agent can only ever have one parent.
+    main_research_agent = SequentialAgent(
+        name="ModularResearchAssistant",
+        description=(
+            "A modular agentic system that researches topics, analyzes information, "
+            "and generates well-structured responses. Use this for complex, multi-step research tasks."
+        ),
+        sub_agents=stages,
+        **cache_callbacks,
+    )
+
+    # =========================================================================
+    # 2. DEFINE THE ORCHESTRATOR (ROOT AGENT)
+    # =========================================================================
+
+    # Notes are keyed on this (the user's) session, also inside AgentTools.
+    # Obvious requests are routed locally; the model only decides the rest
+    orchestrator_callbacks = merge_callbacks(
+        {'before_agent_callback': remember_note_session}, usage_recorder.callbacks()
+    )
+    if config_service.get_bool('pre_router.enabled', False):
+        orchestrator_callbacks = merge_callbacks(pre_router.callbacks(), orchestrator_callbacks)
+    if config_service.get_bool('session_state.enabled', False):
+        orchestrator_callbacks = merge_callbacks(orchestrator_callbacks, {
+            'after_agent_callback': [session_state_manager.after_agent_callback],
+        })
+
+    # This root agent uses the hybrid model of orchestration. Routing is a
+    # classification-style step, so it usually runs on a fast model tier.
+    return Agent(
+        name="OrchestratorAgent",
+        model=resolve_model(config, "OrchestratorAgent"),
+        instruction="""You are a master orchestrator. Your job is to delegate tasks.
 
 You have two ways of delegating:
 1. Use a Tool: For simple, single-purpose tasks like searching or coding, call the appropriate tool (SearchAgent, CodingAgent).
 2. Transfer to a Sub-Agent: For complex, multi-step tasks like research, transfer control to the appropriate sub-agent (ModularResearchAssistant).""",
-    tools=[
-        agent_tool.AgentTool(agent=search_agent.create_agent()),
-        agent_tool.AgentTool(agent=coding_agent),
-    ],
-    sub_agents=[
-        main_research_agent,
-    ]
-)
+        tools=[
+            agent_tool.AgentTool(agent=search_agent.create_agent()),
+            agent_tool.AgentTool(agent=coding_agent),
+        ],
+        sub_agents=[
+            main_research_agent,
+        ],
+        **orchestrator_callbacks,
+    )
+
+
+root_agent = build_root_agent()
+
+
+@config_service.on_change
+def _rebuild_root_agent(old_config: dict, new_config: dict) -> None:
+    """Rebuild the agent graph when config.yaml changes.
+
+    New runners pick up the rebuilt ``root_agent``; runners that already hold
+    the previous graph keep using it until they are recreated.
+    """
+    global root_agent, response_cache, pre_router, session_state_manager
+    if old_config.get('response_cache') != new_config.get('response_cache'):
+        response_cache = SemanticResponseCache.from_config(
+            new_config.get('response_cache'), validate=is_valid_final_response
+        )
+    if old_config.get('pre_router') != new_config.get('pre_router'):
+        pre_router = PreRouter.from_config(new_config.get('pre_router'))
+    if old_config.get('session_state') != new_config.get('session_state'):
+        session_state_manager = SessionStateManager.from_config(new_config.get('session_state'))
+    root_agent = build_root_agent()
+
 
 # To test a specific agent directly, you can uncomment one of the following lines:
 # root_agent = search_agent.create_agent()
-# root_agent = coding_agent
 # root_agent = main_research_agent
@@ -19,17 +19,24 @@ inherit from. It defines the common interface and structure that ensures
 consistency across all agents in the system.
 """
 
+import functools
+import json
 import logging
-import os
-import yaml
 from abc import ABC, abstractmethod
 from typing import List, Optional, Any, Type
 from google.adk.agents import Agent
 from google.adk.tools import FunctionTool
 from pydantic import BaseModel
 
-# Import session tools
-from tools.session_tools import save_note
+# Import session tools and the shared config service
+from tools.session_tools import remember_note_session, save_note
+from shared.config import config_service
+from shared.budgets import BudgetEnforcer
+from shared.model_routing import resolve_model, usage_recorder
+from shared.tool_cache import memoize_tools
+
+# Registers local model backends (e.g. "fake/..." models) with the ADK
+import llm  # noqa: F401
 
 
 class BaseAgent(ABC):
@@ -38,8 +45,25 @@ class BaseAgent(ABC):
     This class defines the common interface that all agents must implement.
     It provides a consistent structure for creating specialized agents with
     their own unique capabilities while maintaining a uniform API.
+
+    ADK agents returned by ``create_agent()`` are memoized per agent class and
+    effective configuration, so repeated calls (e.g. when building many
+    runners in one process) return the same Agent and tool objects. The cache
+    is invalidated automatically when the config service reloads a changed
+    config.yaml, or explicitly via ``invalidate_agent_cache()``.
+
+    When ``tool_cache.enabled`` is set, the cacheable FunctionTools of every
+    created Agent are wrapped so that their results are memoized (see
+    shared.tool_cache).
     """
-    _config = None
+    _agent_cache = {}
+
+    def __init_subclass__(cls, **kwargs):
+        """Wrap each subclass's create_agent() with the shared agent cache."""
+        super().__init_subclass__(**kwargs)
+        factory = cls.__dict__.get('create_agent')
+        if factory is not None and not getattr(factory, '__isabstractmethod__', False):
+            cls.create_agent = _memoize_create_agent(factory)
 
     def __init__(self, name: str, description: str):
         """Initialize the base agent with a name and description.
@@ -56,18 +80,18 @@ class BaseAgent(ABC):
 
     @classmethod
     def _load_config(cls) -> dict:
-        """Load the system configuration from config.yaml."""
-        if cls._config is None:
-            try:
-                # Assuming config.yaml is in the root of the 'google_adk_cookbook' project
-                current_dir = os.path.dirname(os.path.abspath(__file__))
-                config_path = os.path.join(current_dir, '..', '..', 'config.yaml')
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    cls._config = yaml.safe_load(f)
-            except FileNotFoundError:
-                # Fallback or error handling if config.yaml is not found
-                cls._config = {'agent_settings': {'model': 'gemini-1.5-flash'}}
-        return cls._config
+        """Return the shared system configuration from the config service."""
+        return config_service.get()
+
+    @classmethod
+    def invalidate_agent_cache(cls) -> None:
+        """Drop all memoized ADK agents so the next create_agent() rebuilds them."""
+        BaseAgent._agent_cache.clear()
+
+    def _agent_cache_key(self) -> tuple:
+        """Return the cache key for this agent: its class, name and effective config."""
+        config_key = json.dumps(self.config, sort_keys=True, default=str)
+        return (type(self), self.name, config_key)
 
     @abstractmethod
     def create_agent(self) -> Agent:
@@ -103,6 +127,42 @@ class BaseAgent(ABC):
         base_tools = [FunctionTool(func=save_note)]
         return base_tools
 
+    def get_callbacks(self) -> dict:
+        """Get the ADK callbacks to attach to this agent.
+
+        This method can be overridden by subclasses to hook into the
+        agent's model and tool calls. The returned dictionary is passed
+        as keyword arguments to the ADK Agent (e.g. before_model_callback),
+        with each value a list of callbacks. Subclasses should combine their
+        own callbacks with these using ``merge_callbacks()``.
+
+        By default it contains the callback that records which session notes
+        belong to, the budget enforcement callbacks configured in the
+        ``budgets`` section of config.yaml, and the shared model latency/cost
+        recorder.
+
+        Returns:
+            A dictionary of callback keyword arguments.
+        """
+        enforcer = BudgetEnforcer.from_config(self.name, self.config.get('budgets'))
+        budget_callbacks = enforcer.callbacks() if enforcer is not None else {}
+        return merge_callbacks(
+            {'before_agent_callback': remember_note_session},
+            budget_callbacks,
+            usage_recorder.callbacks(),
+        )
+
+    def get_model(self) -> str:
+        """Get the model for this agent.
+
+        Agents listed under ``model_routing.agents`` in config.yaml use their
+        tier's (or their own) model; all others use ``agent_settings.model``.
+
+        Returns:
+            The model name
+        """
+        return resolve_model(self.config, self.name)
+
     def get_system_prompt(self) -> str:
         """Get the system prompt for this agent.
         
@@ -114,4 +174,61 @@ class BaseAgent(ABC):
             The system prompt as a string
         """
         self.logger.info("Generating system prompt...")
-        return f"You are {self.name}, {self.description}"
\ No newline at end of file
+        return f"You are {self.name}, {self.description}"
+
+
+def merge_callbacks(*callback_sets: dict) -> dict:
+    """Combine callback dictionaries into lists, in the order given.
+
+    ADK runs a list of callbacks in order and stops at the first one that
+    returns a value, so earlier sets take precedence.
+
+    Examples:
+        >>> def f(callback_context, llm_request): return None
+        >>> def g(callback_context, llm_request): return None
+        >>> merge_callbacks({'before_model_callback': f}, {'before_model_callback': [g]}) == {
+        ...     'before_model_callback': [f, g]}
+        True
+    """
+    merged = {}
+    for callbacks in callback_sets:
+        for name, value in callbacks.items():
+            merged.setdefault(name, []).extend(value if isinstance(value, list) else [value])
+    return merged
+
+
+def _memoize_create_agent(factory):
+    """Wrap a create_agent() implementation with the BaseAgent agent cache.
+
+    Pass ``use_cache=False`` to force a fresh Agent, e.g. when the same agent
+    must be attached as a sub-agent under a second parent (ADK agents can only
+    have one parent).
+    """
+    @functools.wraps(factory)
+    def create_agent(self, use_cache: bool = True):
+        self.config = self._load_config()
+        if not use_cache:
+            return _memoize_tool_results(factory(self))
+        key = self._agent_cache_key()
+        agent = BaseAgent._agent_cache.get(key)
+        if agent is None:
+            self.logger.info("Building agent '%s' (cache miss)", self.name)
+            agent = _memoize_tool_results(factory(self))
+            BaseAgent._agent_cache[key] = agent
+        return agent
+
+    return create_agent
+
+
+def _memoize_tool_results(agent):
+    """Wrap the agent's cacheable FunctionTools with the shared tool cache."""
+    tools = getattr(agent, 'tools', None)
+    if tools:
+        agent.tools = memoize_tools(tools)
+    return agent
+
+
+@config_service.on_change
+def _invalidate_on_config_change(old_config: dict, new_config: dict) -> None:
+    """Drop cached agents when config.yaml is reloaded with new content."""
+    BaseAgent.invalidate_agent_cache()
\ No newline at end of file
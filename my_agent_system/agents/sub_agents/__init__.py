@@ -16,6 +16,8 @@
 
 This module contains implementations of specialized agents:
 - ResearcherAgent: Gathers information using web search
+- ParallelResearcherAgent: Plans sub-questions and searches them concurrently
+- CompactorAgent: Condenses research output into a bounded findings object
 - AnalyzerAgent: Analyzes information and draws insights
 - ResponderAgent: Generates well-structured responses
 - ToolDemoAgent: Demonstrates custom tool usage
@@ -27,8 +27,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from google.adk.agents import Agent
 
-# Import the base agent
-from agents.base_agent import BaseAgent
+# Import the base agent and the context compaction callback
+from agents.base_agent import BaseAgent, merge_callbacks
+from shared.context_compaction import stage_context_callback
 
 
 class AnalyzerAgent(BaseAgent):
@@ -68,6 +69,19 @@ When given information to analyze:
 
 Focus on providing clear, evidence-based analysis that helps users understand the information better."""
 
+    def get_callbacks(self) -> dict:
+        """Analyze the compacted research findings instead of the raw transcript.
+
+        Returns:
+            The callbacks, including context compaction when it is enabled
+        """
+        callbacks = {}
+        settings = self.config.get('context_compaction') or {}
+        if settings.get('enabled', False):
+            budget = (settings.get('budgets') or {}).get('analyzer', 1500)
+            callbacks['before_model_callback'] = stage_context_callback(budget, ["research_findings"])
+        return merge_callbacks(callbacks, super().get_callbacks())
+
     def create_agent(self) -> Agent:
         """Create and return the analyzer agent.
         
@@ -79,9 +93,11 @@ Focus on providing clear, evidence-based analysis that helps users understand th
             An ADK Agent instance configured for analysis tasks
         """
         return Agent(
-                        model=self.config['agent_settings']['model'],
+            model=self.get_model(),
             name=self.name,
             instruction=self.get_system_prompt(),
+            output_key="analysis",
+            **self.get_callbacks(),
         )
 
 
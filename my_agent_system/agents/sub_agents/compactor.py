@@ -0,0 +1,92 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compactor Agent - Condense research output between pipeline stages.
+
+This module implements the CompactorAgent, a model-free stage that runs
+between the research stage and the AnalyzerAgent. It reads the research
+report from session state, compacts it into a bounded findings object (key
+points with near-duplicates removed, sources and token estimates) and
+stores that under ``research_findings``. The AnalyzerAgent and ResponderAgent then work from
+the findings instead of the full research transcript.
+"""
+
+import sys
+import os
+from typing import AsyncGenerator, Optional
+
+# Add the parent directory to the path so we can import base_agent
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google.adk.agents import BaseAgent as AdkBaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+
+# Import the base agent and the compaction helpers
+from agents.base_agent import BaseAgent
+from shared.context_compaction import compact_findings
+
+
+class FindingsCompactorAgent(AdkBaseAgent):
+    """Compact the report in ``input_key`` into findings under ``output_key``."""
+
+    input_key: str = "research_output"
+    output_key: str = "research_findings"
+    max_tokens: int = 800
+    max_points: int = 12
+    ranking: str = "textrank"
+    dedup_threshold: Optional[float] = None
+    shingle_size: int = 2
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        findings = compact_findings(
+            ctx.session.state.get(self.input_key), self.max_tokens, self.max_points, self.ranking,
+            self.dedup_threshold, self.shingle_size,
+        )
+        # State-only event: nothing is added to the conversation history
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta={self.output_key: findings}),
+        )
+
+
+class CompactorAgent(BaseAgent):
+    """Agent that compacts research output into a bounded findings object."""
+
+    def __init__(self):
+        """Initialize the compactor agent."""
+        super().__init__(
+            name="CompactorAgent",
+            description="a stage that condenses research output into key points and sources"
+        )
+
+    def create_agent(self) -> FindingsCompactorAgent:
+        """Create the compaction stage from the ``context_compaction`` settings."""
+        settings = self.config.get('context_compaction', {}) or {}
+        dedup = settings.get('dedup') or {}
+        return FindingsCompactorAgent(
+            name=self.name,
+            description=self.description,
+            max_tokens=(settings.get('budgets') or {}).get('findings', 800),
+            max_points=settings.get('max_key_points', 12),
+            ranking=settings.get('ranking', 'textrank'),
+            dedup_threshold=dedup.get('threshold', 0.6) if dedup.get('enabled', False) else None,
+            shingle_size=dedup.get('shingle_size', 2),
+        )
+
+
+# Create an instance of the compactor agent for use in the workflow
+compactor_agent = CompactorAgent()
@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Memory Agent - Specialized for saving notes to session state."""
+"""Memory Agent - Specialized for saving, retrieving and searching notes."""
 
 import sys
 import os
@@ -25,7 +25,7 @@ from google.adk.tools import FunctionTool
 
 # Import the base agent and session tools
 from agents.base_agent import BaseAgent
-from tools.session_tools import save_note
+from tools.session_tools import get_note, search_notes
 
 
 class MemoryAgent(BaseAgent):
@@ -35,22 +35,24 @@ class MemoryAgent(BaseAgent):
         """Initialize the memory agent."""
         super().__init__(
             name="MemoryAgent",
-            description="an agent that can save notes to the session memory."
+            description="an agent that can save, retrieve and search notes in the user's memory."
         )
 
     def get_tools(self):
         """Return the tools for this agent."""
+        # save_note is already one of the base tools
         base_tools = super().get_tools()
-        my_tools = [FunctionTool(func=save_note)]
+        my_tools = [FunctionTool(func=get_note), FunctionTool(func=search_notes)]
         return base_tools + my_tools
 
     def create_agent(self) -> Agent:
         """Create and return the memory agent."""
         return Agent(
-            model=self.config['agent_settings']['model'],
+            model=self.get_model(),
             name=self.name,
             instruction=self.get_system_prompt(),
             tools=self.get_tools(),
+            **self.get_callbacks(),
         )
 
 
@@ -0,0 +1,190 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Parallel Researcher Agent - Fan-out research over concurrent searches.
+
+This module implements the ParallelResearcherAgent, an alternative first stage
+for the research workflow. Instead of letting one LLM agent issue SearchAgent
+calls one at a time, it runs two steps:
+
+1. ResearchPlannerAgent decomposes the topic into a list of sub-questions
+2. FanOutSearchAgent runs a SearchAgent call for every sub-question
+   concurrently (bounded by a concurrency cap) and merges the findings into a
+   single report for the AnalyzerAgent
+
+Wall-clock latency for multi-question research drops roughly by the fan-out
+factor. Enable it with ``research_pipeline.mode: parallel`` in config.yaml.
+"""
+
+import asyncio
+import json
+import re
+import sys
+import os
+from typing import AsyncGenerator, List
+
+# Add the parent directory to the path so we can import base_agent
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google.adk.agents import Agent, BaseAgent as AdkBaseAgent, SequentialAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.adk.tools import ToolContext, agent_tool
+from google.genai import types
+
+# Import the base agent and the search specialist used for every sub-question
+from agents.base_agent import BaseAgent
+from agents.sub_agents.search_agent import search_agent
+
+# Matches list markers such as "1.", "2)", "-" or "*" at the start of a line
+_LIST_MARKER = re.compile(r"^\s*(?:\d+[.)]|[-*])\s*")
+
+
+def parse_sub_questions(text: str, limit: int) -> List[str]:
+    """Parse the planner's output into at most ``limit`` sub-questions.
+
+    Accepts a JSON array of strings (optionally inside a Markdown code fence)
+    or one question per line with optional list markers.
+
+    Args:
+        text: The planner's output
+        limit: Maximum number of questions to return
+
+    Returns:
+        A list of unique, non-empty questions in their original order
+    """
+    if not isinstance(text, str):
+        text = "" if text is None else str(text)
+    body = text.strip().strip("`")
+    if body.startswith("json"):
+        body = body[4:]
+    try:
+        parsed = json.loads(body)
+        candidates = [str(item) for item in parsed] if isinstance(parsed, list) else []
+    except json.JSONDecodeError:
+        candidates = [_LIST_MARKER.sub("", line) for line in text.splitlines()]
+
+    questions = []
+    for candidate in candidates:
+        question = candidate.strip()
+        if question and question not in questions:
+            questions.append(question)
+    return questions[:limit]
+
+
+def merge_findings(results: List[tuple]) -> str:
+    """Merge ``(question, finding)`` pairs into one Markdown research report."""
+    sections = [f"### {question}\n\n{finding.strip()}" for question, finding in results]
+    return "## Research Findings\n\n" + "\n\n".join(sections)
+
+
+class FanOutSearchAgent(AdkBaseAgent):
+    """Run the search agent for every planned sub-question concurrently.
+
+    Questions are read from session state, each is sent to the search agent
+    through an AgentTool (exactly as ResearcherAgent would), and at most
+    ``max_concurrency`` searches run at once. The merged report is emitted as
+    a single event and stored in state under ``output_key``.
+    """
+
+    search_tool: agent_tool.AgentTool
+    questions_key: str = "research_questions"
+    output_key: str = "research_output"
+    max_concurrency: int = 4
+    max_questions: int = 8
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        questions = parse_sub_questions(ctx.session.state.get(self.questions_key), self.max_questions)
+        if not questions and ctx.user_content and ctx.user_content.parts:
+            # Fall back to searching for the original request as-is
+            questions = [ctx.user_content.parts[0].text or ""]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _search(question: str) -> tuple:
+            tool_context = ToolContext(ctx)
+            async with semaphore:
+                try:
+                    finding = await self.search_tool.run_async(
+                        args={"request": question}, tool_context=tool_context
+                    )
+                except Exception as e:
+                    finding = f"Search failed: {e}"
+            return question, str(finding), tool_context.actions.state_delta
+
+        results = await asyncio.gather(*(_search(question) for question in questions))
+        report = merge_findings([(question, finding) for question, finding, _ in results])
+
+        state_delta = {}
+        for _, _, delta in results:
+            state_delta.update(delta)
+        state_delta[self.output_key] = report
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=report)]),
+            actions=EventActions(state_delta=state_delta),
+        )
+
+
+class ParallelResearcherAgent(BaseAgent):
+    """Agent that plans sub-questions and researches them concurrently."""
+
+    def __init__(self):
+        """Initialize the parallel researcher agent."""
+        super().__init__(
+            name="ParallelResearcherAgent",
+            description="an agent that researches topics by searching all sub-questions concurrently."
+        )
+
+    def _settings(self) -> dict:
+        return self.config.get('research_pipeline', {}) or {}
+
+    def get_system_prompt(self) -> str:
+        """Get the system prompt for the sub-question planner."""
+        max_questions = self._settings().get('max_sub_questions', 8)
+        return f"""You are ResearchPlannerAgent, the planning step of {self.name}, {self.description}
+
+Your task is to break the user's research topic down into at most {max_questions} focused,
+independent sub-questions that can each be answered with a single web search.
+
+Respond ONLY with a JSON array of strings, for example:
+["What is X?", "What are the latest developments in X?", "What are the applications of X?"]"""
+
+    def create_agent(self) -> SequentialAgent:
+        """Create the planner -> concurrent search pipeline."""
+        settings = self._settings()
+        planner = Agent(
+            model=self.get_model(),
+            name="ResearchPlannerAgent",
+            instruction=self.get_system_prompt(),
+            output_key="research_questions",
+            **self.get_callbacks(),
+        )
+        fan_out = FanOutSearchAgent(
+            name="FanOutSearchAgent",
+            description="Runs SearchAgent for every planned sub-question concurrently.",
+            search_tool=agent_tool.AgentTool(agent=search_agent.create_agent()),
+            max_concurrency=settings.get('max_parallel_searches', 4),
+            max_questions=settings.get('max_sub_questions', 8),
+        )
+        return SequentialAgent(
+            name=self.name,
+            description=self.description,
+            sub_agents=[planner, fan_out],
+        )
+
+
+# Create an instance of the parallel researcher agent for use in the workflow
+parallel_researcher_agent = ParallelResearcherAgent()
@@ -49,7 +49,7 @@ class ResearcherAgent(BaseAgent):
 
 Your task is to research topics thoroughly. You have two specialist agents available as tools:
 - **SearchAgent**: Use this agent to perform web searches and find information.
-- **MemoryAgent**: Use this agent to save important facts and findings to your session notes.
+- **MemoryAgent**: Use this agent to save important facts and findings as notes, and to look up or search notes saved earlier.
 
 When given a research topic:
 1. Break down the topic into key questions.
@@ -60,13 +60,15 @@ When given a research topic:
     def create_agent(self) -> Agent:
         """Create and return the researcher agent with its specialist agent tools."""
         return Agent(
-            model=self.config['agent_settings']['model'],
+            model=self.get_model(),
             name=self.name,
             instruction=self.get_system_prompt(),
             tools=[
                 agent_tool.AgentTool(agent=search_agent.create_agent()),
                 agent_tool.AgentTool(agent=memory_agent.create_agent()),
             ],
+            output_key="research_output",
+            **self.get_callbacks(),
         )
 
 
@@ -22,15 +22,16 @@ agent in the research workflow sequence, producing the response that is returned
 import sys
 import os
 from typing import List, Type
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 
 # Add the parent directory to the path so we can import base_agent
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from google.adk.agents import Agent
 
-# Import the base agent
-from agents.base_agent import BaseAgent
+# Import the base agent and the context compaction callback
+from agents.base_agent import BaseAgent, merge_callbacks
+from shared.context_compaction import stage_context_callback
 
 
 class FinalResponse(BaseModel):
@@ -39,6 +40,21 @@ class FinalResponse(BaseModel):
     sources: List[str]
 
 
+def is_valid_final_response(text: str) -> bool:
+    """Return True if ``text`` is a FinalResponse JSON object.
+
+    Markdown code fences around the JSON are ignored.
+    """
+    body = text.strip().strip("`")
+    if body.startswith("json"):
+        body = body[4:]
+    try:
+        FinalResponse.model_validate_json(body)
+    except ValidationError:
+        return False
+    return True
+
+
 class ResponderAgent(BaseAgent):
     """Agent specialized in generating clear, well-structured responses."""
 
@@ -70,12 +86,25 @@ You MUST format your response as a JSON object that conforms to the following st
 
 Organize the information logically and coherently within the summary. Ensure the sources list contains the URLs of the information you used."""
 
+    def get_callbacks(self) -> dict:
+        """Respond from the compacted findings and the analysis when compaction is enabled."""
+        callbacks = {}
+        settings = self.config.get('context_compaction') or {}
+        if settings.get('enabled', False):
+            budget = (settings.get('budgets') or {}).get('responder', 1500)
+            callbacks['before_model_callback'] = stage_context_callback(
+                budget, ["research_findings", "analysis"]
+            )
+        return merge_callbacks(callbacks, super().get_callbacks())
+
     def create_agent(self) -> Agent:
         """Create and return the responder agent."""
         return Agent(
-            model=self.config['agent_settings']['model'],
+            model=self.get_model(),
             name=self.name,
             instruction=self.get_system_prompt(),
+            output_key="final_response",
+            **self.get_callbacks(),
         )
 
 
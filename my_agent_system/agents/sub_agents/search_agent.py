@@ -12,7 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Search Agent - Specialized for using the Google Search tool."""
+"""Search Agent - Specialized for using the Google Search tool.
+
+Answers are cached by normalized query (see shared.search_cache), so a query
+that was already answered is served without calling the model.
+"""
 
 import sys
 import os
@@ -21,10 +25,12 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from google.adk.agents import Agent
-from google.adk.tools import google_search
+from google.adk.tools import FunctionTool, google_search
 
 # Import the base agent
-from agents.base_agent import BaseAgent
+from agents.base_agent import BaseAgent, merge_callbacks
+from llm import is_fake_model, simulated_google_search
+from shared.search_cache import SearchCache
 
 
 class SearchAgent(BaseAgent):
@@ -36,20 +42,48 @@ class SearchAgent(BaseAgent):
             name="SearchAgent",
             description="A search specialist. Use this for simple questions that require web search."
         )
+        self._search_cache_settings = self.config.get('search_cache')
+        self.search_cache = SearchCache.from_config(self._search_cache_settings)
+
+    def _refresh_search_cache(self) -> None:
+        """Recreate the search cache when its settings in config.yaml changed."""
+        settings = self.config.get('search_cache')
+        if settings != self._search_cache_settings:
+            self.logger.info("search_cache settings changed; rebuilding the search cache")
+            self._search_cache_settings = settings
+            self.search_cache = SearchCache.from_config(settings)
 
     def get_tools(self):
         """Return the tools for this agent."""
         # This agent only uses the built-in google_search tool.
         # It does not inherit base tools to avoid the "one built-in tool" limitation.
+        # Built-in Gemini tools cannot run against a local fake model, so a
+        # simulated search is used instead for offline load testing.
+        if is_fake_model(self.get_model()):
+            return [FunctionTool(func=simulated_google_search)]
         return [google_search]
 
+    def get_callbacks(self) -> dict:
+        """Serve repeated queries from the search cache when it is enabled.
+
+        Cache hits are checked before the budget, so they use none of it.
+        """
+        callbacks = {}
+        if (self.config.get('search_cache') or {}).get('enabled', False):
+            callbacks['before_model_callback'] = self.search_cache.before_model_callback
+            callbacks['after_model_callback'] = self.search_cache.after_model_callback
+        return merge_callbacks(callbacks, super().get_callbacks())
+
     def create_agent(self) -> Agent:
         """Create and return the search agent."""
+        # Agents are rebuilt on a config reload; pick up new cache settings
+        self._refresh_search_cache()
         return Agent(
-            model=self.config['agent_settings']['model'],
+            model=self.get_model(),
             name=self.name,
             instruction=self.get_system_prompt(),
             tools=self.get_tools(),
+            **self.get_callbacks(),
         )
 
 
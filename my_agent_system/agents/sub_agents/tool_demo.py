@@ -15,8 +15,9 @@
 """Tool Demonstration Agent - Shows custom tool implementation and usage.
 
 This module implements the ToolDemonstrationAgent, which demonstrates how to
-create and use custom tools within the ADK framework. It showcases two custom
-tools: data_formatter and sentiment_analyzer.
+create and use custom tools within the ADK framework. It showcases the custom
+tools data_formatter, convert_data_file, sentiment_analyzer and
+batch_sentiment_analyzer.
 """
 
 import sys
@@ -33,16 +34,23 @@ from agents.base_agent import BaseAgent
 
 # Import custom tools
 sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tools'))
-from tools.custom_tools import data_formatter, sentiment_analyzer
+from tools.custom_tools import (
+    data_formatter,
+    convert_data_file,
+    sentiment_analyzer,
+    batch_sentiment_analyzer,
+)
 
 
 class ToolDemonstrationAgent(BaseAgent):
     """Agent that demonstrates using custom tools.
     
     This agent showcases how to integrate custom tools into an ADK agent.
-    It has access to two custom tools:
-    1. data_formatter - Formats data in JSON, XML, or CSV formats
-    2. sentiment_analyzer - Analyzes the sentiment of text input
+    It has access to four custom tools:
+    1. data_formatter - Formats data in JSON, JSON Lines, XML, or CSV formats
+    2. convert_data_file - Converts large data files between those formats
+    3. sentiment_analyzer - Analyzes the sentiment of text input
+    4. batch_sentiment_analyzer - Analyzes the sentiment of many texts at once
     """
 
     def __init__(self):
@@ -63,9 +71,11 @@ class ToolDemonstrationAgent(BaseAgent):
         """
         return f"""You are {self.name}, {self.description}.
 
-You have access to two custom tools:
-1. data_formatter: Formats data in different formats (JSON, XML, CSV)
-2. sentiment_analyzer: Analyzes the sentiment of text
+You have access to four custom tools:
+1. data_formatter: Formats data in different formats (JSON, JSON Lines, XML, CSV)
+2. convert_data_file: Converts a data file into another format without reading it into the conversation; use it for large datasets
+3. sentiment_analyzer: Analyzes the sentiment of text
+4. batch_sentiment_analyzer: Analyzes the sentiment of a list of texts in one call
 
 When given a task:
 1. Determine which tool(s) to use based on the request
@@ -79,14 +89,18 @@ Always use the tools when relevant to the task."""
         
         This method returns the custom tools that this agent can use:
         - data_formatter: For formatting data in various formats
+        - convert_data_file: For converting large data files between formats
         - sentiment_analyzer: For analyzing text sentiment
+        - batch_sentiment_analyzer: For analyzing the sentiment of many texts
         
         Returns:
             A list of FunctionTool instances wrapping the custom tools
         """
         return [
             FunctionTool(func=data_formatter),
-            FunctionTool(func=sentiment_analyzer)
+            FunctionTool(func=convert_data_file),
+            FunctionTool(func=sentiment_analyzer),
+            FunctionTool(func=batch_sentiment_analyzer)
         ]
 
     def create_agent(self) -> Agent:
@@ -99,10 +113,11 @@ Always use the tools when relevant to the task."""
             An ADK Agent instance configured for demonstrating custom tools
         """
         return Agent(
-            model="gemini-2.5-flash",
+            model=self.get_model(),
             name=self.name,
             instruction=self.get_system_prompt(),
             tools=self.get_tools(),
+            **self.get_callbacks(),
         )
 
 
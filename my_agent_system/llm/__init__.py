@@ -0,0 +1,28 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""LLM module - Local model backends.
+
+This module contains model backends that plug into the ADK model registry:
+- FakeLlm: A deterministic, scriptable stand-in for offline load testing,
+  selected with a ``fake/<name>`` model in config.yaml
+"""
+
+from .fake_llm import FakeLlm, is_fake_model, simulated_google_search
+
+__all__ = [
+    "FakeLlm",
+    "is_fake_model",
+    "simulated_google_search",
+]
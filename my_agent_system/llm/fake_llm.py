@@ -0,0 +1,312 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Fake LLM - Deterministic local model stand-in for offline load testing.
+
+This module implements FakeLlm, an ADK ``BaseLlm`` registered for model names
+of the form ``fake/<name>``. Setting ``agent_settings.model: "fake/default"``
+in config.yaml runs the whole agent graph with no network access.
+
+Responses are produced by a script of rules (the built-in ``DEFAULT_RULES``
+followed by ``fake_llm.rules`` from config.yaml). Each rule can match the
+agent's system instruction and the latest message, and either returns text or
+emits a function call. Latency is simulated with a configurable
+time-to-first-token distribution plus a token rate, and all randomness is
+seeded from the request contents so identical requests behave identically.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+from typing import Any, AsyncGenerator, Dict, List
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.models.registry import LLMRegistry
+from google.genai import types
+
+from shared.config import config_service
+
+# Prefix that selects this backend in config.yaml
+FAKE_MODEL_PREFIX = "fake/"
+
+# Rough characters-per-token ratio used for simulated usage metadata
+CHARS_PER_TOKEN = 4
+
+# Built-in script that routes the root_agent graph end to end. Rules are
+# evaluated in order after any rules from config.yaml.
+DEFAULT_RULES: List[Dict[str, Any]] = [
+    {
+        "instruction": r"master orchestrator",
+        "match": r"(?i)\b(research|analy[sz]e|investigate|compare)\b",
+        "function_call": {"name": "transfer_to_agent", "args": {"agent_name": "ModularResearchAssistant"}},
+    },
+    {
+        "instruction": r"master orchestrator",
+        "match": r"(?i)\b(calculate|compute|code|python|solve)\b|\d+\s*[-+*/^]\s*\d+",
+        "function_call": {"name": "CodingAgent", "args": {"request": "{input}"}},
+    },
+    {
+        "instruction": r"master orchestrator",
+        "function_call": {"name": "SearchAgent", "args": {"request": "{input}"}},
+    },
+    {
+        "instruction": r"You are ResearcherAgent",
+        "function_call": {"name": "SearchAgent", "args": {"request": "{input}"}},
+    },
+    {
+        "instruction": r"You are ResearchPlannerAgent",
+        "text": '["What is {input}?", "Latest developments in {input}", "Applications of {input}"]',
+    },
+    {
+        "instruction": r"search specialist",
+        "function_call": {"name": "google_search", "args": {"query": "{input}"}},
+    },
+    {
+        "instruction": r'"summary"',
+        "on": "any",
+        "text": '{"summary": "Summary of: {input}", "sources": ["https://example.com/fake-source"]}',
+    },
+]
+
+
+def is_fake_model(model: Any) -> bool:
+    """Return True if ``model`` selects the fake backend."""
+    return isinstance(model, str) and model.startswith(FAKE_MODEL_PREFIX)
+
+
+def simulated_google_search(query: str) -> dict:
+    """Return deterministic canned search results for a query.
+
+    Stands in for the built-in google_search tool when a fake model is used,
+    since built-in Gemini tools cannot run against a local model.
+
+    Args:
+        query: The search query
+
+    Returns:
+        A dictionary with a list of result snippets and URLs
+    """
+    digest = hashlib.sha1(query.encode("utf-8")).hexdigest()[:8]
+    return {
+        "query": query,
+        "results": [
+            {
+                "title": f"Result {i + 1} for {query}",
+                "url": f"https://example.com/{digest}/{i + 1}",
+                "snippet": f"Simulated finding {i + 1} about {query}.",
+            }
+            for i in range(3)
+        ],
+    }
+
+
+# The simulated tool is registered under the built-in tool's name
+simulated_google_search.__name__ = "google_search"
+
+
+def _content_text(content: types.Content) -> str:
+    """Return the text of a content, rendering function responses as JSON."""
+    chunks = []
+    for part in content.parts or []:
+        if part.text:
+            chunks.append(part.text)
+        elif part.function_response is not None:
+            chunks.append(json.dumps(part.function_response.response, default=str))
+    return "\n".join(chunks)
+
+
+def _latest_input(contents: List[types.Content]) -> str:
+    """Return the most recent user input or function response text.
+
+    Context that other agents contributed ("For context: ...") is skipped so
+    that scripted rules see what the user actually asked.
+    """
+    for content in reversed(contents):
+        text = _content_text(content)
+        if content.role == "user" and text.startswith("For context:"):
+            continue
+        return text
+    return _content_text(contents[-1]) if contents else ""
+
+
+def _system_instruction(llm_request: LlmRequest) -> str:
+    instruction = llm_request.config.system_instruction if llm_request.config else None
+    if instruction is None:
+        return ""
+    if isinstance(instruction, str):
+        return instruction
+    return _content_text(instruction)
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def _substitute(value: Any, user_input: str) -> Any:
+    """Replace ``{input}`` placeholders in strings, lists and dicts."""
+    if isinstance(value, str):
+        return value.replace("{input}", user_input)
+    if isinstance(value, list):
+        return [_substitute(v, user_input) for v in value]
+    if isinstance(value, dict):
+        return {k: _substitute(v, user_input) for k, v in value.items()}
+    return value
+
+
+class FakeLlm(BaseLlm):
+    """A scriptable, deterministic model that never touches the network.
+
+    Settings are read from the ``fake_llm`` section of config.yaml on every
+    call, so scripts and latency can be changed with a hot reload:
+
+        fake_llm:
+          seed: 0
+          latency:
+            distribution: fixed   # fixed | uniform | normal | exponential
+            mean_ms: 0
+          tokens_per_second: 0    # 0 disables per-token delay
+          rules: []               # evaluated before DEFAULT_RULES
+    """
+
+    model: str = "fake/default"
+
+    @classmethod
+    def supported_models(cls) -> List[str]:
+        """Match every ``fake/<name>`` model."""
+        return [r"fake/.*"]
+
+    def _settings(self) -> dict:
+        return config_service.get("fake_llm", {}) or {}
+
+    def _rng(self, llm_request: LlmRequest, settings: dict) -> random.Random:
+        """Return a random generator seeded from the settings and request."""
+        digest = hashlib.sha256()
+        digest.update(f"{settings.get('seed', 0)}|{self.model}|".encode("utf-8"))
+        digest.update(_system_instruction(llm_request).encode("utf-8"))
+        for content in llm_request.contents:
+            digest.update(_content_text(content).encode("utf-8"))
+        return random.Random(digest.hexdigest())
+
+    @staticmethod
+    def _sample_ms(spec: dict, rng: random.Random) -> float:
+        """Sample a delay in milliseconds from a latency spec."""
+        distribution = spec.get("distribution", "fixed")
+        mean = float(spec.get("mean_ms", 0))
+        if distribution == "uniform":
+            value = rng.uniform(float(spec.get("min_ms", 0)), float(spec.get("max_ms", mean * 2)))
+        elif distribution == "normal":
+            value = rng.gauss(mean, float(spec.get("stddev_ms", mean / 4)))
+        elif distribution == "exponential":
+            value = rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+        else:
+            value = mean
+        return max(0.0, value)
+
+    def _select_rule(self, llm_request: LlmRequest, rules: List[dict]) -> tuple:
+        """Return the first matching rule and the input text it matched."""
+        instruction = _system_instruction(llm_request)
+        last = llm_request.contents[-1] if llm_request.contents else None
+        last_text = _latest_input(llm_request.contents)
+        is_function_response = last is not None and any(
+            part.function_response is not None for part in last.parts or []
+        )
+        for rule in rules:
+            on = rule.get("on", "user")
+            if on == "user" and is_function_response:
+                continue
+            if on == "function_response" and not is_function_response:
+                continue
+            if rule.get("instruction") and not re.search(rule["instruction"], instruction):
+                continue
+            if rule.get("match") and not re.search(rule["match"], last_text):
+                continue
+            function_call = rule.get("function_call")
+            if function_call and function_call.get("name") not in llm_request.tools_dict:
+                continue
+            return rule, last_text, is_function_response
+        return None, last_text, is_function_response
+
+    def _build_content(self, llm_request: LlmRequest, rules: List[dict]) -> types.Content:
+        rule, last_text, is_function_response = self._select_rule(llm_request, rules)
+        if rule is not None and rule.get("function_call"):
+            call = rule["function_call"]
+            return types.Content(role="model", parts=[types.Part(
+                function_call=types.FunctionCall(
+                    name=call["name"], args=_substitute(call.get("args", {}), last_text)
+                )
+            )])
+        if rule is not None:
+            # Escaped so that scripted JSON responses stay valid JSON
+            text = _substitute(rule.get("text", ""), json.dumps(last_text[:500])[1:-1])
+        elif is_function_response:
+            text = f"Based on the tool results: {last_text[:500]}"
+        else:
+            text = f"[{self.model}] Response to: {last_text[:500]}"
+        return types.Content(role="model", parts=[types.Part(text=text)])
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        """Generate a scripted response with simulated latency.
+
+        In streaming mode text responses are emitted word by word as partial
+        responses, followed by the aggregated final response.
+        """
+        settings = self._settings()
+        rules = list(settings.get("rules") or []) + DEFAULT_RULES
+        rng = self._rng(llm_request, settings)
+        content = self._build_content(llm_request, rules)
+
+        prompt_text = _system_instruction(llm_request) + "".join(
+            _content_text(c) for c in llm_request.contents
+        )
+        output_text = "".join(part.text or "" for part in content.parts)
+        output_tokens = _estimate_tokens(output_text or str(content.parts[0].function_call))
+        usage = types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=_estimate_tokens(prompt_text),
+            candidates_token_count=output_tokens,
+            total_token_count=_estimate_tokens(prompt_text) + output_tokens,
+        )
+
+        tokens_per_second = float(settings.get("tokens_per_second", 0) or 0)
+        token_delay = 1.0 / tokens_per_second if tokens_per_second > 0 else 0.0
+        await asyncio.sleep(self._sample_ms(settings.get("latency", {}) or {}, rng) / 1000)
+
+        if stream and output_text:
+            words = re.findall(r"\S+\s*", output_text)
+            for word in words:
+                if token_delay:
+                    await asyncio.sleep(token_delay * _estimate_tokens(word))
+                yield LlmResponse(
+                    content=types.Content(role="model", parts=[types.Part(text=word)]),
+                    partial=True,
+                )
+        elif token_delay:
+            await asyncio.sleep(token_delay * output_tokens)
+
+        yield LlmResponse(
+            content=content,
+            partial=False,
+            turn_complete=True,
+            finish_reason=types.FinishReason.STOP,
+            usage_metadata=usage,
+            model_version=self.model,
+        )
+
+
+LLMRegistry.register(FakeLlm)
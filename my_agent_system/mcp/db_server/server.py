@@ -3,6 +3,7 @@ import json
 import logging
 import os
 import sqlite3
+import sys
 from pathlib import Path
 
 import mcp.server.stdio
@@ -12,6 +13,14 @@ from google.adk.tools.mcp_tool.conversion_utils import adk_to_mcp_tool_type
 from mcp import types as mcp_types
 from mcp.server.lowlevel import NotificationOptions, Server
 from mcp.server.models import InitializationOptions
+from opentelemetry import context as otel_context
+from opentelemetry.trace import SpanKind
+
+# Make the shared package importable (appended so the mcp SDK keeps precedence)
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from shared.tool_cache import get_tool_cache, memoize_tools
+from shared.profiling import new_request_id, profile_request, profile_requested, should_profile
+from shared.tracing import configure_tracing, extract_context, get_tracer
 
 # Load environment variables
 load_dotenv()
@@ -27,6 +36,9 @@ logging.basicConfig(
     ],
 )
 
+# Record spans as the "db_server" service (see the tracing section of config.yaml)
+configure_tracing(service_name="db_server")
+
 # Database path
 DATABASE_PATH = os.path.join(os.path.dirname(__file__), "database.db")
 
@@ -204,6 +216,11 @@ ADK_DB_TOOLS = {
     "insert_data": FunctionTool(func=insert_data),
     "delete_data": FunctionTool(func=delete_data),
 }
+# Memoize read results (see the tool_cache section of config.yaml); a
+# successful write drops them so that reads never return stale rows
+ADK_DB_TOOLS = dict(zip(ADK_DB_TOOLS, memoize_tools(list(ADK_DB_TOOLS.values()))))
+DB_WRITE_TOOLS = ("insert_data", "delete_data")
+DB_READ_TOOLS = ("list_db_tables", "get_table_schema", "query_db_table")
 
 @app.list_tools()
 async def list_mcp_tools() -> list[mcp_types.Tool]:
@@ -220,8 +237,33 @@ async def list_mcp_tools() -> list[mcp_types.Tool]:
         mcp_tools_list.append(mcp_tool_schema)
     return mcp_tools_list
 
+def caller_trace_context() -> dict:
+    """Return the caller's trace context headers for the current tool call.
+
+    ADK's McpTool injects ``traceparent`` (and ``baggage``) into the
+    request's ``_meta`` field.
+    """
+    try:
+        meta = app.request_context.meta
+    except LookupError:
+        return {}
+    return dict(getattr(meta, "model_extra", None) or {})
+
 @app.call_tool()
 async def call_mcp_tool(name: str, arguments: dict) -> list[mcp_types.TextContent]:
+    # Continue the caller's trace and baggage (which may ask for a profile)
+    token = otel_context.attach(extract_context(caller_trace_context()))
+    try:
+        with get_tracer().start_as_current_span(
+            f"mcp.call_tool {name}", kind=SpanKind.SERVER, attributes={"mcp.tool.name": name}
+        ):
+            enabled = should_profile(requested=True if profile_requested() else None)
+            with profile_request(new_request_id(), f"mcp-{name}", enabled):
+                return await _call_mcp_tool(name, arguments)
+    finally:
+        otel_context.detach(token)
+
+async def _call_mcp_tool(name: str, arguments: dict) -> list[mcp_types.TextContent]:
     safe_print(f"DEBUG: MCP Server: Received call_tool request for '{name}' with args: {arguments}")
     logging.info(f"MCP Server: Received call_tool request for '{name}' with args: {arguments}")
 
@@ -232,6 +274,9 @@ async def call_mcp_tool(name: str, arguments: dict) -> list[mcp_types.TextConten
                 args=arguments,
                 tool_context=None,
             )
+            tool_cache = get_tool_cache()
+            if tool_cache is not None and name in DB_WRITE_TOOLS:
+                tool_cache.invalidate(DB_READ_TOOLS)
             safe_print(f"DEBUG: MCP Server: ADK tool '{name}' executed. Response: {adk_tool_response}")
             logging.info(f"MCP Server: ADK tool '{name}' executed. Response: {adk_tool_response}")
             response_text = json.dumps(adk_tool_response, indent=2)
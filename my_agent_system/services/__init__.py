@@ -0,0 +1,23 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Services module - Runtime services for serving the agent system.
+
+This module contains the services used to run agents in a long-lived process:
+- RunnerService: Runs many sessions concurrently with bounded concurrency
+- SqliteSessionService: Durable SQLite storage for sessions and their events
+- EvalHarness: Concurrent, cached evaluation of an agent over JSONL datasets
+"""
+
+# This file makes the services directory a Python package
@@ -0,0 +1,372 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Eval Harness - Concurrent, incremental evaluation of an agent.
+
+This module runs evaluation datasets through a RunnerService:
+
+- cases are read lazily from JSON Lines, one ``{"input": ..., "expected":
+  ...}`` object per line, so datasets of any size can be streamed
+- a pool of workers runs cases concurrently, each in its own session, and
+  an optional rate limit spaces out case starts (to stay under model quotas)
+- responses are cached in a JSON Lines file keyed on the prompt and a
+  fingerprint of the agent tree and config.yaml, so a re-run only executes
+  cases whose prompt or agent configuration changed
+- each response is scored against the expected answer (ROUGE-1 F1, as ADK's
+  ``response_match_score``) and the report combines scores with latency
+  percentiles
+
+``eval/test_eval.py`` is the command line front end.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .runner_service import RunnerService, _percentile_ms, event_text
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Sections of config.yaml that do not change responses
+NEUTRAL_CONFIG_SECTIONS = ("evaluation", "tracing", "profiling", "runner")
+
+
+@dataclass
+class EvalCase:
+    """One evaluation prompt and its reference answer."""
+
+    id: str
+    input: str
+    expected: str = ""
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class CaseResult:
+    """The outcome of one case."""
+
+    id: str
+    input: str
+    expected: str
+    response: str = ""
+    score: Optional[float] = None
+    passed: bool = False
+    latency_s: float = 0.0
+    # True if the response came from the cache; latency_s is then the
+    # latency measured when it was generated
+    cached: bool = False
+    error: Optional[str] = None
+
+
+def load_cases(path: str) -> Iterator[EvalCase]:
+    """Yield the cases of a JSON Lines dataset.
+
+    Each line holds ``input`` (or ``query``), optionally ``expected`` (or
+    ``reference``) and ``id``; other fields are kept as metadata. Cases
+    without an id are numbered by line.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{number}: invalid JSON: {e.msg}") from None
+            text = record.pop("input", None) or record.pop("query", None)
+            if not text:
+                raise ValueError(f"{path}:{number}: case has no 'input'")
+            yield EvalCase(
+                id=str(record.pop("id", number)),
+                input=text,
+                expected=record.pop("expected", None) or record.pop("reference", None) or "",
+                metadata=record,
+            )
+
+
+def response_match(response: str, expected: str) -> float:
+    """Return the ROUGE-1 F1 score of a response against a reference.
+
+    Examples:
+        >>> response_match("Solar power is cheap and clean", "Solar power is clean")
+        0.8
+    """
+    candidate, reference = _WORD.findall(response.lower()), _WORD.findall(expected.lower())
+    if not candidate or not reference:
+        return 0.0
+    counts: Dict[str, int] = {}
+    for word in reference:
+        counts[word] = counts.get(word, 0) + 1
+    overlap = 0
+    for word in candidate:
+        if counts.get(word, 0) > 0:
+            counts[word] -= 1
+            overlap += 1
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / len(candidate), overlap / len(reference)
+    return round(2 * precision * recall / (precision + recall), 4)
+
+
+def _describe(agent) -> Dict[str, Any]:
+    """Return the response-relevant settings of an agent and its sub-agents."""
+    model = getattr(agent, "model", None)
+    instruction = getattr(agent, "instruction", None)
+    schema = getattr(agent, "output_schema", None)
+    return {
+        "name": agent.name,
+        "type": type(agent).__name__,
+        "model": str(getattr(model, "model", model) or ""),
+        "instruction": instruction if isinstance(instruction, str) else getattr(instruction, "__qualname__", ""),
+        "tools": sorted(
+            getattr(tool, "name", None) or getattr(tool, "__name__", type(tool).__name__)
+            for tool in getattr(agent, "tools", None) or ()
+        ),
+        "output_schema": getattr(schema, "__name__", None),
+        "sub_agents": [_describe(sub_agent) for sub_agent in agent.sub_agents],
+    }
+
+
+def agent_fingerprint(agent, config: Optional[dict] = None) -> str:
+    """Hash the agent tree (models, instructions, tools) and its configuration.
+
+    Sections listed in ``NEUTRAL_CONFIG_SECTIONS`` are ignored, so changing
+    e.g. the number of eval workers keeps cached responses valid.
+    """
+    settings = {key: value for key, value in (config or {}).items() if key not in NEUTRAL_CONFIG_SECTIONS}
+    payload = json.dumps({"agent": _describe(agent), "config": settings}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Agent responses by prompt and agent fingerprint, kept in a JSON Lines file.
+
+    Entries are appended as cases finish, so an interrupted run keeps the
+    responses it already has.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Dict[str, Tuple[str, float]] = {}
+        if os.path.exists(path):
+            line = ""
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A line cut short by an interrupted run
+                        continue
+                    self._entries[entry["key"]] = (entry["response"], entry["latency_s"])
+            if line and not line.endswith("\n"):
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write("\n")
+        elif os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(fingerprint: str, prompt: str) -> str:
+        """Return the cache key of a prompt sent to an agent configuration."""
+        return hashlib.sha256(f"{fingerprint}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """Return ``(response, latency_s)`` for a key, or None."""
+        return self._entries.get(key)
+
+    def put(self, key: str, response: str, latency_s: float) -> None:
+        """Store a response and append it to the cache file."""
+        self._entries[key] = (response, latency_s)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"key": key, "response": response, "latency_s": latency_s}, ensure_ascii=False) + "\n")
+
+
+class RateLimiter:
+    """Space out operations to at most ``rate`` per second (None: no limit)."""
+
+    def __init__(self, rate: Optional[float] = None):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+
+    async def wait(self) -> None:
+        """Wait for the next free slot."""
+        if not self.interval:
+            return
+        now = time.monotonic()
+        slot = max(now, self._next)
+        self._next = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+@dataclass
+class EvalReport:
+    """Results of an evaluation run, in dataset order."""
+
+    results: List[CaseResult] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Return scores, cache hits and latency figures as a plain dictionary."""
+        scores = [result.score for result in self.results if result.score is not None]
+        latencies = [result.latency_s for result in self.results if result.error is None]
+        measured = [result.latency_s for result in self.results if result.error is None and not result.cached]
+        executed = sum(not result.cached for result in self.results)
+        return {
+            "cases": len(self.results),
+            "passed": sum(result.passed for result in self.results),
+            "errors": sum(result.error is not None for result in self.results),
+            "mean_score": round(sum(scores) / len(scores), 4) if scores else None,
+            "cached": len(self.results) - executed,
+            "executed": executed,
+            "elapsed_s": round(self.elapsed_s, 3),
+            "throughput_cases_per_s": round(executed / self.elapsed_s, 2) if self.elapsed_s > 0 else 0.0,
+            "latency_p50_ms": _percentile_ms(latencies, 50),
+            "latency_p95_ms": _percentile_ms(latencies, 95),
+            "latency_max_ms": _percentile_ms(latencies, 100),
+            # Only cases executed in this run
+            "run_latency_p50_ms": _percentile_ms(measured, 50),
+            "run_latency_p95_ms": _percentile_ms(measured, 95),
+        }
+
+
+class EvalHarness:
+    """Run evaluation cases concurrently against an agent."""
+
+    def __init__(
+        self,
+        agent,
+        workers: int = 4,
+        rate_limit: Optional[float] = None,
+        cache: Optional[ResponseCache] = None,
+        pass_threshold: float = 0.3,
+        config: Optional[dict] = None,
+    ):
+        """Initialize the harness.
+
+        Args:
+            agent: The root agent to evaluate
+            workers: Cases run at the same time
+            rate_limit: Maximum case starts per second (None: unlimited);
+                cached cases do not count
+            cache: Response cache; None runs every case
+            pass_threshold: Minimum score for a case to pass
+            config: The configuration the agent was built from, part of the
+                cache fingerprint
+        """
+        self.workers = max(1, workers)
+        self.rate_limiter = RateLimiter(rate_limit)
+        self.cache = cache
+        self.pass_threshold = pass_threshold
+        self.fingerprint = agent_fingerprint(agent, config)
+        self.service = RunnerService(agent, app_name="eval", max_concurrency=self.workers)
+
+    @classmethod
+    def from_config(cls, agent, config: dict, **kwargs) -> "EvalHarness":
+        """Create a harness using the ``evaluation`` section of config.yaml.
+
+        Keyword arguments that are not None override the settings; the
+        response cache is passed in as ``cache``.
+        """
+        settings = config.get('evaluation', {}) or {}
+        options = {
+            "workers": settings.get('workers', 4),
+            "rate_limit": settings.get('rate_limit_per_second'),
+            "pass_threshold": settings.get('pass_threshold', 0.3),
+        }
+        options.update({key: value for key, value in kwargs.items() if value is not None})
+        return cls(agent, config=config, **options)
+
+    async def _respond(self, case: EvalCase) -> Tuple[str, float]:
+        """Run a case in a fresh session; return the final response and latency."""
+        await self.rate_limiter.wait()
+        user_id = f"eval-{case.id}"
+        session = await self.service.create_session(user_id)
+        final = ""
+        started = time.perf_counter()
+        try:
+            async for event in self.service.stream_turn(user_id, session.id, case.input):
+                text = event_text(event)
+                if text and event.is_final_response():
+                    final = text
+            return final, time.perf_counter() - started
+        finally:
+            await self.service.session_service.delete_session(
+                app_name=self.service.app_name, user_id=user_id, session_id=session.id
+            )
+
+    async def run_case(self, case: EvalCase) -> CaseResult:
+        """Run (or look up) one case and score its response."""
+        result = CaseResult(id=case.id, input=case.input, expected=case.expected)
+        key = ResponseCache.key(self.fingerprint, case.input)
+        hit = self.cache.get(key) if self.cache is not None else None
+        if hit is not None:
+            result.response, result.latency_s = hit
+            result.cached = True
+        else:
+            try:
+                result.response, result.latency_s = await self._respond(case)
+            except Exception as e:
+                result.error = f"{type(e).__name__}: {e}"
+            # An empty response is as likely a glitch as an answer; retry it
+            if result.error is None and result.response and self.cache is not None:
+                self.cache.put(key, result.response, result.latency_s)
+        if result.error is None:
+            if case.expected:
+                result.score = response_match(result.response, case.expected)
+                result.passed = result.score >= self.pass_threshold
+            else:
+                result.passed = bool(result.response)
+        return result
+
+    async def run(
+        self, cases: Iterable[EvalCase], on_result: Optional[Callable[[CaseResult], None]] = None
+    ) -> EvalReport:
+        """Run all cases with ``workers`` concurrent workers.
+
+        Cases are pulled from ``cases`` as workers become free, so a lazily
+        loaded dataset is never held in memory as a whole.
+
+        Args:
+            cases: The cases, e.g. from ``load_cases()``
+            on_result: Called with each result as soon as it is ready
+
+        Returns:
+            An EvalReport with the results in dataset order
+        """
+        pending = enumerate(cases)
+        finished: List[Tuple[int, CaseResult]] = []
+        started = time.perf_counter()
+
+        async def _worker() -> None:
+            # next() never awaits, so workers never take the same case
+            for index, case in pending:
+                result = await self.run_case(case)
+                finished.append((index, result))
+                if on_result is not None:
+                    on_result(result)
+
+        try:
+            await asyncio.gather(*(_worker() for _ in range(self.workers)))
+        finally:
+            await self.service.close()
+        finished.sort(key=lambda item: item[0])
+        return EvalReport(results=[result for _, result in finished], elapsed_s=time.perf_counter() - started)
@@ -0,0 +1,372 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Runner Service - Concurrent multi-session execution of an agent.
+
+This module implements the RunnerService, which wraps an ADK Runner and serves
+many sessions concurrently through ``run_async``. In-flight turns are bounded
+by a global semaphore, turns within one session are serialized (an ADK session
+must see its events in order), and each session may only queue a limited
+number of turns before new ones are rejected. Throughput and time-to-first-event
+are recorded for every turn.
+
+Each turn runs in a ``run_turn`` tracing span, the root of the ADK agent,
+model and tool spans of that turn (see ``shared/tracing.py``), and can be
+profiled with cProfile on request (see ``shared/profiling.py``).
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Dict, Iterable, List, Optional, Tuple
+
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.events import Event
+from google.adk.runners import Runner
+from google.adk.sessions import BaseSessionService, InMemorySessionService, Session
+from google.genai.types import Part, UserContent
+
+# Imported via the same path as the agents, so module state (the budget usage
+# store, the profiling lock, the tracer provider) is shared with them
+from shared.budgets import budget_usage
+from shared.profiling import new_request_id, profile_request, should_profile
+from shared.tracing import SpanCollector, configure_tracing, current_trace_id, get_tracer
+
+from .sqlite_session_service import create_session_service
+
+
+class SessionBusyError(RuntimeError):
+    """Raised when a session already has the maximum number of queued turns."""
+
+
+@dataclass
+class TurnResult:
+    """The outcome of a single user turn."""
+    user_id: str
+    session_id: str
+    text: str = ""
+    events: int = 0
+    time_to_first_event: Optional[float] = None
+    # First event carrying text; with streaming this is the first partial
+    time_to_first_token: Optional[float] = None
+    duration: float = 0.0
+    error: Optional[str] = None
+    # Per-agent budget accounting ("budget:<AgentName>" state entries)
+    usage: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Id of the turn's trace when tracing is enabled
+    trace_id: Optional[str] = None
+    # cProfile output when the turn was profiled
+    profile_path: Optional[str] = None
+
+
+@dataclass
+class RunnerStats:
+    """Aggregate counters for all turns served by a RunnerService."""
+    completed: int = 0
+    failed: int = 0
+    rejected: int = 0
+    events: int = 0
+    first_start: Optional[float] = None
+    last_finish: Optional[float] = None
+    time_to_first_event: List[float] = field(default_factory=list)
+    time_to_first_token: List[float] = field(default_factory=list)
+    durations: List[float] = field(default_factory=list)
+
+    def record(self, result: TurnResult, started: float, finished: float) -> None:
+        """Record a finished turn."""
+        if self.first_start is None or started < self.first_start:
+            self.first_start = started
+        if self.last_finish is None or finished > self.last_finish:
+            self.last_finish = finished
+        self.events += result.events
+        self.durations.append(result.duration)
+        if result.time_to_first_event is not None:
+            self.time_to_first_event.append(result.time_to_first_event)
+        if result.time_to_first_token is not None:
+            self.time_to_first_token.append(result.time_to_first_token)
+        if result.error is None:
+            self.completed += 1
+        else:
+            self.failed += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Return throughput and latency figures as a plain dictionary."""
+        elapsed = 0.0
+        if self.first_start is not None and self.last_finish is not None:
+            elapsed = self.last_finish - self.first_start
+        turns = self.completed + self.failed
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "events": self.events,
+            "elapsed_s": round(elapsed, 4),
+            "throughput_turns_per_s": round(turns / elapsed, 2) if elapsed > 0 else 0.0,
+            "ttfe_p50_ms": _percentile_ms(self.time_to_first_event, 50),
+            "ttfe_p95_ms": _percentile_ms(self.time_to_first_event, 95),
+            "ttft_p50_ms": _percentile_ms(self.time_to_first_token, 50),
+            "ttft_p95_ms": _percentile_ms(self.time_to_first_token, 95),
+            "turn_p50_ms": _percentile_ms(self.durations, 50),
+            "turn_p95_ms": _percentile_ms(self.durations, 95),
+        }
+
+
+def _percentile_ms(values: List[float], percentile: float) -> Optional[float]:
+    """Return the nearest-rank percentile of ``values`` in milliseconds."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(percentile / 100 * len(ordered))) - 1))
+    return round(ordered[index] * 1000, 2)
+
+
+def event_text(event: Event) -> str:
+    """Return the concatenated text parts of an event (empty if none)."""
+    if event.content is None or not event.content.parts:
+        return ""
+    return "".join(part.text for part in event.content.parts if part.text)
+
+
+class RunnerService:
+    """Serve many agent sessions concurrently from one process.
+
+    Example:
+        >>> service = RunnerService(root_agent, max_concurrency=16)
+        >>> session = await service.create_session("user-1")
+        >>> result = await service.run_turn("user-1", session.id, "Hello")
+        >>> service.stats.summary()["throughput_turns_per_s"]
+    """
+
+    def __init__(
+        self,
+        agent,
+        app_name: str = "my_agent_system",
+        session_service: Optional[BaseSessionService] = None,
+        max_concurrency: int = 8,
+        max_pending_per_session: int = 4,
+        run_config: Optional[RunConfig] = None,
+        trace_collector: Optional[SpanCollector] = None,
+    ):
+        """Initialize the runner service.
+
+        Args:
+            agent: The root ADK agent to run
+            app_name: The application name used for sessions
+            session_service: Session storage; defaults to an in-memory service
+            max_concurrency: Maximum number of turns executing at once
+            max_pending_per_session: Maximum running plus queued turns per session
+            run_config: Optional ADK RunConfig applied to every turn
+            trace_collector: Collector holding the spans of recent turns,
+                as returned by ``configure_tracing()``
+        """
+        self.app_name = app_name
+        self.runner = Runner(
+            agent=agent,
+            app_name=app_name,
+            session_service=session_service or InMemorySessionService(),
+        )
+        self.max_concurrency = max_concurrency
+        self.max_pending_per_session = max_pending_per_session
+        self.run_config = run_config
+        self.trace_collector = trace_collector
+        self.stats = RunnerStats()
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session_locks: Dict[str, asyncio.Lock] = {}
+        self._session_pending: Dict[str, int] = {}
+
+    @classmethod
+    def from_config(cls, agent, config: dict, **kwargs) -> "RunnerService":
+        """Create a service using the ``runner`` section of config.yaml.
+
+        With ``runner.streaming: true`` model output is streamed (SSE), so
+        partial text events arrive while each response is being generated.
+        Sessions are stored by the service selected in the
+        ``session_service`` section (in memory by default). With
+        ``tracing.enabled: true`` spans are recorded and exported, and the
+        spans of recent turns are kept in ``trace_collector``.
+        """
+        settings = config.get('runner', {}) or {}
+        if 'trace_collector' not in kwargs:
+            kwargs['trace_collector'] = configure_tracing(config.get('tracing') or {})
+        if 'session_service' not in kwargs:
+            kwargs['session_service'] = create_session_service(config.get('session_service'))
+        if settings.get('streaming', False):
+            kwargs.setdefault('run_config', RunConfig(streaming_mode=StreamingMode.SSE))
+        kwargs.setdefault('max_concurrency', settings.get('max_concurrency', 8))
+        kwargs.setdefault('max_pending_per_session', settings.get('max_pending_per_session', 4))
+        return cls(agent, **kwargs)
+
+    @property
+    def session_service(self) -> BaseSessionService:
+        """The session service backing this runner."""
+        return self.runner.session_service
+
+    async def create_session(self, user_id: str, state: Optional[dict] = None) -> Session:
+        """Create a new session for ``user_id``."""
+        return await self.session_service.create_session(
+            app_name=self.app_name, user_id=user_id, state=state
+        )
+
+    def _acquire_slot(self, session_id: str) -> asyncio.Lock:
+        """Reserve a queue slot for ``session_id`` or raise SessionBusyError."""
+        pending = self._session_pending.get(session_id, 0)
+        if pending >= self.max_pending_per_session:
+            self.stats.rejected += 1
+            raise SessionBusyError(
+                f"Session '{session_id}' already has {pending} pending turns "
+                f"(limit {self.max_pending_per_session})."
+            )
+        self._session_pending[session_id] = pending + 1
+        return self._session_locks.setdefault(session_id, asyncio.Lock())
+
+    def _release_slot(self, session_id: str) -> None:
+        """Release a queue slot and forget idle sessions."""
+        pending = self._session_pending.get(session_id, 1) - 1
+        if pending <= 0:
+            self._session_pending.pop(session_id, None)
+            self._session_locks.pop(session_id, None)
+        else:
+            self._session_pending[session_id] = pending
+
+    async def stream_turn(
+        self,
+        user_id: str,
+        session_id: str,
+        text: str,
+        run_config: Optional[RunConfig] = None,
+        profile: Optional[bool] = None,
+    ) -> AsyncGenerator[Event, None]:
+        """Run one user turn and yield its events as they arrive.
+
+        Args:
+            profile: Profile this turn (True) or not (False); by default the
+                ``profiling`` settings decide
+
+        Raises:
+            SessionBusyError: If the session's pending-turn limit is reached
+        """
+        with self._turn_span(user_id, session_id):
+            async for event in self._run_events(user_id, session_id, text, run_config, profile):
+                yield event
+
+    def _turn_span(self, user_id: str, session_id: str):
+        """Open the root tracing span of a turn."""
+        return get_tracer().start_as_current_span(
+            "run_turn", attributes={"app.name": self.app_name, "user.id": user_id, "session.id": session_id}
+        )
+
+    async def _run_events(
+        self,
+        user_id: str,
+        session_id: str,
+        text: str,
+        run_config: Optional[RunConfig] = None,
+        profile: Optional[bool] = None,
+        result: Optional[TurnResult] = None,
+    ) -> AsyncGenerator[Event, None]:
+        session_lock = self._acquire_slot(session_id)
+        try:
+            async with session_lock, self._semaphore:
+                # Queueing for the session is not profiled
+                enabled = should_profile(session_id, profile)
+                with profile_request(new_request_id(), "turn", enabled) as profiled:
+                    content = UserContent(parts=[Part(text=text)])
+                    async for event in self.runner.run_async(
+                        user_id=user_id,
+                        session_id=session_id,
+                        new_message=content,
+                        run_config=run_config or self.run_config,
+                    ):
+                        yield event
+                if result is not None:
+                    result.profile_path = profiled.path
+                # A batching session service would otherwise hold the turn's
+                # last events uncommitted until the next turn
+                await self._flush_sessions()
+        finally:
+            self._release_slot(session_id)
+
+    async def run_turn(
+        self, user_id: str, session_id: str, text: str, profile: Optional[bool] = None
+    ) -> TurnResult:
+        """Run one user turn to completion and return its result.
+
+        Errors raised by the agent are captured in ``TurnResult.error``;
+        SessionBusyError is propagated so callers can retry later. With
+        ``profile=True`` (or as selected by the ``profiling`` settings) the
+        turn is profiled and ``TurnResult.profile_path`` names the profile.
+        """
+        with self._turn_span(user_id, session_id):
+            return await self._run_turn(user_id, session_id, text, profile)
+
+    async def _run_turn(self, user_id: str, session_id: str, text: str, profile: Optional[bool]) -> TurnResult:
+        result = TurnResult(user_id=user_id, session_id=session_id, trace_id=current_trace_id())
+        texts = []
+        started = time.perf_counter()
+        try:
+            async for event in self._run_events(user_id, session_id, text, profile=profile, result=result):
+                if result.time_to_first_event is None:
+                    result.time_to_first_event = time.perf_counter() - started
+                result.events += 1
+                if result.time_to_first_token is None and event_text(event):
+                    result.time_to_first_token = time.perf_counter() - started
+                if event.actions and event.actions.state_delta:
+                    result.usage.update(budget_usage(event.actions.state_delta))
+                if not event.partial:
+                    texts.append(event_text(event))
+        except SessionBusyError:
+            raise
+        except Exception as e:
+            self.logger.exception("Turn failed for session %s", session_id)
+            result.error = str(e)
+        finished = time.perf_counter()
+        result.text = "\n".join(t for t in texts if t)
+        result.duration = finished - started
+        self.stats.record(result, started, finished)
+        return result
+
+    async def run_many(
+        self, turns: Iterable[Tuple[str, str, str]], profile: Optional[bool] = None
+    ) -> List[TurnResult]:
+        """Run ``(user_id, session_id, text)`` turns concurrently.
+
+        Turns for the same session run in submission order; rejected turns are
+        reported as failed results instead of raising. ``profile`` applies to
+        every turn (see ``run_turn()``).
+        """
+        async def _run(user_id: str, session_id: str, text: str) -> TurnResult:
+            try:
+                return await self.run_turn(user_id, session_id, text, profile)
+            except SessionBusyError as e:
+                return TurnResult(user_id=user_id, session_id=session_id, error=str(e))
+
+        return list(await asyncio.gather(*(_run(*turn) for turn in turns)))
+
+    async def _flush_sessions(self) -> None:
+        """Commit pending writes of a persistent session service."""
+        flush = getattr(self.session_service, 'flush', None)
+        if flush is not None:
+            await flush()
+
+    async def close(self) -> None:
+        """Release resources held by the underlying runner.
+
+        Pending writes of a persistent session service are flushed first.
+        """
+        await self._flush_sessions()
+        close = getattr(self.runner, 'close', None)
+        if close is not None:
+            await close()
@@ -0,0 +1,545 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""SQLite Session Service - Durable local storage for ADK sessions.
+
+This module implements the SqliteSessionService, an ADK session service that
+keeps sessions in a local SQLite database instead of the process heap, so they
+survive restarts and can be shared by several runner processes on one host.
+
+Storage layout:
+- ``events`` is an append-only log of serialized events, numbered per session
+- ``snapshots`` holds the session-scoped state every ``snapshot_interval``
+  events, so loading a session replays only the deltas after the latest
+  snapshot instead of every event
+- ``archived_events`` is the archival tail: once a session has more than
+  ``keep_events`` events, older events already covered by a snapshot are
+  moved there, so a load reads O(snapshot + recent events) rather than the
+  whole history. Archived events stay on disk and can be read back with
+  ``get_archived_events()``.
+- ``app_state`` and ``user_state`` hold the ``app:`` and ``user:`` scoped
+  state shared across sessions
+
+The database runs in WAL mode, and appended events are committed in batches
+of ``batch_size`` (or after ``commit_interval_seconds``), trading the last
+few events on a crash for far fewer fsyncs. ``flush()`` and ``close()``
+commit any pending batch; RunnerService flushes at the end of every turn, so
+an idle service never holds uncommitted events. Every load is timed in ``rehydration`` so the
+effect of the snapshot and compaction settings can be measured.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, InMemorySessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+from google.adk.sessions.state import State
+
+from shared.config import config_service
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    create_time REAL NOT NULL,
+    update_time REAL NOT NULL,
+    event_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (app_name, user_id, id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS events (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    timestamp REAL NOT NULL,
+    event TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS archived_events (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    timestamp REAL NOT NULL,
+    event TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS snapshots (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS app_state (
+    app_name TEXT PRIMARY KEY,
+    state TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS user_state (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id)
+);
+"""
+
+
+# Load timings kept for percentile reporting
+MAX_SAMPLES = 1000
+
+# Snapshots kept per session when old events are archived
+KEEP_SNAPSHOTS = 2
+
+
+@dataclass
+class RehydrationStats:
+    """Timing of session loads (rehydration) by a SqliteSessionService."""
+    loads: int = 0
+    events_decoded: int = 0
+    deltas_replayed: int = 0
+    durations: deque = field(default_factory=lambda: deque(maxlen=MAX_SAMPLES))
+    decode_durations: deque = field(default_factory=lambda: deque(maxlen=MAX_SAMPLES))
+
+    def record(self, duration: float, decode: float, decoded: int, replayed: int) -> None:
+        """Record one session load."""
+        self.loads += 1
+        self.events_decoded += decoded
+        self.deltas_replayed += replayed
+        self.durations.append(duration)
+        self.decode_durations.append(decode)
+
+    def summary(self) -> Dict[str, Any]:
+        """Return load latency and work per load as a plain dictionary."""
+        def _percentile_ms(values, fraction):
+            if not values:
+                return None
+            ordered = sorted(values)
+            return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000, 2)
+
+        loads = max(1, self.loads)
+        return {
+            "loads": self.loads,
+            "load_p50_ms": _percentile_ms(self.durations, 0.5),
+            "load_p95_ms": _percentile_ms(self.durations, 0.95),
+            "decode_p50_ms": _percentile_ms(self.decode_durations, 0.5),
+            "events_decoded_per_load": round(self.events_decoded / loads, 1),
+            "deltas_replayed_per_load": round(self.deltas_replayed / loads, 1),
+        }
+
+
+def _split_state(state: Dict[str, Any]) -> Tuple[dict, dict, dict]:
+    """Split a state dict into app, user and session scoped parts.
+
+    Scope prefixes are stripped from app and user keys; ``temp:`` keys are
+    dropped because they are never persisted.
+    """
+    app, user, session = {}, {}, {}
+    for key, value in state.items():
+        if key.startswith(State.APP_PREFIX):
+            app[key[len(State.APP_PREFIX):]] = value
+        elif key.startswith(State.USER_PREFIX):
+            user[key[len(State.USER_PREFIX):]] = value
+        elif not key.startswith(State.TEMP_PREFIX):
+            session[key] = value
+    return app, user, session
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=str, separators=(",", ":"))
+
+
+class SqliteSessionService(BaseSessionService):
+    """An ADK session service backed by a local SQLite database.
+
+    Example:
+        service = SqliteSessionService("data/sessions.db")
+        runner = RunnerService(root_agent, session_service=service)
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        snapshot_interval: int = 100,
+        batch_size: int = 32,
+        commit_interval_seconds: float = 0.5,
+        keep_events: int = 0,
+    ):
+        """Open (and if needed create) the session database.
+
+        Args:
+            path: SQLite file path, or ":memory:" for a private in-memory database
+            snapshot_interval: Events between state snapshots of a session
+            batch_size: Appended events per commit (1 commits every event)
+            commit_interval_seconds: Maximum age of an uncommitted batch
+            keep_events: Most recent events kept live when older ones are
+                archived (at each snapshot); 0 never archives
+        """
+        self.path = path
+        self.snapshot_interval = max(1, snapshot_interval)
+        self.batch_size = max(1, batch_size)
+        self.commit_interval_seconds = commit_interval_seconds
+        self.keep_events = max(0, keep_events)
+        self.rehydration = RehydrationStats()
+        self.logger = logging.getLogger(self.__class__.__name__)
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # Safe with WAL: a crash can only lose the last uncommitted batch
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+        self._pending = 0
+        self._last_commit = time.monotonic()
+
+    # -- transactions -------------------------------------------------------
+
+    def _commit(self) -> None:
+        self._db.commit()
+        self._pending = 0
+        self._last_commit = time.monotonic()
+
+    def _maybe_commit(self) -> None:
+        """Commit the current batch once it is full or old enough."""
+        self._pending += 1
+        if (self._pending >= self.batch_size
+                or time.monotonic() - self._last_commit >= self.commit_interval_seconds):
+            self._commit()
+
+    async def flush(self) -> None:
+        """Commit any pending batch of events."""
+        with self._lock:
+            self._commit()
+
+    def close(self) -> None:
+        """Commit pending events and close the database."""
+        with self._lock:
+            self._commit()
+            self._db.close()
+
+    # -- scoped state -------------------------------------------------------
+
+    def _load_scoped(self, app_name: str, user_id: str) -> Tuple[dict, dict]:
+        row = self._db.execute("SELECT state FROM app_state WHERE app_name = ?", (app_name,)).fetchone()
+        app = json.loads(row[0]) if row else {}
+        row = self._db.execute(
+            "SELECT state FROM user_state WHERE app_name = ? AND user_id = ?", (app_name, user_id)
+        ).fetchone()
+        user = json.loads(row[0]) if row else {}
+        return app, user
+
+    def _update_scoped(self, app_name: str, user_id: str, app: dict, user: dict) -> None:
+        """Merge app and user scoped changes into their stored state."""
+        if not app and not user:
+            return
+        stored_app, stored_user = self._load_scoped(app_name, user_id)
+        if app:
+            self._db.execute(
+                "INSERT OR REPLACE INTO app_state (app_name, state) VALUES (?, ?)",
+                (app_name, _dumps({**stored_app, **app})),
+            )
+        if user:
+            self._db.execute(
+                "INSERT OR REPLACE INTO user_state (app_name, user_id, state) VALUES (?, ?, ?)",
+                (app_name, user_id, _dumps({**stored_user, **user})),
+            )
+
+    @staticmethod
+    def _merge_state(session_state: dict, app: dict, user: dict) -> dict:
+        state = dict(session_state)
+        state.update({State.APP_PREFIX + key: value for key, value in app.items()})
+        state.update({State.USER_PREFIX + key: value for key, value in user.items()})
+        return state
+
+    # -- BaseSessionService -------------------------------------------------
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        """Create a session and store its initial state as snapshot 0."""
+        session_id = (session_id or "").strip() or str(uuid.uuid4())
+        app, user, session_state = _split_state(state or {})
+        now = time.time()
+        with self._lock:
+            try:
+                self._db.execute(
+                    "INSERT INTO sessions (app_name, user_id, id, create_time, update_time)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (app_name, user_id, session_id, now, now),
+                )
+            except sqlite3.IntegrityError:
+                raise ValueError(f"Session with id {session_id} already exists.") from None
+            self._db.execute(
+                "INSERT INTO snapshots (app_name, user_id, session_id, seq, state) VALUES (?, ?, ?, 0, ?)",
+                (app_name, user_id, session_id, _dumps(session_state)),
+            )
+            self._update_scoped(app_name, user_id, app, user)
+            self._commit()
+            stored_app, stored_user = self._load_scoped(app_name, user_id)
+        return Session(
+            id=session_id,
+            app_name=app_name,
+            user_id=user_id,
+            state=self._merge_state(session_state, stored_app, stored_user),
+            events=[],
+            last_update_time=now,
+        )
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        """Load a session from its latest snapshot and its live events.
+
+        Archived events are not returned; ``config`` filters apply to the
+        live events only.
+        """
+        started = time.perf_counter()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT update_time FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?",
+                (app_name, user_id, session_id),
+            ).fetchone()
+            if row is None:
+                return None
+            update_time = row[0]
+            snapshot_seq, state_json = self._db.execute(
+                "SELECT seq, state FROM snapshots WHERE app_name = ? AND user_id = ? AND session_id = ?"
+                " ORDER BY seq DESC LIMIT 1",
+                (app_name, user_id, session_id),
+            ).fetchone()
+            first_seq = self._first_returned_seq(app_name, user_id, session_id, config)
+            rows = self._db.execute(
+                "SELECT seq, event FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?"
+                " AND seq > ? ORDER BY seq",
+                (app_name, user_id, session_id, min(snapshot_seq, first_seq - 1)),
+            ).fetchall()
+            app, user = self._load_scoped(app_name, user_id)
+
+        decode_started = time.perf_counter()
+        session_state = json.loads(state_json)
+        events: List[Event] = []
+        replayed = 0
+        for seq, data in rows:
+            event = Event.model_validate_json(data)
+            if seq > snapshot_seq and event.actions and event.actions.state_delta:
+                session_state.update(_split_state(event.actions.state_delta)[2])
+                replayed += 1
+            if seq >= first_seq:
+                events.append(event)
+        finished = time.perf_counter()
+        self.rehydration.record(finished - started, finished - decode_started, len(rows), replayed)
+        return Session(
+            id=session_id,
+            app_name=app_name,
+            user_id=user_id,
+            state=self._merge_state(session_state, app, user),
+            events=events,
+            last_update_time=update_time,
+        )
+
+    def _first_returned_seq(self, app_name: str, user_id: str, session_id: str,
+                            config: Optional[GetSessionConfig]) -> int:
+        """Return the sequence number of the first event ``config`` asks for."""
+        first = 1
+        if config is None:
+            return first
+        key = (app_name, user_id, session_id)
+        if config.after_timestamp is not None:
+            row = self._db.execute(
+                "SELECT MIN(seq) FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?"
+                " AND timestamp >= ?",
+                (*key, config.after_timestamp),
+            ).fetchone()
+            first = row[0] if row[0] is not None else 1 << 62
+        if config.num_recent_events is not None:
+            row = self._db.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                key,
+            ).fetchone()
+            first = max(first, row[0] - config.num_recent_events + 1)
+        return first
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: Optional[str] = None
+    ) -> ListSessionsResponse:
+        """List sessions, oldest update first, without their events and state."""
+        query = "SELECT user_id, id, update_time FROM sessions WHERE app_name = ?"
+        params: List[Any] = [app_name]
+        if user_id is not None:
+            query += " AND user_id = ?"
+            params.append(user_id)
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY update_time", params).fetchall()
+        return ListSessionsResponse(sessions=[
+            Session(id=session_id, app_name=app_name, user_id=owner, state={}, events=[],
+                    last_update_time=update_time)
+            for owner, session_id, update_time in rows
+        ])
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        """Delete a session with its events and snapshots."""
+        key = (app_name, user_id, session_id)
+        with self._lock:
+            self._db.execute("DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?", key)
+            for table in ("events", "archived_events", "snapshots"):
+                self._db.execute(
+                    f"DELETE FROM {table} WHERE app_name = ? AND user_id = ? AND session_id = ?", key
+                )
+            self._commit()
+
+    async def get_user_state(self, *, app_name: str, user_id: str) -> Dict[str, Any]:
+        """Return the ``user:`` scoped state without its prefix."""
+        with self._lock:
+            return self._load_scoped(app_name, user_id)[1]
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        """Append an event to the session and to the event log."""
+        event = await super().append_event(session=session, event=event)
+        if event.partial:
+            return event
+        session.last_update_time = event.timestamp
+        key = (session.app_name, session.user_id, session.id)
+        delta = event.actions.state_delta if event.actions else None
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE sessions SET event_count = event_count + 1, update_time = ?"
+                " WHERE app_name = ? AND user_id = ? AND id = ?",
+                (event.timestamp, *key),
+            )
+            if cursor.rowcount == 0:
+                raise ValueError(f"Session {session.id} not found.")
+            seq = self._db.execute(
+                "SELECT event_count FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?", key
+            ).fetchone()[0]
+            self._db.execute(
+                "INSERT INTO events (app_name, user_id, session_id, seq, timestamp, event)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, seq, event.timestamp, event.model_dump_json(exclude_none=True)),
+            )
+            if delta:
+                app, user, _ = _split_state(delta)
+                self._update_scoped(*key[:2], app, user)
+            if seq % self.snapshot_interval == 0:
+                self._db.execute(
+                    "INSERT INTO snapshots (app_name, user_id, session_id, seq, state) VALUES (?, ?, ?, ?, ?)",
+                    (*key, seq, _dumps(_split_state(session.state)[2])),
+                )
+                if self.keep_events and seq > self.keep_events:
+                    self._archive(key, seq - self.keep_events)
+            self._maybe_commit()
+        return event
+
+    def _archive(self, key: Tuple[str, str, str], through_seq: int) -> int:
+        """Move events up to ``through_seq`` to the archive; return how many moved.
+
+        ``through_seq`` must not be past the latest snapshot, which is what
+        keeps the session state reconstructible from the live events.
+        """
+        where = "app_name = ? AND user_id = ? AND session_id = ? AND seq <= ?"
+        self._db.execute(
+            f"INSERT OR IGNORE INTO archived_events SELECT * FROM events WHERE {where}",
+            (*key, through_seq),
+        )
+        moved = self._db.execute(f"DELETE FROM events WHERE {where}", (*key, through_seq)).rowcount
+        # Older snapshots are no longer needed to rebuild the state
+        self._db.execute(
+            "DELETE FROM snapshots WHERE app_name = ? AND user_id = ? AND session_id = ? AND seq < ("
+            " SELECT MIN(seq) FROM (SELECT seq FROM snapshots WHERE app_name = ? AND user_id = ?"
+            " AND session_id = ? ORDER BY seq DESC LIMIT ?))",
+            (*key, *key, KEEP_SNAPSHOTS),
+        )
+        return moved
+
+    async def compact_session(self, *, app_name: str, user_id: str, session_id: str) -> int:
+        """Snapshot a session now and archive all but its ``keep_events`` latest events.
+
+        Useful for sessions written before ``keep_events`` was set.
+
+        Returns:
+            The number of events archived
+        """
+        session = await self.get_session(app_name=app_name, user_id=user_id, session_id=session_id)
+        if session is None:
+            raise ValueError(f"Session {session_id} not found.")
+        key = (app_name, user_id, session_id)
+        with self._lock:
+            seq = self._db.execute(
+                "SELECT event_count FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?", key
+            ).fetchone()[0]
+            self._db.execute(
+                "INSERT OR REPLACE INTO snapshots (app_name, user_id, session_id, seq, state)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (*key, seq, _dumps(_split_state(session.state)[2])),
+            )
+            moved = self._archive(key, seq - self.keep_events)
+            self._commit()
+        return moved
+
+    async def get_archived_events(self, *, app_name: str, user_id: str, session_id: str) -> List[Event]:
+        """Return the archived events of a session, oldest first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT event FROM archived_events WHERE app_name = ? AND user_id = ? AND session_id = ?"
+                " ORDER BY seq",
+                (app_name, user_id, session_id),
+            ).fetchall()
+        return [Event.model_validate_json(data) for (data,) in rows]
+
+
+def create_session_service(settings: Optional[dict]) -> BaseSessionService:
+    """Create the session service selected by the ``session_service`` section.
+
+    ``backend: memory`` (the default) keeps sessions in the process heap;
+    ``backend: sqlite`` stores them in the database at ``sqlite.path``,
+    which is resolved against the directory of config.yaml when relative.
+    """
+    settings = settings or {}
+    backend = settings.get('backend', 'memory')
+    if backend == 'memory':
+        return InMemorySessionService()
+    if backend != 'sqlite':
+        raise ValueError(f"Unknown session_service backend: {backend}")
+    sqlite_settings = settings.get('sqlite') or {}
+    path = sqlite_settings.get('path') or ":memory:"
+    if path != ":memory:" and not os.path.isabs(path):
+        path = os.path.join(os.path.dirname(os.path.abspath(config_service.path)), path)
+    return SqliteSessionService(
+        path,
+        snapshot_interval=sqlite_settings.get('snapshot_interval', 100),
+        batch_size=sqlite_settings.get('batch_size', 32),
+        commit_interval_seconds=sqlite_settings.get('commit_interval_seconds', 0.5),
+        keep_events=sqlite_settings.get('keep_events', 0),
+    )
@@ -18,6 +18,13 @@ This module contains utility functions that are used by various components
 of the agentic system:
 - Response formatting utilities
 - Information extraction utilities
+- The shared, hot-reloadable configuration service
+- Search and semantic response caches
+- Session state size accounting and eviction
+- Near-duplicate detection for research findings
+- Memoization of tool call results
+- Tracing spans and per-request latency breakdowns
+- Per-request cProfile profiling
 """
 
 # This file makes the shared directory a Python package
\ No newline at end of file
@@ -0,0 +1,184 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Agent Budgets - Cap model turns, tool calls, tokens and wall-clock time.
+
+This module provides the BudgetEnforcer, a set of ADK callbacks that every
+agent built from ``BaseAgent`` carries (see ``BaseAgent.get_callbacks()``).
+Limits come from the ``budgets`` section of config.yaml: a ``default`` block
+plus optional per-agent overrides under ``agents``.
+
+Usage is accounted per invocation in session state under
+``budget:<AgentName>``, so it appears in the event stream and the final
+session. When a limit is reached the agent stops gracefully: further tool
+calls are refused with an explanatory result, and the next model call is
+replaced by a short final answer instead of raising.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+# Prefix of the session state keys that hold per-agent usage
+STATE_PREFIX = "budget:"
+
+# Rough characters-per-token ratio used when a model reports no usage
+CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class AgentBudget:
+    """Limits for one agent invocation. A limit of 0 disables it.
+
+    The deadline is measured from the agent's first model call.
+    """
+    max_turns: int = 0
+    max_tool_calls: int = 0
+    max_tokens: int = 0
+    deadline_seconds: float = 0
+
+    @classmethod
+    def from_config(cls, agent_name: str, settings: Optional[dict]) -> "AgentBudget":
+        """Resolve the budget for ``agent_name`` from the ``budgets`` section."""
+        settings = settings or {}
+        values = dict(settings.get('default') or {})
+        values.update((settings.get('agents') or {}).get(agent_name) or {})
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in values.items() if k in names})
+
+
+class BudgetEnforcer:
+    """ADK callbacks that account for and enforce an agent's budget."""
+
+    def __init__(self, agent_name: str, budget: AgentBudget):
+        """Initialize the enforcer.
+
+        Args:
+            agent_name: Name of the agent the callbacks are attached to
+            budget: The limits to enforce
+        """
+        self.agent_name = agent_name
+        self.budget = budget
+        self.state_key = STATE_PREFIX + agent_name
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    @classmethod
+    def from_config(cls, agent_name: str, settings: Optional[dict]) -> Optional["BudgetEnforcer"]:
+        """Create an enforcer from the ``budgets`` section, or None if disabled."""
+        if not (settings or {}).get('enabled', False):
+            return None
+        return cls(agent_name, AgentBudget.from_config(agent_name, settings))
+
+    def callbacks(self) -> Dict[str, list]:
+        """Return the callbacks as Agent keyword arguments."""
+        return {
+            'before_model_callback': [self.before_model_callback],
+            'after_model_callback': [self.after_model_callback],
+            'before_tool_callback': [self.before_tool_callback],
+        }
+
+    def _usage(self, context: CallbackContext) -> Dict[str, Any]:
+        """Return this invocation's usage, starting a new record if needed."""
+        usage = context.state.get(self.state_key)
+        if not isinstance(usage, dict) or usage.get('invocation_id') != context.invocation_id:
+            usage = {
+                'invocation_id': context.invocation_id,
+                'started_at': time.time(),
+                'turns': 0,
+                'tool_calls': 0,
+                'tokens': 0,
+                'exceeded': None,
+            }
+        return dict(usage)
+
+    def _save(self, context: CallbackContext, usage: Dict[str, Any]) -> None:
+        # State values are replaced, never mutated, so ADK records the delta
+        usage['elapsed_s'] = round(time.time() - usage['started_at'], 3)
+        context.state[self.state_key] = usage
+
+    def _exceeded(self, usage: Dict[str, Any]) -> Optional[str]:
+        """Return the name of the first exhausted limit, if any."""
+        budget = self.budget
+        if budget.max_turns and usage['turns'] >= budget.max_turns:
+            return 'max_turns'
+        if budget.max_tokens and usage['tokens'] >= budget.max_tokens:
+            return 'max_tokens'
+        if budget.deadline_seconds and time.time() - usage['started_at'] >= budget.deadline_seconds:
+            return 'deadline_seconds'
+        return None
+
+    def before_model_callback(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        """Count the model turn, or end the agent if its budget is spent."""
+        usage = self._usage(callback_context)
+        exceeded = self._exceeded(usage)
+        if exceeded is None:
+            usage['turns'] += 1
+            self._save(callback_context, usage)
+            return None
+        usage['exceeded'] = exceeded
+        self._save(callback_context, usage)
+        self.logger.warning("%s stopped early: %s budget exhausted", self.agent_name, exceeded)
+        return LlmResponse(content=types.Content(role="model", parts=[types.Part(
+            text=f"{self.agent_name} stopped early because its {exceeded} budget was exhausted."
+        )]))
+
+    def after_model_callback(
+        self, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        """Add the tokens used by a completed model call."""
+        if llm_response.partial:
+            return None
+        metadata = llm_response.usage_metadata
+        tokens = metadata.total_token_count if metadata is not None else None
+        if tokens is None and llm_response.content is not None:
+            text = "".join(part.text or "" for part in llm_response.content.parts or [])
+            tokens = len(text) // CHARS_PER_TOKEN
+        usage = self._usage(callback_context)
+        usage['tokens'] += tokens or 0
+        self._save(callback_context, usage)
+        return None
+
+    def before_tool_callback(self, tool, args: Dict[str, Any], tool_context) -> Optional[dict]:
+        """Count the tool call, or refuse it once the tool budget is spent."""
+        usage = self._usage(tool_context)
+        exceeded = self._exceeded(usage)
+        if exceeded is None and self.budget.max_tool_calls and usage['tool_calls'] >= self.budget.max_tool_calls:
+            exceeded = 'max_tool_calls'
+        if exceeded is None:
+            usage['tool_calls'] += 1
+            self._save(tool_context, usage)
+            return None
+        usage['exceeded'] = exceeded
+        self._save(tool_context, usage)
+        return {
+            "error": f"{tool.name} was not called: the {exceeded} budget is exhausted. "
+                     "Answer with the information gathered so far."
+        }
+
+
+def budget_usage(state: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Return per-agent usage records found in a state dict or state delta."""
+    return {
+        key[len(STATE_PREFIX):]: value
+        for key, value in state.items()
+        if key.startswith(STATE_PREFIX) and isinstance(value, dict)
+    }
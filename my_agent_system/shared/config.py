@@ -0,0 +1,217 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Config Service - Single shared loader for config.yaml.
+
+This module provides the ConfigService, which parses config.yaml once and
+shares the result across the whole system. It detects changes to the file
+by its modification time (either on access, throttled, or from a background
+watcher thread), re-parses it, and notifies registered change callbacks so
+that affected agents can be rebuilt without restarting the process.
+"""
+
+import copy
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+import yaml
+
+# Environment variable that overrides the location of config.yaml
+CONFIG_PATH_ENV_VAR = "AGENT_SYSTEM_CONFIG"
+
+# config.yaml lives in the root of the 'google_adk_cookbook' project
+DEFAULT_CONFIG_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'config.yaml')
+)
+
+# Used when config.yaml cannot be found
+DEFAULT_CONFIG = {'agent_settings': {'model': 'gemini-1.5-flash'}}
+
+ChangeCallback = Callable[[dict, dict], None]
+
+
+class ConfigService:
+    """Parsed-once, hot-reloadable view of config.yaml.
+
+    Values are read with ``get()`` or the typed accessors (``get_str``,
+    ``get_int``, ``get_float``, ``get_bool``), all of which take a dotted path
+    such as ``"agent_settings.model"``. Callbacks registered with
+    ``on_change()`` are invoked with ``(old_config, new_config)`` whenever a
+    reload produces different content.
+    """
+
+    def __init__(self, path: Optional[str] = None, check_interval: float = 1.0):
+        """Initialize the config service.
+
+        Args:
+            path: Path to the YAML file. Defaults to $AGENT_SYSTEM_CONFIG or the
+                project's config.yaml
+            check_interval: Minimum seconds between mtime checks on access
+        """
+        self.path = os.path.abspath(path or os.environ.get(CONFIG_PATH_ENV_VAR) or DEFAULT_CONFIG_PATH)
+        self.check_interval = check_interval
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._lock = threading.RLock()
+        self._config: Optional[dict] = None
+        self._mtime: Optional[float] = None
+        self._last_check = 0.0
+        self._callbacks: List[ChangeCallback] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+
+    def _stat(self) -> Optional[float]:
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+    def _parse(self) -> dict:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return yaml.safe_load(f) or {}
+        except FileNotFoundError:
+            self.logger.warning("Config file not found at %s, using defaults", self.path)
+            return copy.deepcopy(DEFAULT_CONFIG)
+
+    def reload(self) -> bool:
+        """Re-parse the config file and notify callbacks if its content changed.
+
+        Returns:
+            True if the parsed configuration differs from the previous one
+        """
+        with self._lock:
+            old = self._config
+            self._mtime = self._stat()
+            self._last_check = time.monotonic()
+            new = self._parse()
+            self._config = new
+            changed = old is not None and new != old
+            callbacks = list(self._callbacks)
+        if changed:
+            self.logger.info("Configuration reloaded from %s", self.path)
+            for callback in callbacks:
+                try:
+                    callback(old, new)
+                except Exception:
+                    self.logger.exception("Config change callback %r failed", callback)
+        return changed
+
+    def reload_if_changed(self) -> bool:
+        """Reload the config if the file's modification time has changed.
+
+        Returns:
+            True if a reload happened and produced different content
+        """
+        with self._lock:
+            if self._config is not None and self._stat() == self._mtime:
+                self._last_check = time.monotonic()
+                return False
+        return self.reload()
+
+    def get(self, path: Optional[str] = None, default: Any = None) -> Any:
+        """Return the whole config, or the value at a dotted path.
+
+        The file's mtime is checked at most once every ``check_interval``
+        seconds, so frequent calls stay cheap.
+        """
+        if self._config is None or time.monotonic() - self._last_check >= self.check_interval:
+            self.reload_if_changed()
+        value = self._config
+        if path is None:
+            return value
+        for part in path.split('.'):
+            if not isinstance(value, dict) or part not in value:
+                return default
+            value = value[part]
+        return value
+
+    def get_str(self, path: str, default: str = "") -> str:
+        """Return the value at ``path`` as a string."""
+        value = self.get(path, default)
+        return default if value is None else str(value)
+
+    def get_int(self, path: str, default: int = 0) -> int:
+        """Return the value at ``path`` as an int."""
+        value = self.get(path, default)
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            self.logger.warning("Config value %s=%r is not an int, using %r", path, value, default)
+            return default
+
+    def get_float(self, path: str, default: float = 0.0) -> float:
+        """Return the value at ``path`` as a float."""
+        value = self.get(path, default)
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            self.logger.warning("Config value %s=%r is not a float, using %r", path, value, default)
+            return default
+
+    def get_bool(self, path: str, default: bool = False) -> bool:
+        """Return the value at ``path`` as a bool ("true"/"yes"/"1"/"on" are truthy)."""
+        value = self.get(path, default)
+        if isinstance(value, str):
+            return value.strip().lower() in ("true", "yes", "1", "on")
+        return bool(value)
+
+    @property
+    def model_name(self) -> str:
+        """The default model for all agents (agent_settings.model)."""
+        return self.get_str('agent_settings.model', DEFAULT_CONFIG['agent_settings']['model'])
+
+    def on_change(self, callback: ChangeCallback) -> ChangeCallback:
+        """Register a callback invoked with (old_config, new_config) on change.
+
+        Returns the callback so this can be used as a decorator.
+        """
+        with self._lock:
+            self._callbacks.append(callback)
+        return callback
+
+    def remove_callback(self, callback: ChangeCallback) -> None:
+        """Unregister a previously registered change callback."""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def start_watching(self, interval: float = 2.0) -> None:
+        """Start a daemon thread that polls the file's mtime and hot-reloads it."""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop_watching.clear()
+
+        def _watch():
+            while not self._stop_watching.wait(interval):
+                try:
+                    self.reload_if_changed()
+                except Exception:
+                    self.logger.exception("Config watcher failed to reload %s", self.path)
+
+        self._watcher = threading.Thread(target=_watch, name="config-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """Stop the background watcher thread, if running."""
+        self._stop_watching.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+
+# Shared instance used by all agents
+config_service = ConfigService()
@@ -0,0 +1,217 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Context Compaction - Keep downstream research stages on small prompts.
+
+Inside the research SequentialAgent every stage normally sees the whole
+conversation so far, including every raw search result the research stage
+pulled. This module shrinks that context in two steps:
+
+1. ``compact_findings()`` turns the research stage's report into a bounded,
+   deduplicated findings object (key points, sources and token estimates)
+   that is stored in session state. Near-duplicate points, such as the same
+   fact from two overlapping articles, are dropped (MinHash/LSH, see
+   ``shared.dedup``), and when the report has more points than fit, the
+   most central ones are kept (TextRank, see ``shared.utils``)
+2. ``stage_context_callback()`` builds a ``before_model_callback`` that
+   replaces a downstream stage's conversation with the original request plus
+   the compacted state it needs, truncated to that stage's token budget
+
+Token counts are estimated from character length, which is good enough for
+budgeting and needs no tokenizer.
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from shared.dedup import deduplicate
+from shared.utils import rank_order, split_sentences
+
+# Rough characters-per-token ratio used for budgeting
+CHARS_PER_TOKEN = 4
+
+_URL = re.compile(r"https?://[^\s<>\"')\]]+")
+_BULLET = re.compile(r"^\s*(?:[-*+•]|\d+[.)])\s+")
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in ``text``."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut ``text`` to roughly ``max_tokens`` tokens at a word boundary."""
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit].rsplit(" ", 1)[0]
+    return cut.rstrip() + " …"
+
+
+def _candidate_points(text: str) -> List[str]:
+    """Split a report into sentence-sized points, skipping headings."""
+    points = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or set(line) <= set("-=*_`|"):
+            continue
+        line = _BULLET.sub("", line).replace("**", "")
+        points.extend(split_sentences(line))
+    return points
+
+
+def compact_findings(
+    text: str,
+    max_tokens: int = 800,
+    max_points: int = 12,
+    ranking: str = "textrank",
+    dedup_threshold: Optional[float] = None,
+    shingle_size: int = 2,
+) -> Dict[str, Any]:
+    """Compact a research report into a bounded findings object.
+
+    Duplicate points (ignoring case, punctuation and whitespace) are dropped,
+    as are near-duplicates of an earlier point when ``dedup_threshold`` is
+    set. The remaining points are taken best first until ``max_points`` or the
+    ``max_tokens`` budget is reached, and kept in their original order. Every
+    URL in the report is collected into ``sources`` regardless of the budget.
+
+    Args:
+        text: The research stage's report
+        max_tokens: Budget for the rendered key points
+        max_points: Maximum number of key points
+        ranking: How points are ranked: ``textrank`` or ``tfidf`` (most
+            central first) or ``lead`` (report order)
+        dedup_threshold: Word-shingle Jaccard similarity at or above which a
+            point duplicates an earlier one; None only drops exact duplicates
+        shingle_size: Words per shingle for near-duplicate detection
+
+    Returns:
+        A dict with ``key_points``, ``sources``, ``token_estimate`` (of the
+        compacted findings), ``source_tokens`` (of the original report) and
+        ``dedup`` (the number, bytes and tokens of duplicate points removed)
+
+    Examples:
+        >>> compact_findings("Qubits are fragile. Qubits are FRAGILE!")["key_points"]
+        ['Qubits are fragile.']
+    """
+    text = text if isinstance(text, str) else ("" if text is None else str(text))
+    sources = list(dict.fromkeys(url.rstrip(".,;:") for url in _URL.findall(text)))
+
+    points, seen, removed = [], set(), []
+    for point in _candidate_points(text):
+        key = _NON_WORD.sub(" ", point.lower()).strip()
+        if key in seen:
+            removed.append(point)
+        elif key:
+            seen.add(key)
+            points.append(point)
+    if dedup_threshold and len(points) > 1:
+        result = deduplicate(points, dedup_threshold, shingle_size=shingle_size)
+        removed.extend(points[index] for index in result.duplicates)
+        points = [points[index] for index in result.kept]
+
+    chosen, used = [], 0
+    for index in rank_order(points, ranking):
+        if len(chosen) >= max_points:
+            break
+        cost = estimate_tokens(points[index]) + 1
+        if used + cost > max_tokens:
+            if ranking == "lead":
+                break
+            # A shorter, lower-ranked point may still fit
+            continue
+        chosen.append(index)
+        used += cost
+    key_points = [points[index] for index in sorted(chosen)]
+
+    findings = {
+        "key_points": key_points,
+        "sources": sources,
+        "source_tokens": estimate_tokens(text),
+        "dedup": {
+            "removed": len(removed),
+            "bytes_removed": sum(len(point.encode("utf-8")) for point in removed),
+            "tokens_removed": sum(estimate_tokens(point) for point in removed),
+        },
+    }
+    findings["token_estimate"] = estimate_tokens(render_findings(findings))
+    return findings
+
+
+def render_findings(findings: Dict[str, Any]) -> str:
+    """Render a findings object as compact Markdown."""
+    lines = ["## Research Findings"]
+    lines.extend(f"- {point}" for point in findings.get("key_points", []))
+    if findings.get("sources"):
+        lines.append("\n## Sources")
+        lines.extend(f"- {url}" for url in findings["sources"])
+    return "\n".join(lines)
+
+
+def _request_text(callback_context: CallbackContext) -> str:
+    content = callback_context.user_content
+    if content is None or not content.parts:
+        return ""
+    return "".join(part.text or "" for part in content.parts)
+
+
+def stage_context_callback(
+    max_tokens: int, state_keys: List[str] = ("research_findings",)
+) -> Callable[[CallbackContext, LlmRequest], Optional[LlmResponse]]:
+    """Build a before_model_callback that compacts a stage's conversation.
+
+    When the findings are available in session state, the request's contents
+    are replaced with a single user message holding the original request and
+    the listed state entries, truncated to ``max_tokens``. Otherwise the
+    request is left untouched.
+
+    Args:
+        max_tokens: Token budget for the stage's conversation
+        state_keys: Session state keys to include, in order. Findings dicts
+            are rendered with ``render_findings()``; other values as text
+
+    Returns:
+        A callback suitable for an Agent's ``before_model_callback``
+    """
+
+    def _compact_context(
+        callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        state = callback_context.state
+        if not isinstance(state.get(state_keys[0]), dict):
+            return None
+        last = llm_request.contents[-1] if llm_request.contents else None
+        if last is not None and any(part.function_response for part in last.parts or []):
+            # The stage is mid-way through its own tool calls; keep them.
+            return None
+
+        sections = [f"Request: {_request_text(callback_context)}"]
+        for key in state_keys:
+            value = state.get(key)
+            if isinstance(value, dict):
+                sections.append(render_findings(value))
+            elif value:
+                sections.append(f"## {key.replace('_', ' ').title()}\n{value}")
+        text = truncate_to_tokens("\n\n".join(sections), max_tokens)
+        llm_request.contents = [types.Content(role="user", parts=[types.Part(text=text)])]
+        return None
+
+    return _compact_context
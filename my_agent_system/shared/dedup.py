@@ -0,0 +1,228 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Dedup - Local near-duplicate detection with MinHash and LSH.
+
+SearchAgent calls for overlapping questions return overlapping articles, so
+the research report repeats itself in slightly different words. Exact
+matching misses these; comparing every pair of passages is quadratic. This
+module finds near-duplicates in roughly linear time:
+
+- each text becomes a set of word shingles (runs of ``shingle_size`` words)
+- a MinHash signature of ``num_perm`` values estimates the Jaccard
+  similarity of two shingle sets from the fraction of equal values
+- signatures are cut into bands and hashed into LSH buckets, so only texts
+  sharing a bucket are compared; the band layout is chosen so that pairs
+  around ``threshold`` similarity become candidates
+- candidates are confirmed with the exact Jaccard similarity of their
+  shingle sets
+
+Signatures are computed with NumPy, one vectorized min over all shingle
+hashes and permutations per text, and are deterministic across processes.
+"""
+
+import re
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_SHIFT = np.uint64(32)
+_WORD = re.compile(r"[^\W_]+")
+
+# Texts signed together by NearDuplicateIndex.add_many()
+_BATCH_SIZE = 256
+
+
+def shingles(text: str, size: int = 3) -> FrozenSet[str]:
+    """Return the set of ``size``-word shingles of a text.
+
+    Words are lowercased and stripped of punctuation; texts of at most
+    ``size`` words form a single shingle.
+
+    Examples:
+        >>> sorted(shingles("Qubits are fragile, very fragile!", 2))
+        ['are fragile', 'fragile very', 'qubits are', 'very fragile']
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return frozenset([" ".join(words)])
+    return frozenset(" ".join(words[i:i + size]) for i in range(len(words) - size + 1))
+
+
+def jaccard(first: FrozenSet[str], second: FrozenSet[str]) -> float:
+    """Return the Jaccard similarity of two shingle sets."""
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+
+def optimal_bands(threshold: float, num_perm: int, miss_weight: float = 0.9) -> Tuple[int, int]:
+    """Choose ``(bands, rows)`` with ``bands * rows == num_perm`` for a threshold.
+
+    Two texts with Jaccard similarity ``s`` share a bucket with probability
+    ``1 - (1 - s**rows)**bands``. The layout minimizing the weighted area of
+    missed pairs (above ``threshold``) and needless candidates (below it) is
+    chosen. Misses weigh more by default, since every candidate is confirmed
+    exactly anyway.
+    """
+    similarity = np.linspace(0.0, 1.0, 201)
+    below = similarity < threshold
+
+    def _cost(layout: Tuple[int, int]) -> float:
+        bands, rows = layout
+        candidate = 1.0 - (1.0 - similarity ** rows) ** bands
+        return float(miss_weight * np.mean(np.where(below, 0.0, 1.0 - candidate))
+                     + (1.0 - miss_weight) * np.mean(np.where(below, candidate, 0.0)))
+
+    return min(((num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0), key=_cost)
+
+
+@dataclass
+class DedupResult:
+    """The outcome of ``deduplicate()``."""
+
+    kept: List[int] = field(default_factory=list)
+    # Index of each removed text -> index of the kept text it duplicates
+    duplicates: Dict[int, int] = field(default_factory=dict)
+    bytes_in: int = 0
+    bytes_removed: int = 0
+
+    def summary(self) -> Dict[str, int]:
+        """Return counts of texts and bytes kept and removed."""
+        return {
+            "items": len(self.kept) + len(self.duplicates),
+            "removed": len(self.duplicates),
+            "bytes_in": self.bytes_in,
+            "bytes_removed": self.bytes_removed,
+        }
+
+
+class NearDuplicateIndex:
+    """An LSH index that rejects texts similar to ones already added."""
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        """Initialize the index.
+
+        Args:
+            threshold: Jaccard similarity at or above which texts are duplicates
+            num_perm: MinHash signature length; more is more accurate and slower
+            shingle_size: Words per shingle
+            seed: Seed for the MinHash permutations
+        """
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: a is odd, products wrap around at 2**64
+        self._a = rng.integers(0, 1 << 64, size=num_perm, dtype=np.uint64, endpoint=False) | np.uint64(1)
+        self._b = rng.integers(0, 1 << 64, size=num_perm, dtype=np.uint64, endpoint=False)
+        # Folds each band of a signature into one bucket key
+        self._band_weights = rng.integers(1, 1 << 32, size=self.rows, dtype=np.uint64)
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(self.bands)]
+        self._shingles: List[FrozenSet[str]] = []
+
+    def __len__(self) -> int:
+        return len(self._shingles)
+
+    def signatures(self, shingle_sets: Sequence[FrozenSet[str]]) -> np.ndarray:
+        """Return the MinHash signatures of shingle sets, one row per set.
+
+        All shingles of all sets are permuted in one array operation, and
+        each set's minimum is taken with ``np.minimum.reduceat``.
+        """
+        counts = [len(shingle_set) for shingle_set in shingle_sets]
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle_set in shingle_sets for shingle in shingle_set),
+            dtype=np.uint64, count=sum(counts),
+        )
+        # (a * h + b) >> 32 for every shingle (rows) and permutation (columns)
+        permuted = (np.outer(hashes, self._a) + self._b) >> _SHIFT
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        return np.minimum.reduceat(permuted, offsets, axis=0)
+
+    def add(self, text: str) -> Optional[int]:
+        """Add a text unless it near-duplicates one already in the index.
+
+        Returns:
+            None if the text was added, otherwise the position (in order of
+            addition) of the text it duplicates
+        """
+        return self.add_many([text])[0]
+
+    def add_many(self, texts: Sequence[str]) -> List[Optional[int]]:
+        """Add texts in order, as ``add()`` would, signing them in batches."""
+        results: List[Optional[int]] = []
+        for start in range(0, len(texts), _BATCH_SIZE):
+            shingle_sets = [shingles(text, self.shingle_size) for text in texts[start:start + _BATCH_SIZE]]
+            signatures = self.signatures(shingle_sets).reshape(len(shingle_sets), self.bands, self.rows)
+            band_keys = (signatures * self._band_weights).sum(axis=2).tolist()
+            results.extend(map(self._insert, shingle_sets, band_keys))
+        return results
+
+    def _insert(self, shingle_set: FrozenSet[str], keys: List[int]) -> Optional[int]:
+        checked = set()
+        for buckets, key in zip(self._buckets, keys):
+            for candidate in buckets.get(key, ()):
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+                if jaccard(shingle_set, self._shingles[candidate]) >= self.threshold:
+                    return candidate
+        position = len(self._shingles)
+        self._shingles.append(shingle_set)
+        for buckets, key in zip(self._buckets, keys):
+            buckets.setdefault(key, []).append(position)
+        return None
+
+
+def deduplicate(
+    texts: Sequence[str], threshold: float = 0.8, num_perm: int = 128, shingle_size: int = 3
+) -> DedupResult:
+    """Find the texts that near-duplicate an earlier text.
+
+    Args:
+        texts: The texts, in priority order; the first of a group is kept
+        threshold: Jaccard similarity at or above which texts are duplicates
+        num_perm: MinHash signature length
+        shingle_size: Words per shingle
+
+    Returns:
+        A DedupResult with the kept indices, the duplicates and byte counts
+
+    Examples:
+        >>> deduplicate([
+        ...     "IBM unveiled a 1,121 qubit processor called Condor in December 2023.",
+        ...     "Qubits are fragile.",
+        ...     "In December 2023 IBM unveiled a 1,121 qubit processor called Condor.",
+        ... ], threshold=0.5).duplicates
+        {2: 0}
+    """
+    index = NearDuplicateIndex(threshold, num_perm, shingle_size)
+    result = DedupResult()
+    added: List[int] = []
+    for position, (text, duplicate_of) in enumerate(zip(texts, index.add_many(texts))):
+        size = len(text.encode("utf-8"))
+        result.bytes_in += size
+        if duplicate_of is None:
+            added.append(position)
+            result.kept.append(position)
+        else:
+            result.duplicates[position] = added[duplicate_of]
+            result.bytes_removed += size
+    return result
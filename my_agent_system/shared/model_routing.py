@@ -0,0 +1,170 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Model Routing - Per-agent model tiers and observed latency/cost.
+
+``resolve_model()`` picks the model for an agent from the ``model_routing``
+section of config.yaml. Each agent can name a tier (e.g. ``fast`` for
+routing and classification steps, ``strong`` for deep analysis) or an
+explicit model; agents that are not listed use ``agent_settings.model``.
+
+``ModelUsageRecorder`` is a pair of model callbacks that record the latency,
+token usage and estimated cost of every model call per agent, so the effect
+of a tiering change can be measured. ``usage_recorder`` is the shared
+instance attached to every agent in the system.
+"""
+
+import statistics
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Dict, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+from llm import is_fake_model
+
+# Latency samples kept per agent for percentile reporting
+MAX_SAMPLES = 1000
+
+
+def resolve_model(config: dict, agent_name: str) -> str:
+    """Return the model ``agent_name`` should use under ``config``.
+
+    When the default model is a local ``fake/`` model, every agent keeps it,
+    so offline runs never reach a real model through a tier.
+
+    Examples:
+        >>> config = {'agent_settings': {'model': 'm'},
+        ...           'model_routing': {'tiers': {'fast': 'f'}, 'agents': {'A': 'fast', 'B': 'x'}}}
+        >>> resolve_model(config, 'A'), resolve_model(config, 'B'), resolve_model(config, 'C')
+        ('f', 'x', 'm')
+    """
+    default = (config.get('agent_settings') or {}).get('model')
+    routing = config.get('model_routing') or {}
+    choice = (routing.get('agents') or {}).get(agent_name)
+    if not choice or is_fake_model(default):
+        return default
+    return (routing.get('tiers') or {}).get(choice, choice)
+
+
+def _percentile(samples: list, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ModelUsageRecorder:
+    """Record per-agent model latency and token usage through model callbacks."""
+
+    def __init__(self):
+        """Initialize an empty recorder."""
+        self._lock = threading.Lock()
+        self._pending: Dict[tuple, tuple] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget everything recorded so far."""
+        with self._lock:
+            self._pending.clear()
+            self._latencies = defaultdict(lambda: deque(maxlen=MAX_SAMPLES))
+            self._totals = defaultdict(lambda: {'calls': 0, 'prompt_tokens': 0, 'output_tokens': 0})
+
+    def record(self, agent_name: str, model: str, latency_s: float,
+               prompt_tokens: int = 0, output_tokens: int = 0) -> None:
+        """Record one completed model call."""
+        with self._lock:
+            self._latencies[(agent_name, model)].append(latency_s)
+            totals = self._totals[(agent_name, model)]
+            totals['calls'] += 1
+            totals['prompt_tokens'] += prompt_tokens
+            totals['output_tokens'] += output_tokens
+
+    def summary(self, pricing: Optional[dict] = None) -> Dict[str, Dict[str, Any]]:
+        """Return latency percentiles, tokens and estimated cost per agent.
+
+        Args:
+            pricing: Optional ``{model: {"input": usd, "output": usd}}`` prices
+                per million tokens (the ``model_routing.pricing`` section)
+
+        Returns:
+            A dict keyed by agent name; agents that used several models are
+            reported once per model as ``"<agent> (<model>)"``
+        """
+        pricing = pricing or {}
+        with self._lock:
+            keys = list(self._totals)
+            agents = [agent for agent, _ in keys]
+            report = {}
+            for agent, model in keys:
+                totals = self._totals[(agent, model)]
+                samples = list(self._latencies[(agent, model)])
+                price = pricing.get(model) or {}
+                cost = (totals['prompt_tokens'] * price.get('input', 0)
+                        + totals['output_tokens'] * price.get('output', 0)) / 1e6
+                name = agent if agents.count(agent) == 1 else f"{agent} ({model})"
+                report[name] = {
+                    'model': model,
+                    **totals,
+                    'latency_mean_ms': round(statistics.fmean(samples) * 1000, 2),
+                    'latency_p50_ms': round(_percentile(samples, 0.5) * 1000, 2),
+                    'latency_p95_ms': round(_percentile(samples, 0.95) * 1000, 2),
+                    'cost_usd': round(cost, 6) if price else None,
+                }
+            return report
+
+    @staticmethod
+    def _key(callback_context: CallbackContext) -> tuple:
+        return (callback_context.invocation_id, callback_context.agent_name)
+
+    def before_model_callback(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        """Note the start time and model of a model call."""
+        with self._lock:
+            self._pending[self._key(callback_context)] = (time.perf_counter(), llm_request.model)
+        return None
+
+    def after_model_callback(
+        self, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        """Record the latency and tokens of a completed model call."""
+        if llm_response.partial:
+            return None
+        with self._lock:
+            started = self._pending.pop(self._key(callback_context), None)
+        if started is None:
+            # Answered by an earlier callback (e.g. a cache hit); no model call
+            return None
+        metadata = llm_response.usage_metadata
+        self.record(
+            callback_context.agent_name,
+            started[1] or llm_response.model_version or "unknown",
+            time.perf_counter() - started[0],
+            prompt_tokens=(metadata.prompt_token_count or 0) if metadata else 0,
+            output_tokens=(metadata.candidates_token_count or 0) if metadata else 0,
+        )
+        return None
+
+    def callbacks(self) -> Dict[str, list]:
+        """Return the callbacks as Agent keyword arguments."""
+        return {
+            'before_model_callback': [self.before_model_callback],
+            'after_model_callback': [self.after_model_callback],
+        }
+
+
+# Shared recorder attached to every agent in the system
+usage_recorder = ModelUsageRecorder()
@@ -0,0 +1,199 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Note Store - Persistent, searchable storage for agent notes.
+
+This module provides the NoteStore, a SQLite database (WAL mode) holding the
+notes saved by the ``save_note`` tool. Notes are indexed by user, session and
+name, and their content is indexed for full-text search with FTS5 (falling
+back to ``LIKE`` matching where SQLite was built without it). Session state
+only keeps a small ``{name: note_id}`` reference map, so sessions stay small
+while notes persist and can be searched across sessions.
+
+``get_note_store()`` returns the shared store configured by the
+``note_store`` section of config.yaml.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from shared.config import config_service
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    UNIQUE (user_id, session_id, name)
+);
+CREATE INDEX IF NOT EXISTS notes_user_name ON notes (user_id, name, updated_at);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+    name, content, content='notes', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS notes_ai AFTER INSERT ON notes BEGIN
+    INSERT INTO notes_fts (rowid, name, content) VALUES (new.id, new.name, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS notes_ad AFTER DELETE ON notes BEGIN
+    INSERT INTO notes_fts (notes_fts, rowid, name, content) VALUES ('delete', old.id, old.name, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS notes_au AFTER UPDATE ON notes BEGIN
+    INSERT INTO notes_fts (notes_fts, rowid, name, content) VALUES ('delete', old.id, old.name, old.content);
+    INSERT INTO notes_fts (rowid, name, content) VALUES (new.id, new.name, new.content);
+END;
+"""
+
+
+class NoteStore:
+    """SQLite-backed note storage indexed by user, session and name."""
+
+    def __init__(self, path: str = ":memory:"):
+        """Open (and if needed create) the note database.
+
+        Args:
+            path: SQLite file path, or ":memory:" for a private in-memory store
+        """
+        self.path = path
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        try:
+            self._db.executescript(_FTS_SCHEMA)
+            self.full_text = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5; search falls back to LIKE
+            self.full_text = False
+        self._db.commit()
+
+    def save(self, user_id: str, session_id: str, name: str, content: str) -> int:
+        """Create or replace a note and return its id."""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO notes (user_id, session_id, name, content, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (user_id, session_id, name)"
+                " DO UPDATE SET content = excluded.content, updated_at = excluded.updated_at",
+                (user_id, session_id, name, content, now, now),
+            )
+            row = self._db.execute(
+                "SELECT id FROM notes WHERE user_id = ? AND session_id = ? AND name = ?",
+                (user_id, session_id, name),
+            ).fetchone()
+            self._db.commit()
+        return row["id"]
+
+    def get(self, user_id: str, name: str, session_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Return a note by name.
+
+        The note from ``session_id`` is preferred; otherwise the user's most
+        recently updated note with that name from any session is returned.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM notes WHERE user_id = ? AND name = ?"
+                " ORDER BY session_id = ? DESC, updated_at DESC LIMIT 1",
+                (user_id, name, session_id),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def get_by_id(self, note_id: int) -> Optional[Dict[str, Any]]:
+        """Return a note by id."""
+        with self._lock:
+            row = self._db.execute("SELECT * FROM notes WHERE id = ?", (note_id,)).fetchone()
+        return dict(row) if row else None
+
+    def search(self, user_id: str, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Search the user's notes across all sessions, best matches first."""
+        terms = [term for term in query.replace('"', " ").split() if term]
+        if not terms:
+            return []
+        with self._lock:
+            if self.full_text:
+                match = " OR ".join(f'"{term}"' for term in terms)
+                rows = self._db.execute(
+                    "SELECT n.id, n.session_id, n.name, n.updated_at,"
+                    " snippet(notes_fts, 1, '[', ']', '…', 12) AS snippet"
+                    " FROM notes_fts JOIN notes n ON n.id = notes_fts.rowid"
+                    " WHERE notes_fts MATCH ? AND n.user_id = ?"
+                    " ORDER BY bm25(notes_fts) LIMIT ?",
+                    (match, user_id, limit),
+                ).fetchall()
+            else:
+                clause = " OR ".join("content LIKE ? OR name LIKE ?" for _ in terms)
+                params = [f"%{term}%" for term in terms for _ in range(2)]
+                rows = self._db.execute(
+                    "SELECT id, session_id, name, updated_at, substr(content, 1, 120) AS snippet"
+                    f" FROM notes WHERE user_id = ? AND ({clause})"
+                    " ORDER BY updated_at DESC LIMIT ?",
+                    [user_id, *params, limit],
+                ).fetchall()
+        return [dict(row) for row in rows]
+
+    def delete(self, user_id: str, session_id: str, name: str) -> bool:
+        """Delete a note; return True if it existed."""
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM notes WHERE user_id = ? AND session_id = ? AND name = ?",
+                (user_id, session_id, name),
+            )
+            self._db.commit()
+        return cursor.rowcount > 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of notes and users and the total content size."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT COUNT(*) AS notes, COUNT(DISTINCT user_id) AS users,"
+                " COALESCE(SUM(LENGTH(content)), 0) AS content_chars FROM notes"
+            ).fetchone()
+        return {**dict(row), "full_text": self.full_text, "path": self.path}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
+
+
+_store: Optional[NoteStore] = None
+_store_lock = threading.Lock()
+
+
+def get_note_store() -> NoteStore:
+    """Return the shared NoteStore for the ``note_store.path`` in config.yaml.
+
+    Relative paths are resolved against the directory of config.yaml. The
+    store is reopened if the configured path changes.
+    """
+    global _store
+    path = config_service.get_str('note_store.path', 'data/notes.db') or ":memory:"
+    if path != ":memory:" and not os.path.isabs(path):
+        path = os.path.join(os.path.dirname(os.path.abspath(config_service.path)), path)
+    with _store_lock:
+        if _store is None or _store.path != path:
+            _store = NoteStore(path)
+        return _store
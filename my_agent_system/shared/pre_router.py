@@ -0,0 +1,340 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Pre-Router - Deterministic routing in front of the OrchestratorAgent.
+
+The OrchestratorAgent spends a model call deciding whether a request goes to
+SearchAgent, CodingAgent or ModularResearchAssistant, and for tool calls a
+second one to relay the tool's answer. The PreRouter makes obvious decisions
+locally, as a ``before_model_callback`` on the orchestrator:
+
+1. Regex rules (``DEFAULT_RULES`` after any rules from config.yaml)
+2. A tiny multinomial Naive Bayes classifier trained on labelled examples,
+   used only when its confidence reaches ``min_confidence``
+
+A confident decision is returned as a synthetic function call (an AgentTool
+call or ``transfer_to_agent``), so the ADK executes it exactly as if the
+model had chosen it; the tool's answer is then relayed without another model
+call. Uncertain requests fall through to the model. On those, the local
+prediction is compared with the model's choice to report routing accuracy,
+and the model's routing latency is measured to estimate the latency saved.
+"""
+
+import json
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+# Target that is reached by transferring rather than calling a tool
+TRANSFER_TARGETS = frozenset({"ModularResearchAssistant"})
+
+# Built-in rules, evaluated in order after any rules from config.yaml. Research
+# rules come first, since a rule match is final. The arithmetic rule only
+# matches a request that is a whole expression, and never year ranges or other
+# hyphenated numbers such as "2008-2009", "2022-23" or "555-123-4567".
+DEFAULT_RULES: List[Dict[str, str]] = [
+    {"pattern": r"(?i)^\s*(research|investigate|analy[sz]e|compare)\b",
+     "target": "ModularResearchAssistant"},
+    {"pattern": r"(?i)\b(in-depth|comprehensive|detailed)\s+(report|analysis|overview|review)\b",
+     "target": "ModularResearchAssistant"},
+    {"pattern": r"(?i)^(?!.*\b\d{4}-\d{2,4}\b)(?!.*\d-\d+-\d)\s*(?:what\s+is\s+)?[-(\s]*\d+(?:\.\d+)?"
+                r"(?:[\s)]*(?:[-+*/^%]|\*\*)[\s(]*\d+(?:\.\d+)?)+[\s)]*=?\s*\??\s*$",
+     "target": "CodingAgent"},
+    {"pattern": r"(?i)^\s*(calculate|compute|solve)\b", "target": "CodingAgent"},
+    {"pattern": r"(?i)\b(write|run|debug|fix)\b.*\b(python|code|script|function|program)\b",
+     "target": "CodingAgent"},
+]
+
+# Seed training data for the local classifier
+DEFAULT_EXAMPLES: List[Tuple[str, str]] = [
+    ("What is the capital of France?", "SearchAgent"),
+    ("Who won the world cup in 2022?", "SearchAgent"),
+    ("When was the Eiffel Tower built?", "SearchAgent"),
+    ("What is the weather in London today?", "SearchAgent"),
+    ("Latest news about electric cars", "SearchAgent"),
+    ("Who is the CEO of Google?", "SearchAgent"),
+    ("How tall is Mount Everest?", "SearchAgent"),
+    ("Where is the headquarters of the United Nations?", "SearchAgent"),
+    ("Who invented the light bulb?", "SearchAgent"),
+    ("What is the population of Canada?", "SearchAgent"),
+    ("Who wrote Pride and Prejudice?", "SearchAgent"),
+    ("What year did World War II end?", "SearchAgent"),
+    ("What is 17 times 23?", "CodingAgent"),
+    ("Calculate the square root of 2", "CodingAgent"),
+    ("Write a python function to reverse a string", "CodingAgent"),
+    ("Solve x squared minus 4 equals 0", "CodingAgent"),
+    ("Compute the factorial of 20", "CodingAgent"),
+    ("Sort this list of numbers", "CodingAgent"),
+    ("How many seconds are in a week?", "CodingAgent"),
+    ("Fix the bug in this code", "CodingAgent"),
+    ("Research the latest developments in quantum computing", "ModularResearchAssistant"),
+    ("Analyze the impact of AI on the job market", "ModularResearchAssistant"),
+    ("Compare renewable energy policies across Europe", "ModularResearchAssistant"),
+    ("Give me a detailed report on climate change adaptation", "ModularResearchAssistant"),
+    ("Investigate the causes of the 2008 financial crisis", "ModularResearchAssistant"),
+    ("Provide an in-depth overview of CRISPR applications", "ModularResearchAssistant"),
+    ("Explain the pros and cons of nuclear power with sources", "ModularResearchAssistant"),
+    ("Summarize current research on long covid", "ModularResearchAssistant"),
+]
+
+_TOKEN = re.compile(r"[a-z]+|\d+|[+\-*/^=]")
+
+
+class NaiveBayesClassifier:
+    """A tiny multinomial Naive Bayes text classifier with Laplace smoothing."""
+
+    def __init__(self, examples: Iterable[Tuple[str, str]] = ()):
+        """Initialize and train the classifier.
+
+        Args:
+            examples: ``(text, label)`` training pairs
+        """
+        self._word_counts: Dict[str, Counter] = defaultdict(Counter)
+        self._label_counts: Counter = Counter()
+        self._vocabulary = set()
+        self.train(examples)
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Split text into lowercase word, number and operator tokens."""
+        return _TOKEN.findall(text.lower())
+
+    def train(self, examples: Iterable[Tuple[str, str]]) -> None:
+        """Add ``(text, label)`` pairs to the model."""
+        for text, label in examples:
+            tokens = self.tokenize(text)
+            self._label_counts[label] += 1
+            self._word_counts[label].update(tokens)
+            self._vocabulary.update(tokens)
+
+    def predict(self, text: str) -> Tuple[Optional[str], float]:
+        """Return the most likely label and its posterior probability."""
+        if not self._label_counts:
+            return None, 0.0
+        tokens = [t for t in self.tokenize(text) if t in self._vocabulary]
+        total = sum(self._label_counts.values())
+        vocabulary = len(self._vocabulary)
+        scores = {}
+        for label, count in self._label_counts.items():
+            words = self._word_counts[label]
+            denominator = sum(words.values()) + vocabulary
+            scores[label] = math.log(count / total) + sum(
+                math.log((words[token] + 1) / denominator) for token in tokens
+            )
+        best = max(scores, key=scores.get)
+        normalizer = sum(math.exp(score - scores[best]) for score in scores.values())
+        return best, 1.0 / normalizer
+
+
+class PreRouter:
+    """Route obvious requests locally before the orchestrator's model call."""
+
+    def __init__(
+        self,
+        rules: Optional[List[Dict[str, str]]] = None,
+        examples: Optional[Iterable[Tuple[str, str]]] = None,
+        min_confidence: float = 0.9,
+        use_classifier: bool = True,
+    ):
+        """Initialize the pre-router.
+
+        Args:
+            rules: Extra ``{"pattern", "target"}`` rules tried before DEFAULT_RULES
+            examples: Extra ``(text, target)`` examples for the classifier
+            min_confidence: Minimum classifier probability to dispatch locally
+            use_classifier: Whether to consult the classifier at all
+        """
+        self.rules = [(re.compile(r["pattern"]), r["target"]) for r in list(rules or []) + DEFAULT_RULES]
+        self.classifier = NaiveBayesClassifier(DEFAULT_EXAMPLES) if use_classifier else None
+        if self.classifier is not None and examples:
+            self.classifier.train(examples)
+        self.min_confidence = min_confidence
+        self._lock = threading.Lock()
+        self._relay: Dict[str, str] = {}
+        self._pending: Dict[str, Tuple[float, Optional[str]]] = {}
+        self.reset_stats()
+
+    @classmethod
+    def from_config(cls, settings: Optional[dict]) -> "PreRouter":
+        """Create a pre-router from the ``pre_router`` section of config.yaml."""
+        settings = settings or {}
+        return cls(
+            rules=settings.get('rules') or [],
+            examples=[(e['text'], e['target']) for e in settings.get('examples') or []],
+            min_confidence=settings.get('min_confidence', 0.9),
+            use_classifier=settings.get('use_classifier', True),
+        )
+
+    def reset_stats(self) -> None:
+        """Reset all routing counters."""
+        with self._lock:
+            self._stats = Counter()
+            self._targets = Counter()
+            self._decision_s = 0.0
+            self._llm_route_s = 0.0
+
+    def route(self, text: str) -> Tuple[Optional[str], str, float]:
+        """Decide a target for ``text`` without calling a model.
+
+        Returns:
+            ``(target, source, confidence)`` where source is "rule",
+            "classifier" or "fallback". On fallback the target is the
+            classifier's best (unconfident) guess, or None.
+        """
+        for pattern, target in self.rules:
+            if pattern.search(text):
+                return target, "rule", 1.0
+        if self.classifier is None:
+            return None, "fallback", 0.0
+        target, confidence = self.classifier.predict(text)
+        source = "classifier" if confidence >= self.min_confidence else "fallback"
+        return target, source, confidence
+
+    def evaluate(self, examples: Iterable[Tuple[str, str]]) -> Dict[str, Any]:
+        """Measure routing on labelled ``(text, target)`` pairs.
+
+        Returns:
+            Coverage (share routed locally) and accuracy of the local decisions
+        """
+        routed = correct = total = 0
+        for text, expected in examples:
+            total += 1
+            target, source, _ = self.route(text)
+            if source != "fallback":
+                routed += 1
+                correct += target == expected
+        return {
+            "examples": total,
+            "coverage": round(routed / total, 3) if total else 0.0,
+            "accuracy": round(correct / routed, 3) if routed else None,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Return routing counters, accuracy and the estimated latency saved."""
+        with self._lock:
+            s = dict(self._stats)
+            requests = s.get("requests", 0)
+            fallbacks = s.get("fallback", 0)
+            llm_route_ms = self._llm_route_s * 1000 / s["llm_routes"] if s.get("llm_routes") else None
+            checks = s.get("shadow_checks", 0)
+            return {
+                "requests": requests,
+                "rule": s.get("rule", 0),
+                "classifier": s.get("classifier", 0),
+                "fallback": fallbacks,
+                "local_rate": round((requests - fallbacks) / requests, 3) if requests else 0.0,
+                "targets": dict(self._targets),
+                "decision_us_mean": round(self._decision_s * 1e6 / requests, 2) if requests else 0.0,
+                "model_calls_saved": s.get("model_calls_saved", 0),
+                "llm_route_ms_mean": round(llm_route_ms, 2) if llm_route_ms is not None else None,
+                "latency_saved_ms": (round(s.get("model_calls_saved", 0) * llm_route_ms, 1)
+                                     if llm_route_ms is not None else None),
+                "shadow_checks": checks,
+                "shadow_accuracy": round(s.get("shadow_agree", 0) / checks, 3) if checks else None,
+            }
+
+    @staticmethod
+    def _request_text(callback_context: CallbackContext) -> str:
+        content = callback_context.user_content
+        if content is None or not content.parts:
+            return ""
+        return "".join(part.text or "" for part in content.parts)
+
+    @staticmethod
+    def _call(target: str, text: str) -> types.FunctionCall:
+        if target in TRANSFER_TARGETS:
+            return types.FunctionCall(name="transfer_to_agent", args={"agent_name": target})
+        return types.FunctionCall(name=target, args={"request": text})
+
+    def _relay_response(self, invocation_id: str, last: types.Content) -> Optional[LlmResponse]:
+        """Return the routed tool's answer as the final response, if relayed."""
+        with self._lock:
+            target = self._relay.pop(invocation_id, None)
+        responses = [part.function_response for part in last.parts or [] if part.function_response]
+        if target is None or not responses or responses[0].name != target:
+            return None
+        result = responses[0].response or {}
+        text = result.get("result") if isinstance(result.get("result"), str) else json.dumps(result)
+        return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+    def before_model_callback(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        """Dispatch confident decisions as synthetic function calls."""
+        last = llm_request.contents[-1] if llm_request.contents else None
+        if last is None:
+            return None
+        if any(part.function_response for part in last.parts or []):
+            return self._relay_response(callback_context.invocation_id, last)
+
+        text = self._request_text(callback_context)
+        started = time.perf_counter()
+        target, source, _ = self.route(text)
+        if target is not None and target not in TRANSFER_TARGETS and target not in llm_request.tools_dict:
+            source = "fallback"
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats[source] += 1
+            self._decision_s += elapsed
+            if source == "fallback":
+                self._pending[callback_context.invocation_id] = (time.perf_counter(), target)
+                return None
+            self._targets[target] += 1
+            if target in TRANSFER_TARGETS:
+                self._stats["model_calls_saved"] += 1
+            else:
+                # Both the routing call and the relay of the tool's answer
+                self._stats["model_calls_saved"] += 2
+                self._relay[callback_context.invocation_id] = target
+        return LlmResponse(content=types.Content(role="model", parts=[types.Part(
+            function_call=self._call(target, text)
+        )]))
+
+    def after_model_callback(
+        self, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        """Time the model's routing decision and compare it with the local guess."""
+        if llm_response.partial:
+            return None
+        with self._lock:
+            pending = self._pending.pop(callback_context.invocation_id, None)
+            if pending is None:
+                return None
+            started, guess = pending
+            self._stats["llm_routes"] += 1
+            self._llm_route_s += time.perf_counter() - started
+            calls = [part.function_call for part in (llm_response.content.parts if llm_response.content else [])
+                     if part.function_call]
+            if guess is not None and calls:
+                chosen = calls[0].args.get("agent_name") if calls[0].name == "transfer_to_agent" else calls[0].name
+                self._stats["shadow_checks"] += 1
+                self._stats["shadow_agree"] += chosen == guess
+        return None
+
+    def callbacks(self) -> Dict[str, list]:
+        """Return the callbacks as Agent keyword arguments."""
+        return {
+            'before_model_callback': [self.before_model_callback],
+            'after_model_callback': [self.after_model_callback],
+        }
@@ -0,0 +1,212 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Profiling - cProfile hooks that can be switched on for single requests.
+
+A slow request can be profiled without editing code. A request is profiled
+when:
+
+- its caller asks for it (``RunnerService.run_turn(..., profile=True)``,
+  ``run_agent.py --profile``), or
+- its session is listed under ``profiling.sessions`` in config.yaml, or
+- it is picked by ``profiling.sample_rate`` (a fraction of all requests)
+
+The ``profiling`` settings are read on every request, so editing
+config.yaml takes effect without a restart. While a turn is profiled, a
+``profile=1`` W3C baggage entry travels with the trace context (see
+``shared/tracing.py``), so the db_server profiles the MCP tool calls of that
+turn too.
+
+Each profile is written to ``output_dir`` as ``<label>-<request id>.prof``
+(open with ``python -m pstats`` or snakeviz) plus a ``.txt`` summary of the
+top functions. Only one request is profiled at a time per process (others
+run unprofiled), and only the newest ``max_profiles`` profiles are kept.
+cProfile records the whole thread, so turns running concurrently on the
+same event loop show up in the profile as well.
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import random
+import re
+import threading
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from opentelemetry import baggage
+from opentelemetry import context as otel_context
+from opentelemetry import trace
+
+from shared.config import config_service
+
+# Baggage entry asking downstream services to profile their part of a request
+PROFILE_BAGGAGE_KEY = "profile"
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+logger = logging.getLogger(__name__)
+
+# cProfile profiles one thread at a time; at most one request is profiled
+_active = threading.Lock()
+
+
+@dataclass
+class RequestProfile:
+    """The outcome of profiling one request."""
+
+    request_id: str
+    label: str
+    # Set once the profile has been written
+    path: Optional[str] = None
+    # Why the request was not profiled, if it was not
+    skipped: Optional[str] = None
+
+
+def _settings() -> dict:
+    return config_service.get('profiling') or {}
+
+
+def should_profile(session_id: Optional[str] = None, requested: Optional[bool] = None) -> bool:
+    """Decide whether to profile a request.
+
+    Args:
+        session_id: The request's session, matched against ``profiling.sessions``
+        requested: An explicit choice by the caller; overrides the configuration
+
+    Returns:
+        True if the request should be profiled
+    """
+    if requested is not None:
+        return requested
+    settings = _settings()
+    if not settings.get('enabled', False):
+        return False
+    if session_id is not None and session_id in (settings.get('sessions') or ()):
+        return True
+    sample_rate = float(settings.get('sample_rate', 0.0))
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+def profile_requested(context: Optional[otel_context.Context] = None) -> bool:
+    """Return True if the caller's baggage asks for a profile."""
+    return baggage.get_baggage(PROFILE_BAGGAGE_KEY, context) == "1"
+
+
+def new_request_id() -> str:
+    """Return an id for the current request.
+
+    Inside a recorded span this is ``<trace id>-<span id>``, so the profile
+    can be matched with the request's trace; otherwise it is random.
+    """
+    span_context = trace.get_current_span().get_span_context()
+    if span_context.is_valid:
+        return f"{span_context.trace_id:032x}-{span_context.span_id:016x}"
+    return uuid.uuid4().hex
+
+
+def _output_dir(settings: dict) -> str:
+    path = settings.get('output_dir', 'data/profiles')
+    if not os.path.isabs(path):
+        path = os.path.join(os.path.dirname(os.path.abspath(config_service.path)), path)
+    return path
+
+
+def _prune(directory: str, keep: int) -> None:
+    """Delete all but the newest ``keep`` profiles (and their summaries)."""
+    profiles = sorted(
+        (entry for entry in os.scandir(directory) if entry.name.endswith(".prof")),
+        key=lambda entry: entry.stat().st_mtime,
+    )
+    for entry in profiles[:max(len(profiles) - keep, 0)]:
+        for path in (entry.path, entry.path[:-len(".prof")] + ".txt"):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def write_profile(profiler: cProfile.Profile, request_id: str, label: str) -> str:
+    """Write a profile and its summary to ``profiling.output_dir``.
+
+    Returns:
+        The path of the ``.prof`` file
+    """
+    settings = _settings()
+    directory = _output_dir(settings)
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, f"{_UNSAFE.sub('_', label)}-{_UNSAFE.sub('_', request_id)}")
+    profiler.dump_stats(base + ".prof")
+    summary = io.StringIO()
+    stats = pstats.Stats(profiler, stream=summary)
+    stats.sort_stats(settings.get('sort', 'cumulative')).print_stats(settings.get('top', 30))
+    with open(base + ".txt", "w", encoding="utf-8") as f:
+        f.write(f"{label} {request_id}\n{summary.getvalue()}")
+    _prune(directory, settings.get('max_profiles', 50))
+    return base + ".prof"
+
+
+@contextmanager
+def profile_request(request_id: str, label: str = "turn", enabled: bool = True) -> Iterator[RequestProfile]:
+    """Profile the enclosed code as one request.
+
+    While active, the ``profile=1`` baggage entry is set, so MCP calls made
+    by the request are profiled by the server as well.
+
+    Args:
+        request_id: Identifies the request in the profile's file name
+        label: The kind of request, e.g. ``turn`` or ``mcp``
+        enabled: If False, nothing is profiled
+
+    Yields:
+        A RequestProfile whose ``path`` is set after the block exits
+    """
+    result = RequestProfile(request_id=request_id, label=label)
+    if not enabled:
+        result.skipped = "disabled"
+        yield result
+        return
+    if not _active.acquire(blocking=False):
+        result.skipped = "another request is being profiled"
+        logger.info("Not profiling %s %s: %s", label, request_id, result.skipped)
+        yield result
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:
+        # Another profiler (e.g. a debugger) is already active
+        _active.release()
+        result.skipped = str(e)
+        yield result
+        return
+    token = otel_context.attach(baggage.set_baggage(PROFILE_BAGGAGE_KEY, "1"))
+    try:
+        yield result
+    finally:
+        # Written even if the request failed; a write error never fails it
+        profiler.disable()
+        otel_context.detach(token)
+        try:
+            result.path = write_profile(profiler, request_id, label)
+            logger.info("Profile of %s %s written to %s", label, request_id, result.path)
+        except OSError as e:
+            result.skipped = f"could not write the profile: {e}"
+            logger.warning("Profile of %s %s lost: %s", label, request_id, e)
+        finally:
+            _active.release()
@@ -0,0 +1,216 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Semantic Response Cache - Serve near-duplicate prompts from cache.
+
+This module provides a local, network-free semantic cache for complete agent
+responses. Prompts are embedded with the HashingVectorizer (signed feature
+hashing of word unigrams and bigrams into a fixed-size, L2-normalized NumPy
+vector) and stored in a per-scope matrix. A lookup is a single matrix-vector
+product; the best match is served when its cosine similarity exceeds the
+configured threshold and it has not expired.
+
+The cache attaches to an agent through ``before_agent_callback`` /
+``after_agent_callback``, so a hit skips the whole agent (e.g. the
+researcher -> analyzer -> responder chain).
+"""
+
+import logging
+import re
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Words that carry little meaning for matching research prompts
+STOPWORDS = frozenset(
+    "a an and are about as at be by can do for from how i in is it me of on or "
+    "please show tell that the this to up us what when where which who why will with you".split()
+)
+
+
+class HashingVectorizer:
+    """Embed text as an L2-normalized vector of hashed unigrams and bigrams."""
+
+    def __init__(self, dimensions: int = 1024):
+        """Initialize the vectorizer.
+
+        Args:
+            dimensions: Size of the embedding vector
+        """
+        self.dimensions = dimensions
+
+    def features(self, text: str) -> List[str]:
+        """Return the unigram and bigram features of ``text``."""
+        words = [w for w in _TOKEN.findall(text.lower()) if w not in STOPWORDS]
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def transform(self, text: str) -> np.ndarray:
+        """Embed a single text."""
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature in self.features(text):
+            digest = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if digest & 0x80000000 else -1.0
+            vector[digest % self.dimensions] += sign
+        # Sublinear term frequency so repeated words do not dominate
+        vector = np.sign(vector) * np.log1p(np.abs(vector))
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+
+class SemanticResponseCache:
+    """Similarity-threshold cache of responses, scoped per agent."""
+
+    def __init__(
+        self,
+        similarity_threshold: float = 0.9,
+        ttl_seconds: float = 3600,
+        max_entries: int = 1000,
+        dimensions: int = 1024,
+        response_key: str = "final_response",
+        validate: Optional[Callable[[str], bool]] = None,
+    ):
+        """Initialize the response cache.
+
+        Args:
+            similarity_threshold: Minimum cosine similarity for a hit
+            ttl_seconds: How long a response stays valid
+            max_entries: Maximum responses kept per scope
+            dimensions: Embedding size
+            response_key: Session state key holding the response to cache
+            validate: Optional check a response must pass before it is cached
+        """
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.response_key = response_key
+        self.validate = validate
+        self.vectorizer = HashingVectorizer(dimensions)
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._lock = threading.Lock()
+        # scope -> (matrix, responses, created_at)
+        self._scopes: Dict[str, Tuple[np.ndarray, List[str], np.ndarray]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls, settings: Optional[dict], **kwargs) -> "SemanticResponseCache":
+        """Create a cache from the ``response_cache`` section of config.yaml."""
+        settings = settings or {}
+        return cls(
+            similarity_threshold=settings.get('similarity_threshold', 0.9),
+            ttl_seconds=settings.get('ttl_seconds', 3600),
+            max_entries=settings.get('max_entries', 1000),
+            dimensions=settings.get('dimensions', 1024),
+            **kwargs,
+        )
+
+    def lookup(self, scope: str, prompt: str) -> Optional[Tuple[str, float]]:
+        """Return ``(response, similarity)`` for the closest live match, if any."""
+        query = self.vectorizer.transform(prompt)
+        with self._lock:
+            entry = self._scopes.get(scope)
+            if entry is None or not entry[1]:
+                self.misses += 1
+                return None
+            matrix, responses, created_at = entry
+            similarities = matrix @ query
+            similarities[time.time() - created_at > self.ttl_seconds] = -1.0
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.similarity_threshold:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return responses[best], float(similarities[best])
+
+    def store(self, scope: str, prompt: str, response: str) -> None:
+        """Add a response, dropping expired and then oldest entries as needed."""
+        vector = self.vectorizer.transform(prompt)[np.newaxis, :]
+        now = time.time()
+        with self._lock:
+            matrix, responses, created_at = self._scopes.get(
+                scope, (np.empty((0, self.vectorizer.dimensions), dtype=np.float32), [], np.empty(0))
+            )
+            live = np.flatnonzero(now - created_at <= self.ttl_seconds)
+            keep = live[max(0, len(live) - self.max_entries + 1):]
+            self._scopes[scope] = (
+                np.vstack([matrix[keep], vector]),
+                [responses[i] for i in keep] + [response],
+                np.append(created_at[keep], now),
+            )
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with self._lock:
+            self._scopes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and entries per scope."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": {scope: len(entry[1]) for scope, entry in self._scopes.items()},
+        }
+
+    @staticmethod
+    def _prompt(callback_context: CallbackContext) -> Optional[str]:
+        content = callback_context.user_content
+        if content is None or not content.parts:
+            return None
+        return "".join(part.text or "" for part in content.parts) or None
+
+    def before_agent_callback(self, callback_context: CallbackContext) -> Optional[types.Content]:
+        """Skip the agent and return the cached response on a hit."""
+        prompt = self._prompt(callback_context)
+        match = self.lookup(callback_context.agent_name, prompt) if prompt else None
+        if match is None:
+            return None
+        response, similarity = match
+        self.logger.info("Response cache hit (similarity %.3f) for %r", similarity, prompt)
+        return types.Content(role="model", parts=[types.Part(text=response)])
+
+    def _written_this_invocation(self, callback_context: CallbackContext) -> bool:
+        """Return True if this invocation's events set the response key."""
+        invocation_id = callback_context.invocation_id
+        return any(
+            event.invocation_id == invocation_id
+            and event.actions is not None
+            and self.response_key in (event.actions.state_delta or {})
+            for event in reversed(callback_context.session.events)
+        )
+
+    def after_agent_callback(self, callback_context: CallbackContext) -> Optional[types.Content]:
+        """Cache the agent's response from session state after it finishes.
+
+        Only a response written during this invocation is cached; a value left
+        in the session by an earlier turn never answers the current prompt.
+        """
+        prompt = self._prompt(callback_context)
+        if not prompt or not self._written_this_invocation(callback_context):
+            return None
+        response = callback_context.state.get(self.response_key)
+        if not isinstance(response, str) or not response.strip():
+            return None
+        if self.validate is not None and not self.validate(response):
+            return None
+        self.store(callback_context.agent_name, prompt, response)
+        return None
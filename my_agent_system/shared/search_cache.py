@@ -0,0 +1,192 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Search Cache - Reuse SearchAgent answers for repeated queries.
+
+This module provides the SearchCache, an LRU cache with TTL expiry keyed on
+the normalized search query. It plugs into the SearchAgent through ADK model
+callbacks: a cache hit answers the query before the model is called, so a
+repeated search costs no model call and no network. The cache can optionally
+be persisted to a SQLite file that several processes share.
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+_WHITESPACE = re.compile(r"\s+")
+_EDGE_PUNCTUATION = re.compile(r"^[\W_]+|[\W_]+$")
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so trivially different spellings share a cache key.
+
+    Examples:
+        >>> normalize_query("  What is  Quantum Computing? ")
+        'what is quantum computing'
+    """
+    collapsed = _WHITESPACE.sub(" ", query.strip().lower())
+    return _EDGE_PUNCTUATION.sub("", collapsed)
+
+
+class SearchCache:
+    """LRU + TTL cache of search answers with optional SQLite persistence."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 3600,
+        max_entries: int = 1024,
+        sqlite_path: Optional[str] = None,
+    ):
+        """Initialize the search cache.
+
+        Args:
+            ttl_seconds: How long an answer stays valid
+            max_entries: Maximum number of answers kept in memory
+            sqlite_path: Optional SQLite file shared across processes
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._db = None
+        if sqlite_path:
+            self._db = sqlite3.connect(sqlite_path, timeout=5, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS search_cache ("
+                " key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    @classmethod
+    def from_config(cls, settings: Optional[dict]) -> "SearchCache":
+        """Create a cache from the ``search_cache`` section of config.yaml."""
+        settings = settings or {}
+        return cls(
+            ttl_seconds=settings.get('ttl_seconds', 3600),
+            max_entries=settings.get('max_entries', 1024),
+            sqlite_path=settings.get('sqlite_path') or None,
+        )
+
+    def _remember(self, key: str, response: str, created_at: float) -> None:
+        self._entries[key] = (response, created_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, query: str) -> Optional[str]:
+        """Return the cached answer for ``query``, or None on a miss."""
+        key = normalize_query(query)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT response, created_at FROM search_cache WHERE key = ?", (key,)
+                ).fetchone()
+                entry = tuple(row) if row else None
+            if entry is not None and now - entry[1] <= self.ttl_seconds:
+                self._remember(key, entry[0], entry[1])
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+    def set(self, query: str, response: str) -> None:
+        """Store the answer for ``query``."""
+        key = normalize_query(query)
+        now = time.time()
+        with self._lock:
+            self._remember(key, response, now)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO search_cache (key, response, created_at) VALUES (?, ?, ?)",
+                    (key, response, now),
+                )
+                self._db.commit()
+
+    def clear(self) -> None:
+        """Remove every cached answer, including persisted ones."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM search_cache")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+        }
+
+    @staticmethod
+    def _query(callback_context: CallbackContext) -> Optional[str]:
+        """Return the search request that started this invocation."""
+        content = callback_context.user_content
+        if content is None or not content.parts:
+            return None
+        text = "".join(part.text or "" for part in content.parts)
+        return text or None
+
+    def before_model_callback(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        """Answer from the cache instead of calling the model on a hit."""
+        last = llm_request.contents[-1] if llm_request.contents else None
+        if last is not None and any(part.function_response for part in last.parts or []):
+            # Mid-turn call after a tool result; only the first call is cacheable.
+            return None
+        query = self._query(callback_context)
+        cached = self.get(query) if query else None
+        if cached is None:
+            return None
+        self.logger.info("Search cache hit for %r", query)
+        return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=cached)]))
+
+    def after_model_callback(
+        self, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        """Store final text answers (not tool calls, partials or errors)."""
+        if llm_response.partial or llm_response.error_code or llm_response.content is None:
+            return None
+        parts = llm_response.content.parts or []
+        if any(part.function_call for part in parts):
+            return None
+        text = "".join(part.text or "" for part in parts if not part.thought)
+        query = self._query(callback_context)
+        if text and query:
+            self.set(query, text)
+        return None
@@ -0,0 +1,259 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Session State - Size accounting and eviction for session state.
+
+Sequential stages leave their outputs (``research_output``, ``analysis``,
+``final_response``, ...) in session state, and every saved note adds a
+reference, so a long-running session only ever grows. The
+SessionStateManager keeps it bounded:
+
+- every state key is sized (serialized JSON bytes) and aged (time of the
+  last event that wrote it, see ``last_updated()`` and ``undated_since()``)
+- evictable keys, the intermediate outputs of a turn, are evicted once
+  they are older than ``max_age_seconds`` or larger than ``max_key_bytes``
+- while the state is larger than ``max_total_bytes``, the least recently
+  updated evictable keys are evicted
+- the ``note_refs`` map is trimmed to the ``max_note_refs`` most recently
+  saved notes (the notes themselves stay in the note store)
+
+Eviction runs as an ``after_agent_callback`` on the root agent, so it
+happens once per turn after all stages have finished. The ADK has no way to
+delete a state key through an event, so evicted keys are set to None.
+Limits come from the ``session_state`` section of config.yaml.
+"""
+
+import fnmatch
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.sessions import Session
+from google.genai import types
+
+# State key holding the {note name: note id} map written by save_note
+NOTE_REFS_KEY = "note_refs"
+
+# Intermediate outputs that are only needed during the turn that wrote them
+DEFAULT_EVICTABLE = (
+    "research_output",
+    "research_findings",
+    "analysis",
+    "final_response",
+    "budget:*",
+)
+
+
+def value_size(value: Any) -> int:
+    """Return the serialized size of a state value in bytes."""
+    return len(json.dumps(value, default=str, ensure_ascii=False).encode("utf-8"))
+
+
+def last_updated(session: Session, keys: Iterable[str]) -> Dict[str, float]:
+    """Return the timestamp of the last event that wrote each of ``keys``.
+
+    Keys that no event wrote (e.g. initial state) are missing from the result.
+    """
+    remaining = set(keys)
+    updated = {}
+    for event in reversed(session.events):
+        if not remaining:
+            break
+        delta = event.actions.state_delta if event.actions else None
+        if not delta:
+            continue
+        for key in remaining.intersection(delta):
+            updated[key] = event.timestamp
+        remaining.difference_update(delta)
+    return updated
+
+
+def undated_since(session: Session) -> float:
+    """Return the time assumed for keys that no event of ``session`` wrote.
+
+    Such keys came with the initial state or were written by events that
+    have since been archived (see ``SqliteSessionService`` ``keep_events``),
+    so they were last written no later than the oldest event the session
+    still holds. Dating them to it lets archived sessions age out, and ranks
+    them as older than every dated key for LRU eviction. A session without
+    events falls back to its ``last_update_time``.
+    """
+    if session.events:
+        return session.events[0].timestamp
+    return session.last_update_time
+
+
+class SessionStateManager:
+    """Account for session state size and evict stale or oversized entries."""
+
+    def __init__(
+        self,
+        max_total_bytes: int = 64 * 1024,
+        max_key_bytes: int = 16 * 1024,
+        max_age_seconds: float = 3600,
+        max_note_refs: int = 100,
+        evictable: Iterable[str] = DEFAULT_EVICTABLE,
+    ):
+        """Initialize the manager. A limit of 0 disables it.
+
+        Args:
+            max_total_bytes: Target upper bound for the whole session state
+            max_key_bytes: Evictable values larger than this are evicted
+            max_age_seconds: Evictable values not updated for this long are evicted
+            max_note_refs: Maximum number of entries kept in ``note_refs``
+            evictable: Key names or glob patterns that may be evicted
+        """
+        self.max_total_bytes = max_total_bytes
+        self.max_key_bytes = max_key_bytes
+        self.max_age_seconds = max_age_seconds
+        self.max_note_refs = max_note_refs
+        self.evictable = tuple(evictable)
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._lock = threading.Lock()
+        self._evictions = Counter()
+        self._evicted_bytes = 0
+
+    @classmethod
+    def from_config(cls, settings: Optional[dict]) -> "SessionStateManager":
+        """Create a manager from the ``session_state`` section of config.yaml."""
+        settings = settings or {}
+        return cls(
+            max_total_bytes=settings.get('max_total_bytes', 64 * 1024),
+            max_key_bytes=settings.get('max_key_bytes', 16 * 1024),
+            max_age_seconds=settings.get('max_age_seconds', 3600),
+            max_note_refs=settings.get('max_note_refs', 100),
+            evictable=settings.get('evictable') or DEFAULT_EVICTABLE,
+        )
+
+    def is_evictable(self, key: str) -> bool:
+        """Return True if ``key`` matches one of the evictable patterns."""
+        return any(fnmatch.fnmatchcase(key, pattern) for pattern in self.evictable)
+
+    def plan(self, state: Dict[str, Any], updated: Dict[str, float],
+             now: Optional[float] = None, undated: Optional[float] = None) -> Dict[str, Any]:
+        """Return the state changes that bring ``state`` within the limits.
+
+        Args:
+            state: The current session state
+            updated: Last update time per key (see ``last_updated()``)
+            now: The current time; defaults to ``time.time()``
+            undated: Update time of keys missing from ``updated``, for both
+                age and LRU eviction (see ``undated_since()``); defaults to
+                ``now``, so such keys are neither stale nor least recent
+
+        Returns:
+            A ``{key: new_value}`` delta; evicted keys map to None
+        """
+        now = time.time() if now is None else now
+        undated = now if undated is None else undated
+        sizes = {key: value_size(value) for key, value in state.items() if value is not None}
+        delta: Dict[str, Any] = {}
+        reasons: Dict[str, str] = {}
+
+        refs = state.get(NOTE_REFS_KEY)
+        if self.max_note_refs and isinstance(refs, dict) and len(refs) > self.max_note_refs:
+            # save_note keeps the most recently saved note last
+            kept = dict(list(refs.items())[-self.max_note_refs:])
+            delta[NOTE_REFS_KEY] = kept
+            reasons[NOTE_REFS_KEY] = 'note_refs'
+            sizes[NOTE_REFS_KEY] = value_size(kept)
+
+        candidates = [key for key in sizes if self.is_evictable(key)]
+        for key in candidates:
+            if self.max_key_bytes and sizes[key] > self.max_key_bytes:
+                reasons[key] = 'size'
+            elif self.max_age_seconds and now - updated.get(key, undated) >= self.max_age_seconds:
+                reasons[key] = 'age'
+
+        total = sum(size for key, size in sizes.items() if reasons.get(key) in (None, 'note_refs'))
+        if self.max_total_bytes and total > self.max_total_bytes:
+            # Least recently updated first
+            remaining = sorted(
+                (key for key in candidates if key not in reasons),
+                key=lambda key: updated.get(key, undated),
+            )
+            for key in remaining:
+                if total <= self.max_total_bytes:
+                    break
+                reasons[key] = 'lru'
+                total -= sizes[key]
+            if total > self.max_total_bytes:
+                self.logger.warning(
+                    "Session state is %d bytes after eviction (limit %d); "
+                    "the remaining keys are not evictable", total, self.max_total_bytes,
+                )
+
+        for key, reason in reasons.items():
+            if reason != 'note_refs':
+                delta[key] = None
+        with self._lock:
+            self._evictions.update(reasons.values())
+            self._evicted_bytes += sum(
+                sizes[key] for key, reason in reasons.items() if reason != 'note_refs'
+            )
+        return delta
+
+    def enforce(self, session: Session, state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Return the eviction delta for ``session`` (see ``plan()``).
+
+        Args:
+            session: The session whose events date each key
+            state: The state to check; defaults to ``session.state``
+        """
+        state = session.state if state is None else state
+        return self.plan(state, last_updated(session, state.keys()),
+                         undated=undated_since(session))
+
+    def after_agent_callback(self, callback_context: CallbackContext) -> Optional[types.Content]:
+        """Evict entries at the end of the root agent's turn."""
+        session = callback_context._invocation_context.session
+        state = callback_context.state.to_dict()
+        for key, value in self.enforce(session, state).items():
+            callback_context.state[key] = value
+        return None
+
+    def report(self, session: Session) -> Dict[str, Any]:
+        """Return a memory report for one session.
+
+        The report lists the size, age and evictability of every state key,
+        largest first, along with the size of the session's event history.
+        """
+        now = time.time()
+        state = {key: value for key, value in session.state.items() if value is not None}
+        updated = last_updated(session, state.keys())
+        keys = {
+            key: {
+                'bytes': value_size(value),
+                'age_s': round(now - updated[key], 1) if key in updated else None,
+                'evictable': self.is_evictable(key),
+            }
+            for key, value in state.items()
+        }
+        return {
+            'session_id': session.id,
+            'state_bytes': sum(entry['bytes'] for entry in keys.values()),
+            'max_total_bytes': self.max_total_bytes,
+            'events': len(session.events),
+            'event_bytes': sum(len(event.model_dump_json()) for event in session.events),
+            'keys': dict(sorted(keys.items(), key=lambda item: -item[1]['bytes'])),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Return eviction counts by reason across all sessions."""
+        with self._lock:
+            return {'evictions': dict(self._evictions), 'evicted_bytes': self._evicted_bytes}
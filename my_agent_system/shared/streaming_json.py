@@ -0,0 +1,234 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Streaming JSON - Parse a JSON object while it is still being generated.
+
+ResponderAgent answers with a ``FinalResponse`` JSON object. When the model's
+output is streamed, the ``summary`` text is readable long before the object
+is complete, but ``json.loads`` cannot parse anything until the final brace.
+The IncrementalJsonParser consumes the text chunk by chunk and reports:
+
+- the decoded characters of selected top-level string fields (e.g.
+  ``summary``) as soon as they arrive
+- every other top-level field once its value is complete
+
+Text before the opening brace, such as a Markdown code fence, is ignored.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+@dataclass
+class FieldEvent:
+    """A piece of a top-level field.
+
+    Streamed string fields produce events with ``delta`` text and a final
+    event with ``complete=True``; other fields produce a single complete
+    event. Complete events carry the decoded ``value``.
+    """
+    key: str
+    delta: str = ""
+    value: Any = None
+    complete: bool = False
+
+
+class IncrementalJsonParser:
+    """Incrementally parse the top-level fields of one JSON object."""
+
+    def __init__(self, stream_keys: Iterable[str] = ("summary",)):
+        """Initialize the parser.
+
+        Args:
+            stream_keys: Top-level string fields whose text is streamed
+        """
+        self.stream_keys = frozenset(stream_keys)
+        self.values: Dict[str, Any] = {}
+        self.done = False
+        self._buffer = ""
+        self._pos = 0
+        # expect_object -> expect_key -> expect_colon -> value -> expect_comma
+        self._state = "expect_object"
+        self._key: Optional[str] = None
+        self._chars: List[str] = []
+
+    def feed(self, chunk: str) -> List[FieldEvent]:
+        """Consume the next chunk of text and return the resulting events."""
+        self._buffer += chunk
+        events: List[FieldEvent] = []
+        while not self.done and self._step(events):
+            pass
+        # Drop consumed text so the buffer only holds the unparsed tail
+        self._buffer = self._buffer[self._pos:]
+        self._pos = 0
+        return events
+
+    def close(self) -> Dict[str, Any]:
+        """Return all completed fields, raising if the object never completed."""
+        if not self.done:
+            raise ValueError("Incomplete JSON object")
+        return dict(self.values)
+
+    def _skip_whitespace(self) -> None:
+        while self._pos < len(self._buffer) and self._buffer[self._pos].isspace():
+            self._pos += 1
+
+    def _step(self, events: List[FieldEvent]) -> bool:
+        """Advance the state machine; return False when more text is needed."""
+        if self._state == "expect_object":
+            start = self._buffer.find("{", self._pos)
+            if start < 0:
+                self._pos = len(self._buffer)
+                return False
+            self._pos = start + 1
+            self._state = "expect_key"
+            return True
+
+        if not (self._state == "value" and self._chars):
+            # Whitespace is only insignificant outside a string in progress
+            self._skip_whitespace()
+        if self._pos >= len(self._buffer):
+            return False
+        char = self._buffer[self._pos]
+
+        if self._state == "expect_key":
+            if char == "}":
+                self._pos += 1
+                self.done = True
+                return False
+            end = self._scan_string(self._pos)
+            if end is None:
+                return False
+            self._key = json.loads(self._buffer[self._pos:end])
+            self._pos = end
+            self._state = "expect_colon"
+            return True
+
+        if self._state == "expect_colon":
+            self._pos += 1
+            self._state = "value"
+            self._chars = []
+            return True
+
+        if self._state == "expect_comma":
+            self._pos += 1
+            if char == "}":
+                self.done = True
+                return False
+            self._state = "expect_key"
+            return True
+
+        # self._state == "value"
+        if self._key in self.stream_keys and (char == '"' or self._chars):
+            return self._stream_string(events)
+        end = self._scan_value(self._pos)
+        if end is None:
+            return False
+        value = json.loads(self._buffer[self._pos:end])
+        self._pos = end
+        self._finish(events, value)
+        return True
+
+    def _finish(self, events: List[FieldEvent], value: Any) -> None:
+        self.values[self._key] = value
+        events.append(FieldEvent(key=self._key, value=value, complete=True))
+        self._state = "expect_comma"
+
+    def _stream_string(self, events: List[FieldEvent]) -> bool:
+        """Decode as much of a streamed string value as is available."""
+        buffer, pos = self._buffer, self._pos
+        if not self._chars:
+            # Opening quote; a sentinel marks the string as started
+            self._chars.append("")
+            pos += 1
+        decoded = []
+        while pos < len(buffer):
+            char = buffer[pos]
+            if char == '"':
+                self._pos = pos + 1
+                self._emit_delta(events, decoded)
+                self._finish(events, "".join(self._chars))
+                return True
+            if char == "\\":
+                if pos + 1 >= len(buffer):
+                    break
+                escape = buffer[pos + 1]
+                if escape == "u":
+                    # Surrogate pairs are decoded together as one character
+                    width = 12 if buffer[pos + 2:pos + 3].lower() == "d" and \
+                        buffer[pos + 3:pos + 4].lower() in "89ab" else 6
+                    if pos + width > len(buffer):
+                        break
+                    decoded.append(json.loads(f'"{buffer[pos:pos + width]}"'))
+                    pos += width
+                    continue
+                decoded.append(_ESCAPES.get(escape, escape))
+                pos += 2
+                continue
+            decoded.append(char)
+            pos += 1
+        self._pos = pos
+        self._emit_delta(events, decoded)
+        return False
+
+    def _emit_delta(self, events: List[FieldEvent], decoded: List[str]) -> None:
+        if decoded:
+            text = "".join(decoded)
+            self._chars.append(text)
+            events.append(FieldEvent(key=self._key, delta=text))
+
+    def _scan_string(self, start: int) -> Optional[int]:
+        """Return the index after the string starting at ``start``, if complete."""
+        pos = start + 1
+        while pos < len(self._buffer):
+            char = self._buffer[pos]
+            if char == "\\":
+                pos += 2
+                continue
+            if char == '"':
+                return pos + 1
+            pos += 1
+        return None
+
+    def _scan_value(self, start: int) -> Optional[int]:
+        """Return the index after the value starting at ``start``, if complete."""
+        char = self._buffer[start]
+        if char == '"':
+            return self._scan_string(start)
+        if char in "[{":
+            depth, pos = 0, start
+            while pos < len(self._buffer):
+                char = self._buffer[pos]
+                if char == '"':
+                    end = self._scan_string(pos)
+                    if end is None:
+                        return None
+                    pos = end
+                    continue
+                if char in "[{":
+                    depth += 1
+                elif char in "]}":
+                    depth -= 1
+                    if depth == 0:
+                        return pos + 1
+                pos += 1
+            return None
+        # Number, true, false or null: complete once a delimiter follows
+        pos = start
+        while pos < len(self._buffer) and self._buffer[pos] not in ",}] \t\r\n":
+            pos += 1
+        return pos if pos < len(self._buffer) else None
@@ -0,0 +1,265 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tool Cache - Memoize tool call results across model turns.
+
+Tools such as ``data_formatter`` and ``sentiment_analyzer`` are pure for
+given arguments, yet the model calls them again whenever it needs the
+result again. This module provides:
+
+- ToolResultCache, an LRU cache with a per-tool TTL keyed on the tool name
+  and its canonicalized arguments (key order and formatting do not matter)
+- MemoizedFunctionTool, a FunctionTool that answers from the cache and only
+  runs the function on a miss
+- ``memoize_tools()``, which wraps every cacheable FunctionTool in a list
+
+Tools with side effects or results that depend on more than their arguments
+(``save_note``, ``get_note``, file writes, database writes) are excluded by
+name (``DEFAULT_EXCLUDE`` plus any names listed in ``tool_cache.exclude``),
+and error results are never cached. Settings come from the
+``tool_cache`` section of config.yaml; ``get_tool_cache()`` returns the
+shared cache, or None when caching is disabled.
+"""
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+from google.adk.tools import FunctionTool
+from google.adk.tools.tool_context import ToolContext
+
+from shared.config import config_service
+
+# Tools that change state or read data that may change between calls
+DEFAULT_EXCLUDE = (
+    "save_note",
+    "get_note",
+    "search_notes",
+    "convert_data_file",
+    "insert_data",
+    "delete_data",
+)
+
+
+def canonical_key(tool_name: str, args: Dict[str, Any]) -> str:
+    """Return a cache key for a tool call that ignores argument order.
+
+    Examples:
+        >>> canonical_key("f", {"b": 1, "a": [1, 2]}) == canonical_key("f", {"a": [1, 2], "b": 1})
+        True
+    """
+    payload = json.dumps(args, sort_keys=True, separators=(",", ":"), default=str, ensure_ascii=False)
+    return f"{tool_name}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+def is_cacheable_result(result: Any) -> bool:
+    """Return False for results that report an error."""
+    if isinstance(result, dict):
+        return not result.get("error") and result.get("success", True) is not False
+    return result is not None
+
+
+class ToolResultCache:
+    """LRU + per-tool TTL cache of tool call results."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 300,
+        tool_ttl_seconds: Optional[Dict[str, float]] = None,
+        exclude: Iterable[str] = DEFAULT_EXCLUDE,
+    ):
+        """Initialize the tool cache.
+
+        Args:
+            max_entries: Maximum number of results kept; the least recently
+                used result is evicted first
+            ttl_seconds: How long a result stays valid, unless overridden
+            tool_ttl_seconds: Per-tool TTLs by tool name
+            exclude: Names of tools whose results are never cached
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.tool_ttl_seconds = dict(tool_ttl_seconds or {})
+        self.exclude = frozenset(exclude)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = Counter()
+        self._misses = Counter()
+        self._expirations = Counter()
+        self.evictions = 0
+
+    @classmethod
+    def from_config(cls, settings: Optional[dict]) -> "ToolResultCache":
+        """Create a cache from the ``tool_cache`` section of config.yaml."""
+        settings = settings or {}
+        return cls(
+            max_entries=settings.get('max_entries', 1024),
+            ttl_seconds=settings.get('ttl_seconds', 300),
+            tool_ttl_seconds=settings.get('tool_ttl_seconds'),
+            # Configured names add to the built-in exclusions, never replace them
+            exclude=set(DEFAULT_EXCLUDE) | set(settings.get('exclude') or ()),
+        )
+
+    def is_cacheable(self, tool_name: str) -> bool:
+        """Return True if results of ``tool_name`` may be cached."""
+        return tool_name not in self.exclude and self.ttl_for(tool_name) > 0
+
+    def ttl_for(self, tool_name: str) -> float:
+        """Return the TTL in seconds for results of ``tool_name``."""
+        return self.tool_ttl_seconds.get(tool_name, self.ttl_seconds)
+
+    def get(self, tool_name: str, args: Dict[str, Any]) -> tuple:
+        """Look up a result.
+
+        Returns:
+            ``(True, result)`` on a hit, ``(False, None)`` on a miss. The
+            result is a copy, so callers may modify it.
+        """
+        key = canonical_key(tool_name, args)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= now:
+                del self._entries[key]
+                self._expirations[tool_name] += 1
+                entry = None
+            if entry is None:
+                self._misses[tool_name] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._hits[tool_name] += 1
+            return True, copy.deepcopy(entry[0])
+
+    def set(self, tool_name: str, args: Dict[str, Any], result: Any) -> None:
+        """Store a result, evicting the least recently used ones if full."""
+        key = canonical_key(tool_name, args)
+        expires_at = time.monotonic() + self.ttl_for(tool_name)
+        with self._lock:
+            self._entries[key] = (copy.deepcopy(result), expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, tool_names: Optional[Iterable[str]] = None) -> int:
+        """Drop the cached results of ``tool_names`` (all tools if None).
+
+        Returns:
+            The number of results dropped
+        """
+        with self._lock:
+            if tool_names is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                return dropped
+            prefixes = tuple(f"{name}:" for name in tool_names)
+            keys = [key for key in self._entries if key.startswith(prefixes)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters overall and per tool."""
+        with self._lock:
+            tools = sorted(set(self._hits) | set(self._misses))
+            hits, misses = sum(self._hits.values()), sum(self._misses.values())
+            return {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+                "evictions": self.evictions,
+                "expirations": sum(self._expirations.values()),
+                "entries": len(self._entries),
+                "tools": {
+                    name: {"hits": self._hits[name], "misses": self._misses[name]} for name in tools
+                },
+            }
+
+
+class MemoizedFunctionTool(FunctionTool):
+    """A FunctionTool whose results are memoized in a ToolResultCache."""
+
+    def __init__(self, tool: FunctionTool, cache: Optional[ToolResultCache] = None):
+        """Wrap an existing FunctionTool.
+
+        Args:
+            tool: The tool to wrap; its name, description and declaration are kept
+            cache: The cache to use; defaults to ``get_tool_cache()`` at call time
+        """
+        super().__init__(func=tool.func)
+        self.name = tool.name
+        self.description = tool.description
+        self.tool = tool
+        self.cache = cache
+
+    def _get_declaration(self):
+        return self.tool._get_declaration()
+
+    async def run_async(self, *, args: Dict[str, Any], tool_context: ToolContext) -> Any:
+        """Return the cached result for ``args``, running the tool on a miss."""
+        cache = self.cache or get_tool_cache()
+        if cache is None or not cache.is_cacheable(self.name):
+            return await self.tool.run_async(args=args, tool_context=tool_context)
+        hit, result = cache.get(self.name, args)
+        if hit:
+            return result
+        result = await self.tool.run_async(args=args, tool_context=tool_context)
+        if is_cacheable_result(result):
+            cache.set(self.name, args, result)
+        return result
+
+
+def memoize_tools(tools: List[Any], cache: Optional[ToolResultCache] = None) -> List[Any]:
+    """Wrap the cacheable FunctionTools in ``tools``; other tools are returned as-is.
+
+    Args:
+        tools: An agent's tools
+        cache: The cache to use; by default each call uses the shared
+            cache, so disabling ``tool_cache`` takes effect immediately
+    """
+    active = cache or get_tool_cache()
+    if active is None:
+        return list(tools)
+    return [
+        MemoizedFunctionTool(tool, cache)
+        if type(tool) is FunctionTool and active.is_cacheable(tool.name)
+        else tool
+        for tool in tools
+    ]
+
+
+_cache: Optional[ToolResultCache] = None
+_cache_settings: Any = None
+_cache_lock = threading.Lock()
+
+
+def get_tool_cache() -> Optional[ToolResultCache]:
+    """Return the shared cache, or None when ``tool_cache.enabled`` is false.
+
+    The cache is rebuilt (and emptied) only when the settings change.
+    """
+    global _cache, _cache_settings
+    settings = config_service.get('tool_cache') or {}
+    if not settings.get('enabled', False):
+        return None
+    with _cache_lock:
+        if _cache is None or settings != _cache_settings:
+            _cache = ToolResultCache.from_config(settings)
+            _cache_settings = settings
+        return _cache
@@ -0,0 +1,379 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tracing - Per-request latency breakdowns with OpenTelemetry spans.
+
+ADK already opens OpenTelemetry spans for every invocation, agent run
+(``invoke_agent``), model call (``call_llm``, ``generate_content``) and tool
+call (``execute_tool``), but they are dropped until a tracer provider is
+installed. ``configure_tracing()`` installs one from the ``tracing`` section
+of config.yaml, and this module adds:
+
+- a ``run_turn`` root span per user turn, opened by the RunnerService
+- W3C trace context propagation into the db_server MCP subprocess: ADK's
+  McpTool sends the context in each request's ``_meta`` field, and the
+  server's ``mcp.call_tool`` spans join the trace of the turn that called them
+- exporters writing finished spans to the console or to a JSON Lines file,
+  and a SpanCollector keeping the spans of recent traces in memory
+- ``format_trace_tree()`` and ``folded_stacks()``, which turn the spans of a
+  trace into an indented latency tree or flame graph input
+
+A trace file can be summarized with
+``python my_agent_system/shared/tracing.py FILE [--folded]``.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from opentelemetry import context as otel_context
+from opentelemetry import trace
+from opentelemetry.baggage.propagation import W3CBaggagePropagator
+from opentelemetry.propagators.composite import CompositePropagator
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SimpleSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
+
+TRACER_NAME = "my_agent_system"
+
+# Longer attribute values (e.g. whole LLM requests) are cut to this length
+DEFAULT_MAX_ATTRIBUTE_LENGTH = 256
+
+# Trace context plus baggage (e.g. the profiling flag, see shared/profiling.py)
+_propagator = CompositePropagator([TraceContextTextMapPropagator(), W3CBaggagePropagator()])
+
+Span = Dict[str, Any]
+
+
+def span_record(span: ReadableSpan, max_attribute_length: int = DEFAULT_MAX_ATTRIBUTE_LENGTH) -> Span:
+    """Convert a finished span into a JSON-serializable dict."""
+    attributes = {}
+    for key, value in (span.attributes or {}).items():
+        if isinstance(value, str) and len(value) > max_attribute_length:
+            value = value[:max_attribute_length] + "..."
+        elif isinstance(value, (tuple, list)):
+            value = list(value)
+        attributes[key] = value
+    return {
+        "trace_id": format(span.context.trace_id, "032x"),
+        "span_id": format(span.context.span_id, "016x"),
+        "parent_id": format(span.parent.span_id, "016x") if span.parent is not None else None,
+        "name": span.name,
+        "service": span.resource.attributes.get("service.name"),
+        "start_ns": span.start_time,
+        "end_ns": span.end_time,
+        "status": span.status.status_code.name,
+        "attributes": attributes,
+    }
+
+
+class SpanCollector(SpanExporter):
+    """Keep the spans of the most recent traces in memory."""
+
+    def __init__(self, max_traces: int = 100, max_attribute_length: int = DEFAULT_MAX_ATTRIBUTE_LENGTH):
+        """Initialize the collector.
+
+        Args:
+            max_traces: Traces kept; the oldest trace is dropped first
+            max_attribute_length: Longer string attributes are truncated
+        """
+        self.max_traces = max_traces
+        self.max_attribute_length = max_attribute_length
+        self._traces: "OrderedDict[str, List[Span]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        with self._lock:
+            for span in spans:
+                record = span_record(span, self.max_attribute_length)
+                self._traces.setdefault(record["trace_id"], []).append(record)
+                self._traces.move_to_end(record["trace_id"])
+            while len(self._traces) > self.max_traces:
+                self._traces.popitem(last=False)
+        return SpanExportResult.SUCCESS
+
+    def trace(self, trace_id: str) -> List[Span]:
+        """Return the finished spans of a trace (empty if unknown)."""
+        with self._lock:
+            return list(self._traces.get(trace_id, ()))
+
+    def clear(self) -> None:
+        """Forget all collected spans."""
+        with self._lock:
+            self._traces.clear()
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Append finished spans to a file, one JSON object per line.
+
+    Several processes (the agents and the db_server) may append to the same
+    file; ``load_spans()`` reads it back.
+    """
+
+    def __init__(self, path: str, max_attribute_length: int = DEFAULT_MAX_ATTRIBUTE_LENGTH):
+        self.path = path
+        self.max_attribute_length = max_attribute_length
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(
+            json.dumps(span_record(span, self.max_attribute_length), default=str) + "\n" for span in spans
+        )
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError:
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+
+def load_spans(path: str) -> List[Span]:
+    """Read the spans written by a JsonLinesSpanExporter."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# =============================================================================
+# SETUP AND PROPAGATION
+# =============================================================================
+
+_collector: Optional[SpanCollector] = None
+_configure_lock = threading.Lock()
+
+
+def _resolve_path(path: str) -> str:
+    """Resolve a path relative to config.yaml."""
+    if os.path.isabs(path):
+        return path
+    # Imported here so that the command line needs no package setup
+    from shared.config import config_service
+    return os.path.join(os.path.dirname(os.path.abspath(config_service.path)), path)
+
+
+def configure_tracing(settings: Optional[dict] = None, service_name: str = TRACER_NAME) -> Optional[SpanCollector]:
+    """Install a tracer provider from the ``tracing`` section of config.yaml.
+
+    Spans always go to a SpanCollector, plus the configured exporters:
+    ``console`` (to stderr) and ``file`` (JSON Lines at ``file_path``,
+    relative to config.yaml). Only the first call in a process has an effect; if another
+    SDK tracer provider is already installed (e.g. by ``adk web``), the
+    exporters are added to it instead.
+
+    Args:
+        settings: The ``tracing`` settings; read from config.yaml if None
+        service_name: Recorded as ``service.name`` on every span
+
+    Returns:
+        The collector, or None when ``tracing.enabled`` is false
+    """
+    global _collector
+    if settings is None:
+        from shared.config import config_service
+        settings = config_service.get('tracing') or {}
+    if not settings.get('enabled', False):
+        return None
+    with _configure_lock:
+        if _collector is not None:
+            return _collector
+        max_length = settings.get('max_attribute_length', DEFAULT_MAX_ATTRIBUTE_LENGTH)
+        provider = trace.get_tracer_provider()
+        if not isinstance(provider, TracerProvider):
+            provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+            trace.set_tracer_provider(provider)
+        collector = SpanCollector(settings.get('max_traces', 100), max_length)
+        provider.add_span_processor(SimpleSpanProcessor(collector))
+        for name in settings.get('exporters') or ():
+            if name == "console":
+                # stderr: the db_server's stdout carries the MCP protocol
+                exporter = ConsoleSpanExporter(service_name=service_name, out=sys.stderr)
+            elif name == "file":
+                exporter = JsonLinesSpanExporter(
+                    _resolve_path(settings.get('file_path', 'data/traces.jsonl')), max_length
+                )
+            else:
+                raise ValueError(f"Unknown trace exporter '{name}'; expected 'console' or 'file'")
+            # Exported off the request path, in a background thread
+            provider.add_span_processor(BatchSpanProcessor(exporter))
+        _collector = collector
+        return collector
+
+
+def get_collector() -> Optional[SpanCollector]:
+    """Return the collector installed by ``configure_tracing()``, if any."""
+    return _collector
+
+
+def flush_tracing(timeout_millis: int = 5000) -> None:
+    """Export spans still queued in the background exporters."""
+    provider = trace.get_tracer_provider()
+    if isinstance(provider, TracerProvider):
+        provider.force_flush(timeout_millis)
+
+
+def get_tracer() -> trace.Tracer:
+    """Return the tracer for spans opened by this system."""
+    return trace.get_tracer(TRACER_NAME)
+
+
+def current_trace_id() -> Optional[str]:
+    """Return the id of the active trace, or None outside a recorded span."""
+    span_context = trace.get_current_span().get_span_context()
+    return format(span_context.trace_id, "032x") if span_context.is_valid else None
+
+
+def inject_context() -> Dict[str, str]:
+    """Return the active trace context as W3C ``traceparent`` and ``baggage`` headers.
+
+    The result is empty when no span is being recorded and no baggage is set.
+    """
+    carrier: Dict[str, str] = {}
+    _propagator.inject(carrier)
+    return carrier
+
+
+def extract_context(carrier: Optional[Dict[str, str]]) -> otel_context.Context:
+    """Return a context whose spans continue the trace in ``carrier``."""
+    return _propagator.extract(carrier or {})
+
+
+# =============================================================================
+# LATENCY BREAKDOWNS
+# =============================================================================
+
+def _children(spans: Iterable[Span]) -> tuple:
+    """Return the root spans and the children of each span, by start time."""
+    spans = sorted(spans, key=lambda span: span["start_ns"])
+    ids = {span["span_id"] for span in spans}
+    children = defaultdict(list)
+    roots = []
+    for span in spans:
+        if span["parent_id"] in ids:
+            children[span["parent_id"]].append(span)
+        else:
+            roots.append(span)
+    return roots, children
+
+
+def _duration_ns(span: Span) -> int:
+    return span["end_ns"] - span["start_ns"]
+
+
+def _self_ns(span: Span, children: List[Span]) -> int:
+    """Return the time a span spent outside its children.
+
+    Children running in parallel may add up to more than their parent, so
+    the covered time is the union of their intervals.
+    """
+    covered, reach = 0, span["start_ns"]
+    for child in children:
+        start, end = max(child["start_ns"], reach), min(child["end_ns"], span["end_ns"])
+        if end > start:
+            covered += end - start
+            reach = end
+    return max(_duration_ns(span) - covered, 0)
+
+
+def format_trace_tree(spans: Iterable[Span]) -> str:
+    """Render spans as an indented tree with total and self time.
+
+    Examples:
+        >>> print(format_trace_tree([
+        ...     {"span_id": "a", "parent_id": None, "name": "run_turn", "start_ns": 0, "end_ns": 5_000_000},
+        ...     {"span_id": "b", "parent_id": "a", "name": "call_llm", "start_ns": 1_000_000, "end_ns": 4_000_000},
+        ... ]))
+        run_turn  5.0 ms (self 2.0 ms)
+          call_llm  3.0 ms (self 3.0 ms)
+    """
+    roots, children = _children(spans)
+    lines = []
+
+    def _render(span: Span, depth: int, parent_service: Optional[str]) -> None:
+        service = span.get("service")
+        label = span["name"] if service == parent_service or depth == 0 else f"{span['name']} [{service}]"
+        lines.append(
+            f"{'  ' * depth}{label}  {_duration_ns(span) / 1e6:.1f} ms "
+            f"(self {_self_ns(span, children[span['span_id']]) / 1e6:.1f} ms)"
+        )
+        for child in children[span["span_id"]]:
+            _render(child, depth + 1, service)
+
+    for root in roots:
+        _render(root, 0, root.get("service"))
+    return "\n".join(lines)
+
+
+def folded_stacks(spans: Iterable[Span]) -> List[str]:
+    """Return flame graph input: one ``root;child;leaf self_microseconds`` line per stack.
+
+    The output can be fed to ``flamegraph.pl`` or speedscope; identical
+    stacks are merged.
+
+    Examples:
+        >>> folded_stacks([
+        ...     {"span_id": "a", "parent_id": None, "name": "run_turn", "start_ns": 0, "end_ns": 5_000_000},
+        ...     {"span_id": "b", "parent_id": "a", "name": "call_llm", "start_ns": 1_000_000, "end_ns": 4_000_000},
+        ... ])
+        ['run_turn 2000', 'run_turn;call_llm 3000']
+    """
+    roots, children = _children(spans)
+    totals: Counter = Counter()
+
+    def _walk(span: Span, stack: str) -> None:
+        name = span["name"].replace(";", ":")
+        stack = f"{stack};{name}" if stack else name
+        totals[stack] += _self_ns(span, children[span["span_id"]]) // 1000
+        for child in children[span["span_id"]]:
+            _walk(child, stack)
+
+    for root in roots:
+        _walk(root, "")
+    return [f"{stack} {micros}" for stack, micros in totals.items()]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Print the latency tree (or folded stacks) of the traces in a JSONL file."""
+    parser = argparse.ArgumentParser(description="Summarize traces written by the file exporter.")
+    parser.add_argument("path", help="JSON Lines trace file")
+    parser.add_argument("--trace", help="Only show this trace id")
+    parser.add_argument("--folded", action="store_true", help="Print flame graph input instead of trees")
+    args = parser.parse_args(argv)
+    traces = defaultdict(list)
+    for span in load_spans(args.path):
+        traces[span["trace_id"]].append(span)
+    for trace_id, spans in traces.items():
+        if args.trace and trace_id != args.trace:
+            continue
+        if args.folded:
+            print("\n".join(folded_stacks(spans)))
+        else:
+            print(f"Trace {trace_id}")
+            print(format_trace_tree(spans))
+            print()
+
+
+if __name__ == "__main__":
+    main()
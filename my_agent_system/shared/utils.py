@@ -17,48 +17,268 @@
 This module provides utility functions that can be used by various components
 of the agentic system. These utilities help with common tasks like response
 formatting and information extraction.
+
+Key points are extracted locally, without a model: text is split into
+sentences by a precompiled regex segmenter that does not break on
+abbreviations ("e.g.", "Dr.") or decimals, and the sentences are ranked by
+how central they are to the text, using TF-IDF vectors and TextRank over
+their cosine similarity matrix.
 """
 
+import re
+from itertools import zip_longest
+from typing import Iterable, Iterator, List, Sequence, Union
+
+import numpy as np
+
+# Sentences ranked together at most; longer texts are ranked window by window
+DEFAULT_WINDOW = 500
+
+RANKING_METHODS = ("textrank", "tfidf", "lead")
+
+# A sentence ends at terminal punctuation (plus closing quotes or brackets)
+# followed by whitespace and a capitalized word, or at a blank line
+_BOUNDARY = re.compile(
+    r"[.!?…]+[\"'”’)\]]*\s+(?=[\"'“‘(\[]?[A-Z0-9])"
+    r"|\n[ \t]*\n\s*"
+)
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Words ending in "." that do not end a sentence (compared lowercased, without dots)
+_ABBREVIATIONS = frozenset({
+    "eg", "ie", "vs", "etc", "cf", "al", "approx", "mr", "mrs", "ms", "dr", "prof",
+    "sr", "jr", "st", "mt", "gen", "col", "lt", "sgt", "inc", "ltd", "co", "corp",
+    "dept", "univ", "us", "uk", "phd",
+})
+# Abbreviations that only continue a sentence before a number ("Fig. 3", "Jan. 5")
+_NUMBERED_ABBREVIATIONS = frozenset({
+    "no", "nos", "vol", "fig", "figs", "p", "pp", "jan", "feb", "mar", "apr", "jun",
+    "jul", "aug", "sep", "sept", "oct", "nov", "dec",
+})
+
+STOPWORDS = frozenset("""
+a an and are as at be been but by can could did do does for from had has have he her
+his how i if in into is it its may more most no not of on or our she so such than that
+the their them then there these they this those to was we were what when where which
+while who will with would you your also about after all any because before between both
+each other over only some very
+""".split())
+
+Source = Union[str, Iterable[str]]
+
+
 def format_response(title: str, content: str) -> str:
     """Format a response with a title and content using Markdown headers.
-    
+
     This utility function creates a properly formatted response section
     with a title and content, using Markdown heading syntax.
-    
+
     Args:
         title: The title for the response section
         content: The content to format
-        
+
     Returns:
         A formatted string with the title (as H2 header) and content
-        
+
     Examples:
         >>> format_response("Summary", "This is the summary content.")
-        '## Summary\n\nThis is the summary content.\n'
+        '## Summary\\n\\nThis is the summary content.\\n'
     """
     return f"## {title}\n\n{content}\n"
 
-def extract_key_points(text: str, max_points: int = 5) -> list:
-    """Extract key points from a text by splitting on sentence boundaries.
-    
-    This utility function extracts key points from input text by splitting
-    on periods and returning the first few sentences as key points.
-    
-    Note: This is a simple implementation. In a production system, you might
-    use an LLM to intelligently extract key points based on content.
-    
+
+def _is_sentence_end(text: str, boundary: re.Match) -> bool:
+    """Return False for boundaries that follow an abbreviation or an initial."""
+    if boundary.group().startswith("\n"):
+        return True
+    words = text[max(0, boundary.start() - 32):boundary.start() + 1].split()
+    if not words or not words[-1].endswith("."):
+        return True
+    token = words[-1].rstrip(".").lstrip("(\"'").lower()
+    if token in _NUMBERED_ABBREVIATIONS:
+        return not text[boundary.end():boundary.end() + 1].isdigit()
+    if len(token) == 1 and token.isalpha():
+        # An initial, as in "J. Smith"
+        return False
+    return token.replace(".", "") not in _ABBREVIATIONS
+
+
+def iter_sentences(source: Source) -> Iterator[str]:
+    """Yield the sentences of a text as soon as each one is complete.
+
+    Args:
+        source: The text, or an iterable of text chunks (e.g. lines of a file)
+
+    Examples:
+        >>> list(iter_sentences(["Prices rose 2.5% in Jan. and Feb. Demand, e.g. ", "for chips, grew. Dr. Lee agreed."]))
+        ['Prices rose 2.5% in Jan. and Feb.', 'Demand, e.g. for chips, grew.', 'Dr. Lee agreed.']
+    """
+    chunks = [source] if isinstance(source, str) else source
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        start = 0
+        for boundary in _BOUNDARY.finditer(buffer):
+            if not _is_sentence_end(buffer, boundary):
+                continue
+            sentence = buffer[start:boundary.end()].strip()
+            if sentence:
+                yield sentence
+            start = boundary.end()
+        # The rest may be completed by the next chunk
+        buffer = buffer[start:]
+    if buffer.strip():
+        yield buffer.strip()
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split a text into sentences (see ``iter_sentences()``)."""
+    return list(iter_sentences(text))
+
+
+def _tfidf(sentences: Sequence[str]) -> np.ndarray:
+    """Return the L2-normalized TF-IDF matrix (one row per sentence)."""
+    vocabulary = {}
+    rows, columns = [], []
+    for row, sentence in enumerate(sentences):
+        for word in _WORD.findall(sentence.lower()):
+            if word not in STOPWORDS:
+                rows.append(row)
+                columns.append(vocabulary.setdefault(word, len(vocabulary)))
+    counts = np.zeros((len(sentences), len(vocabulary)))
+    np.add.at(counts, (rows, columns), 1.0)
+    document_frequency = np.count_nonzero(counts, axis=0)
+    matrix = counts * (np.log((1 + len(sentences)) / (1 + document_frequency)) + 1.0)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def rank_sentences(
+    sentences: Sequence[str],
+    method: str = "textrank",
+    damping: float = 0.85,
+    tolerance: float = 1e-6,
+    max_iterations: int = 100,
+) -> np.ndarray:
+    """Score how central each sentence is to the whole set.
+
+    Args:
+        sentences: The sentences to score
+        method: ``textrank`` (PageRank over the TF-IDF cosine similarity
+            graph), ``tfidf`` (cosine similarity to the TF-IDF centroid) or
+            ``lead`` (earlier sentences score higher)
+        damping: TextRank damping factor
+        tolerance: TextRank stops once scores change by less than this
+        max_iterations: Maximum TextRank iterations
+
+    Returns:
+        One score per sentence; higher is more central
+    """
+    count = len(sentences)
+    if method not in RANKING_METHODS:
+        raise ValueError(f"Unknown ranking method '{method}'; expected one of {', '.join(RANKING_METHODS)}")
+    if method == "lead" or count < 3:
+        return np.linspace(1.0, 0.0, count) if count > 1 else np.ones(count)
+
+    vectors = _tfidf(sentences)
+    if method == "tfidf":
+        centroid = vectors.sum(axis=0)
+        norm = np.linalg.norm(centroid)
+        return vectors @ (centroid / norm) if norm else np.zeros(count)
+
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0.0)
+    weights = similarity.sum(axis=1, keepdims=True)
+    # Sentences sharing no words with the others spread their score evenly
+    transition = np.where(weights > 0, similarity / np.where(weights > 0, weights, 1.0), 1.0 / count)
+    scores = np.full(count, 1.0 / count)
+    for _ in range(max_iterations):
+        updated = (1.0 - damping) / count + damping * (transition.T @ scores)
+        converged = np.abs(updated - scores).sum() < tolerance
+        scores = updated
+        if converged:
+            break
+    return scores
+
+
+def rank_order(sentences: Sequence[str], method: str = "textrank", window: int = DEFAULT_WINDOW) -> List[int]:
+    """Return sentence indices, most central first.
+
+    Ties go to the earlier sentence. Beyond ``window`` sentences, each
+    window is ranked on its own and the windows take turns: every window's
+    best sentence comes before any window's second best.
+    """
+    ranked = []
+    for start in range(0, len(sentences), window):
+        # Round away float noise so that ties stay ties
+        scores = np.round(rank_sentences(sentences[start:start + window], method), 12)
+        ranked.append((start + np.argsort(-scores, kind="stable")).tolist())
+    return [index for group in zip_longest(*ranked) for index in group if index is not None]
+
+
+def _top(sentences: Sequence[str], max_points: int, method: str) -> List[int]:
+    """Return the indices of the ``max_points`` best sentences, in text order."""
+    if len(sentences) <= max_points:
+        return list(range(len(sentences)))
+    return sorted(rank_order(sentences, method, len(sentences))[:max_points])
+
+
+def iter_key_points(
+    source: Source, max_points: int = 5, window: int = DEFAULT_WINDOW, method: str = "textrank"
+) -> Iterator[str]:
+    """Stream key points from a large text, ``window`` sentences at a time.
+
+    Each window of sentences is ranked on its own, and its ``max_points``
+    most central sentences are yielded in text order, so memory use is
+    bounded by the window rather than the text.
+
+    Args:
+        source: The text, or an iterable of text chunks
+        max_points: Key points per window
+        window: Number of sentences ranked together
+        method: Ranking method (see ``rank_sentences()``)
+    """
+    return _windowed(iter_sentences(source), max_points, window, method)
+
+
+def _windowed(sentences: Iterable[str], max_points: int, window: int, method: str) -> Iterator[str]:
+    batch: List[str] = []
+    for sentence in sentences:
+        batch.append(sentence)
+        if len(batch) == window:
+            yield from (batch[i] for i in _top(batch, max_points, method))
+            batch = []
+    if batch:
+        yield from (batch[i] for i in _top(batch, max_points, method))
+
+
+def extract_key_points(
+    text: str, max_points: int = 5, method: str = "textrank", window: int = DEFAULT_WINDOW
+) -> list:
+    """Extract the most central sentences of a text as key points.
+
+    The text is split into sentences, which are ranked by centrality (see
+    ``rank_sentences()``); the ``max_points`` best are returned in their
+    original order. Texts longer than ``window`` sentences are first reduced
+    window by window, so the similarity matrix stays small.
+
     Args:
         text: The text to extract key points from
         max_points: Maximum number of key points to extract (default: 5)
-        
+        method: Ranking method: ``textrank``, ``tfidf`` or ``lead``
+        window: Maximum number of sentences ranked together
+
     Returns:
         A list of key points (sentences) extracted from the text
-        
+
     Examples:
         >>> extract_key_points("First point. Second point. Third point.", 2)
         ['First point.', 'Second point.']
+        >>> extract_key_points("Use e.g. 2.5 GHz clocks. Qubits are fragile. Qubits need cooling.", 1)
+        ['Qubits are fragile.']
     """
-    # This is a placeholder implementation
-    # In a real implementation, you might use an LLM to extract key points
-    sentences = text.split('.')
-    return [sentence.strip() + '.' for sentence in sentences if sentence.strip()][:max_points]
\ No newline at end of file
+    sentences = split_sentences(text)
+    window = max(window, 2 * max_points)
+    while len(sentences) > window:
+        sentences = list(_windowed(sentences, max_points, window, method))
+    return [sentences[i] for i in _top(sentences, max_points, method)]
@@ -15,8 +15,10 @@
 """Tools module - Contains custom tool implementations.
 
 This module contains custom tool implementations that can be used by agents:
-- data_formatter: Formats data in various formats (JSON, XML, CSV)
+- data_formatter: Formats data in various formats (JSON, JSON Lines, XML, CSV)
+- convert_data_file: Streams large data files between those formats
 - sentiment_analyzer: Analyzes text sentiment
+- batch_sentiment_analyzer: Analyzes the sentiment of many texts in one call
 """
 
 # This file makes the tools directory a Python package
\ No newline at end of file
@@ -19,8 +19,16 @@ These tools demonstrate how to create and integrate custom functionality with th
 """
 
 from google.adk.tools import ToolContext
-from typing import Dict, Any
+from typing import Dict, Any, List
+from xml.sax.saxutils import escape
+import xml.etree.ElementTree as ET
+import csv
 import json
+import os
+
+from shared.config import config_service
+from tools import data_conversion
+from tools.sentiment import get_sentiment_analyzer
 
 
 async def data_formatter(
@@ -31,11 +39,13 @@ async def data_formatter(
     """Format data in a specified format.
     
     This tool takes input data and formats it according to the specified format type.
-    It supports JSON, XML, and CSV formatting.
+    It supports JSON, JSON Lines, XML, and CSV formatting. Structured input (a JSON
+    array or object, JSON Lines, or XML) is converted record by record; other text is
+    wrapped as a single value.
     
     Args:
         data: The data to format (string)
-        format_type: The format type (json, xml, csv) - defaults to "json"
+        format_type: The format type (json, jsonl, xml, csv) - defaults to "json"
         tool_context: The tool context (provided by ADK framework)
         
     Returns:
@@ -45,27 +55,82 @@ async def data_formatter(
         >>> await data_formatter("name: John, age: 30", "json")
         '{"data": "name: John, age: 30"}'
         
-        >>> await data_formatter("product: Laptop, price: 999", "xml")
-        '<data>product: Laptop, price: 999</data>'
+        >>> await data_formatter("product: Laptop & Mouse, price: 999", "xml")
+        '<data>product: Laptop &amp; Mouse, price: 999</data>'
+        
+        >>> await data_formatter('[{"name": "John", "age": 30}]', "csv")
+        'name,age\\r\\nJohn,30\\r\\n'
     """
-    try:
-        if format_type.lower() == "json":
-            # If data is already JSON, return as is
-            json.loads(data)  # Validate it's valid JSON
-            return data
-        elif format_type.lower() == "xml":
-            # Simple XML wrapping
-            return f"<data>{data}</data>"
-        elif format_type.lower() == "csv":
-            # Simple CSV formatting (assuming comma-separated)
-            return data.replace(",", ", ")
-        else:
-            return f"Unsupported format type: {format_type}. Returning original data:\n{data}"
-    except json.JSONDecodeError:
-        # If data is not valid JSON, wrap it
-        if format_type.lower() == "json":
-            return json.dumps({"data": data})
+    target = format_type.lower()
+    if target not in data_conversion.FORMATS:
+        return f"Unsupported format type: {format_type}. Returning original data:\n{data}"
+    source = data_conversion.detect_format(data)
+    if source == target:
         return data
+    if source is not None:
+        try:
+            return "".join(data_conversion.convert(data, source, target))
+        except (ValueError, ET.ParseError):
+            pass
+    # Unstructured text is wrapped as a single value
+    if target == "json":
+        return json.dumps({"data": data})
+    if target == "jsonl":
+        return json.dumps({"data": data}) + "\n"
+    if target == "xml":
+        return f"<data>{escape(data)}</data>"
+    # Simple CSV formatting (assuming comma-separated)
+    return data.replace(",", ", ")
+
+
+async def convert_data_file(
+    input_path: str,
+    output_path: str,
+    input_format: str = "",
+    output_format: str = "",
+    tool_context: ToolContext = None
+) -> Dict[str, Any]:
+    """Convert a data file between JSON, JSON Lines, CSV and XML.
+    
+    Use this for datasets too large to pass as text: the file is converted in a
+    stream without being loaded into memory or into the conversation. Paths are
+    relative to the data directory configured in data_conversion.base_dir.
+    
+    Args:
+        input_path: The file to read, e.g. "reviews.csv"
+        output_path: The file to write, e.g. "reviews.jsonl"
+        input_format: json, jsonl, csv or xml; inferred from the extension if empty
+        output_format: json, jsonl, csv or xml; inferred from the extension if empty
+        tool_context: The tool context (provided by ADK framework)
+        
+    Returns:
+        A dictionary with the number of records converted and the input and output
+        sizes in bytes, or an error message
+    """
+    base_dir = config_service.get_str('data_conversion.base_dir', 'data') or "."
+    if not os.path.isabs(base_dir):
+        base_dir = os.path.join(os.path.dirname(os.path.abspath(config_service.path)), base_dir)
+    base_dir = os.path.realpath(base_dir)
+    paths = []
+    for path in (input_path, output_path):
+        resolved = os.path.realpath(os.path.join(base_dir, path))
+        if os.path.commonpath([base_dir, resolved]) != base_dir:
+            return {"error": f"'{path}' is outside the data directory."}
+        paths.append(resolved)
+    if paths[0] == paths[1]:
+        return {"error": "The input and output files must be different."}
+    if not os.path.isfile(paths[0]):
+        return {"error": f"Input file '{input_path}' does not exist."}
+    try:
+        result = data_conversion.convert_file(
+            paths[0], paths[1],
+            source_format=input_format or None,
+            target_format=output_format or None,
+            chunk_size=config_service.get_int('data_conversion.chunk_size', data_conversion.DEFAULT_CHUNK_SIZE),
+        )
+    except (ValueError, ET.ParseError, csv.Error, UnicodeDecodeError) as e:
+        return {"error": f"Conversion failed: {e}"}
+    return {"output_path": output_path, **result}
 
 
 async def sentiment_analyzer(
@@ -74,9 +139,10 @@ async def sentiment_analyzer(
 ) -> Dict[str, Any]:
     """Analyze the sentiment of a text.
     
-    This tool performs a simple sentiment analysis on input text by counting
-    positive and negative keywords. It returns the sentiment classification
-    (positive, negative, or neutral) along with a confidence score.
+    This tool performs a simple sentiment analysis on input text by matching
+    its words against a weighted lexicon of positive and negative words. It
+    returns the sentiment classification (positive, negative, or neutral)
+    along with a confidence score.
     
     Args:
         text: The text to analyze for sentiment
@@ -90,32 +156,36 @@ async def sentiment_analyzer(
         
     Examples:
         >>> await sentiment_analyzer("I love this product!")
-        {'sentiment': 'positive', 'score': 1.0, 'explanation': 'Identified 1 positive and 0 negative sentiment words.'}
+        {'sentiment': 'positive', 'score': 0.67, 'explanation': 'Identified 1 positive and 0 negative sentiment words.'}
         
         >>> await sentiment_analyzer("This is terrible.")
-        {'sentiment': 'negative', 'score': -1.0, 'explanation': 'Identified 0 positive and 1 negative sentiment words.'}
+        {'sentiment': 'negative', 'score': -0.67, 'explanation': 'Identified 0 positive and 1 negative sentiment words.'}
     """
     # This is a simplified sentiment analyzer
     # In a real implementation, you would use a proper sentiment analysis model
-    positive_words = ["good", "great", "excellent", "amazing", "wonderful", "fantastic", "love", "like", "happy", "pleased"]
-    negative_words = ["bad", "terrible", "awful", "horrible", "disappointing", "poor", "hate", "dislike", "sad", "angry"]
-    
-    text_lower = text.lower()
-    positive_count = sum(1 for word in positive_words if word in text_lower)
-    negative_count = sum(1 for word in negative_words if word in text_lower)
+    return get_sentiment_analyzer().analyze(text)
+
+
+async def batch_sentiment_analyzer(
+    texts: List[str],
+    tool_context: ToolContext = None
+) -> Dict[str, Any]:
+    """Analyze the sentiment of many texts in one call.
     
-    if positive_count > negative_count:
-        sentiment = "positive"
-        score = positive_count / (positive_count + negative_count + 1)  # Add 1 to avoid division by zero
-    elif negative_count > positive_count:
-        sentiment = "negative"
-        score = -negative_count / (positive_count + negative_count + 1)
-    else:
-        sentiment = "neutral"
-        score = 0
+    Use this instead of calling sentiment_analyzer repeatedly when several
+    texts (e.g. a list of reviews) need to be classified.
     
-    return {
-        "sentiment": sentiment,
-        "score": round(score, 2),
-        "explanation": f"Identified {positive_count} positive and {negative_count} negative sentiment words."
-    }
\ No newline at end of file
+    Args:
+        texts: The texts to analyze for sentiment
+        tool_context: The tool context (provided by ADK framework)
+        
+    Returns:
+        A dictionary containing:
+        - results: One sentiment_analyzer result per text, in order
+        - summary: The number of positive, negative and neutral texts
+    """
+    results = get_sentiment_analyzer().analyze_batch(texts)
+    summary = {"positive": 0, "negative": 0, "neutral": 0}
+    for result in results:
+        summary[result["sentiment"]] += 1
+    return {"results": results, "summary": summary}
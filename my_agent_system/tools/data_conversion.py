@@ -0,0 +1,384 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Data Conversion - Streaming conversion between JSON, JSONL, CSV and XML.
+
+This module is the engine behind the ``data_formatter`` and
+``convert_data_file`` tools. Data is treated as a stream of records (flat or
+nested dicts):
+
+- readers turn chunks of text into records as soon as each one is complete
+  (``read_json`` decodes the elements of a top-level array one at a time,
+  ``read_xml`` uses a pull parser and discards finished elements)
+- writers turn records back into chunks of text (``write_csv`` uses the
+  csv module, ``write_xml`` escapes text and attribute values)
+
+Only the record being converted and one input chunk are held in memory, so
+multi-megabyte files can be converted without loading them whole.
+
+Example:
+    >>> "".join(convert('[{"name": "Ada", "age": 36}]', "json", "csv"))
+    'name,age\\r\\nAda,36\\r\\n'
+"""
+
+import csv
+import io
+import json
+import os
+import re
+import tempfile
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
+from xml.sax.saxutils import escape, quoteattr
+
+# Characters read from a file per chunk
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+FORMATS = ("json", "jsonl", "csv", "xml")
+
+# Root and per-record element names used when writing XML
+XML_ROOT = "records"
+XML_RECORD = "record"
+
+_XML_NAME = re.compile(r"^[A-Za-z_][\w.-]*$")
+
+Record = Dict[str, Any]
+Source = Union[str, Iterable[str]]
+
+
+def format_from_path(path: str) -> str:
+    """Return the format implied by a file extension (e.g. ``data.jsonl``)."""
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension == "ndjson":
+        return "jsonl"
+    if extension not in FORMATS:
+        raise ValueError(f"Cannot infer the data format of '{path}'; expected one of {', '.join(FORMATS)}")
+    return extension
+
+
+def read_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Yield the text of a UTF-8 file in chunks of ``chunk_size`` characters."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _chunks(source: Source) -> Iterator[str]:
+    if isinstance(source, str):
+        yield source
+    else:
+        yield from source
+
+
+def _lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Re-split chunks into lines that keep their line endings."""
+    pending = ""
+    for chunk in chunks:
+        pending += chunk
+        lines = pending.splitlines(keepends=True)
+        # The last line may continue in the next chunk
+        pending = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        yield from lines
+    if pending:
+        yield pending
+
+
+# =============================================================================
+# READERS
+# =============================================================================
+
+def read_jsonl(source: Source) -> Iterator[Record]:
+    """Yield one record per non-blank line of JSON Lines input."""
+    for number, line in enumerate(_lines(_chunks(source)), start=1):
+        if line.strip():
+            try:
+                yield _as_record(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {number}: {e.msg}") from None
+
+
+def read_json(source: Source) -> Iterator[Record]:
+    """Yield the elements of a top-level JSON array (or one top-level object).
+
+    Each element is decoded once it is complete, so the input is never held
+    in memory as a whole.
+    """
+    decoder = json.JSONDecoder()
+    chunks = _chunks(source)
+    buffer, pos, exhausted = "", 0, False
+
+    def _more() -> bool:
+        nonlocal buffer, pos, exhausted
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def _skip(separators: str = "") -> Optional[str]:
+        """Skip whitespace (and separators); return the next character."""
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] in separators):
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not _more():
+                return None
+
+    first = _skip()
+    if first is None:
+        return
+    if first != "[":
+        # A single document: decode it whole
+        while _more():
+            pass
+        yield _as_record(json.loads(buffer[pos:]))
+        return
+    pos += 1
+    while True:
+        char = _skip(",")
+        if char is None:
+            raise ValueError("Unterminated JSON array")
+        if char == "]":
+            return
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                # Incomplete element: read on, unless the input has ended
+                if exhausted or not _more():
+                    raise ValueError(f"Invalid JSON: {e.msg}") from None
+                continue
+            if end == len(buffer) and not exhausted and buffer[pos] not in "{[\"":
+                # A number may continue in the next chunk
+                if _more():
+                    continue
+            pos = end
+            break
+        yield _as_record(value)
+
+
+def read_csv(source: Source) -> Iterator[Record]:
+    """Yield one record per CSV row, keyed by the header row."""
+    yield from csv.DictReader(_lines(_chunks(source)))
+
+
+def read_xml(source: Source) -> Iterator[Record]:
+    """Yield one record per child element of the XML root.
+
+    Child elements become fields (repeated names become lists, nested
+    elements become dicts) and attributes become ``@name`` fields.
+    Finished elements are discarded as parsing proceeds.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    depth = 0
+    root = None
+    for chunk in _chunks(source):
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            if event == "start":
+                depth += 1
+                if depth == 1:
+                    root = element
+                continue
+            depth -= 1
+            if depth == 1:
+                yield _element_record(element)
+                root.remove(element)
+    parser.close()
+
+
+def _element_record(element: ET.Element) -> Record:
+    record: Record = {f"@{name}": value for name, value in element.attrib.items()}
+    for child in element:
+        if child.tag == "field" and "name" in child.attrib:
+            # Written by write_xml for names that are not valid tags
+            name = child.attrib["name"]
+            value = _element_record(child) if len(child) else (child.text or "")
+            if isinstance(value, dict):
+                value.pop("@name", None)
+        else:
+            name = child.tag
+            value = _element_record(child) if len(child) or child.attrib else (child.text or "")
+        if name in record:
+            existing = record[name]
+            record[name] = existing + [value] if isinstance(existing, list) else [existing, value]
+        else:
+            record[name] = value
+    if not len(element) and element.text and element.text.strip():
+        record["value"] = element.text
+    return record
+
+
+def _as_record(value: Any) -> Record:
+    return value if isinstance(value, dict) else {"value": value}
+
+
+READERS = {"json": read_json, "jsonl": read_jsonl, "csv": read_csv, "xml": read_xml}
+
+
+# =============================================================================
+# WRITERS
+# =============================================================================
+
+def write_jsonl(records: Iterable[Record]) -> Iterator[str]:
+    """Yield one JSON line per record."""
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def write_json(records: Iterable[Record]) -> Iterator[str]:
+    """Yield a JSON array of the records, one element at a time."""
+    separator = "[\n  "
+    for record in records:
+        yield separator + json.dumps(record, ensure_ascii=False)
+        separator = ",\n  "
+    yield "[]\n" if separator.startswith("[") else "\n]\n"
+
+
+def write_csv(records: Iterable[Record]) -> Iterator[str]:
+    """Yield CSV text with a header row.
+
+    Columns are taken from the first record; fields that only appear in
+    later records are dropped. Nested values are written as JSON.
+    """
+    buffer = io.StringIO()
+    writer = None
+    for record in records:
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=list(record), extrasaction="ignore")
+            writer.writeheader()
+        writer.writerow({
+            key: json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else value
+            for key, value in record.items()
+        })
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def write_xml(records: Iterable[Record]) -> Iterator[str]:
+    """Yield an XML document with one ``<record>`` element per record."""
+    yield f'<?xml version="1.0" encoding="UTF-8"?>\n<{XML_ROOT}>\n'
+    for record in records:
+        yield f"  <{XML_RECORD}>{_xml_fields(record)}</{XML_RECORD}>\n"
+    yield f"</{XML_ROOT}>\n"
+
+
+def _xml_fields(record: Record) -> str:
+    parts = []
+    for name, value in record.items():
+        values = value if isinstance(value, list) else [value]
+        for item in values:
+            content = _xml_fields(item) if isinstance(item, dict) else escape("" if item is None else str(item))
+            if _XML_NAME.match(name) and not name.lower().startswith("xml"):
+                parts.append(f"<{name}>{content}</{name}>")
+            else:
+                parts.append(f"<field name={quoteattr(name)}>{content}</field>")
+    return "".join(parts)
+
+
+WRITERS = {"json": write_json, "jsonl": write_jsonl, "csv": write_csv, "xml": write_xml}
+
+
+# =============================================================================
+# CONVERSION
+# =============================================================================
+
+def convert(source: Source, source_format: str, target_format: str) -> Iterator[str]:
+    """Convert text (a string or an iterable of chunks) between formats.
+
+    Returns:
+        An iterator over chunks of the converted text
+    """
+    source_format, target_format = source_format.lower(), target_format.lower()
+    for name in (source_format, target_format):
+        if name not in FORMATS:
+            raise ValueError(f"Unsupported format '{name}'; expected one of {', '.join(FORMATS)}")
+    return WRITERS[target_format](READERS[source_format](source))
+
+
+def convert_file(
+    input_path: str,
+    output_path: str,
+    source_format: Optional[str] = None,
+    target_format: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """Convert one file into another, streaming both.
+
+    Formats default to those implied by the file extensions. The output is
+    written to a temporary file that replaces ``output_path`` once complete,
+    so a failed conversion leaves no partial output, and converting a file
+    onto itself does not truncate it before it has been read.
+
+    Returns:
+        The number of records converted and the bytes read and written
+    """
+    source_format = source_format or format_from_path(input_path)
+    target_format = target_format or format_from_path(output_path)
+    records = 0
+
+    def _counted(stream: Iterator[Record]) -> Iterator[Record]:
+        nonlocal records
+        for record in stream:
+            records += 1
+            yield record
+
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    reader = READERS[source_format.lower()](read_chunks(input_path, chunk_size))
+    input_bytes = os.path.getsize(input_path)
+    fd, temp_path = tempfile.mkstemp(dir=output_dir or ".", suffix=".tmp")
+    try:
+        with open(fd, "w", encoding="utf-8", newline="") as out:
+            for chunk in WRITERS[target_format.lower()](_counted(reader)):
+                out.write(chunk)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return {
+        "records": records,
+        "input_bytes": input_bytes,
+        "output_bytes": os.path.getsize(output_path),
+        "source_format": source_format,
+        "target_format": target_format,
+    }
+
+
+def detect_format(text: str) -> Optional[str]:
+    """Guess the record format of a string, or None if it holds no records."""
+    stripped = text.lstrip()
+    if stripped.startswith("<"):
+        return "xml"
+    if stripped.startswith(("[", "{")):
+        try:
+            json.loads(text)
+            return "json"
+        except json.JSONDecodeError:
+            lines = [line for line in text.splitlines() if line.strip()]
+            try:
+                if all(isinstance(json.loads(line), dict) for line in lines):
+                    return "jsonl"
+            except json.JSONDecodeError:
+                return None
+    return None
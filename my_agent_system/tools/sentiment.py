@@ -0,0 +1,246 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Sentiment - Batch lexicon-based sentiment scoring.
+
+This module provides the SentimentAnalyzer behind the ``sentiment_analyzer``
+and ``batch_sentiment_analyzer`` tools. Texts are split into words, so
+lexicon words only match whole words ("like" no longer matches inside
+"unlikely"), and each word costs one hash lookup in a weighted lexicon
+however large the lexicon is.
+
+A batch is scored without a Python loop per text: the texts are joined
+around a separator token, lowercased, stripped of punctuation with one
+``str.translate`` table and split once; the word weights are looked up in
+one pass and summed per text with NumPy. The fixed cost of the NumPy calls
+only pays off from about ``VECTORIZE_MIN_BATCH`` texts, so smaller batches
+are scored one text at a time.
+
+The lexicon maps single words (letters and digits) to weights: positive
+weights for positive words, negative for negative ones. ``DEFAULT_LEXICON``
+can be extended or overridden through the ``sentiment`` section of
+config.yaml, either inline or from a YAML/JSON file.
+``get_sentiment_analyzer()`` returns the shared analyzer built from that
+configuration.
+"""
+
+import os
+import string
+import threading
+from itertools import repeat
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import yaml
+
+from shared.config import config_service
+
+# Punctuation (ASCII and common Unicode) becomes whitespace before splitting
+_PUNCTUATION = string.punctuation + "\u2018\u2019\u201c\u201d\u2013\u2014\u2026\u00ab\u00bb\u00a1\u00bf"
+_SEPARATOR = "\x00"
+_WORD_TABLE = str.maketrans({char: " " for char in _PUNCTUATION + string.whitespace})
+
+# Smallest batch scored with NumPy; measured with benchmarks/run_benchmarks.py
+VECTORIZE_MIN_BATCH = 16
+
+DEFAULT_LEXICON: Dict[str, float] = {
+    # Positive
+    "good": 1.0, "great": 1.5, "excellent": 2.0, "amazing": 2.0, "wonderful": 2.0,
+    "fantastic": 2.0, "love": 2.0, "like": 1.0, "happy": 1.5, "pleased": 1.5,
+    # Negative
+    "bad": -1.0, "terrible": -2.0, "awful": -2.0, "horrible": -2.0, "disappointing": -1.5,
+    "poor": -1.0, "hate": -2.0, "dislike": -1.0, "sad": -1.5, "angry": -1.5,
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase words, dropping punctuation.
+
+    Examples:
+        >>> tokenize("Unlikely -- I'd say it's GREAT!")
+        ['unlikely', 'i', 'd', 'say', 'it', 's', 'great']
+    """
+    return text.lower().translate(_WORD_TABLE).split()
+
+
+def _result(score: float, positive: int, negative: int) -> Dict[str, Any]:
+    return {
+        "sentiment": "positive" if score > 0 else "negative" if score < 0 else "neutral",
+        "score": round(score, 2),
+        "explanation": f"Identified {positive} positive and {negative} negative sentiment words.",
+    }
+
+
+def _score(positive: np.ndarray, negative: np.ndarray) -> np.ndarray:
+    """Combine weighted totals into scores from -1 to 1.
+
+    The stronger side sets the sign; the +1 damps texts with few matches.
+    """
+    denominator = positive + negative + 1.0
+    return np.where(positive > negative, positive / denominator,
+                    np.where(negative > positive, -negative / denominator, 0.0))
+
+
+def _score_one(positive: float, negative: float) -> float:
+    """``_score`` for a single text, without the cost of NumPy scalars."""
+    if positive > negative:
+        return positive / (positive + negative + 1.0)
+    if negative > positive:
+        return -negative / (positive + negative + 1.0)
+    return 0.0
+
+
+class SentimentAnalyzer:
+    """Score the sentiment of many texts at once against a weighted lexicon."""
+
+    def __init__(self, lexicon: Optional[Dict[str, float]] = None, min_batch: int = VECTORIZE_MIN_BATCH):
+        """Initialize the analyzer.
+
+        Args:
+            lexicon: Word weights; defaults to ``DEFAULT_LEXICON``
+            min_batch: Smallest batch scored with NumPy; smaller batches are
+                scored one text at a time
+        """
+        self.min_batch = min_batch
+        self.lexicon: Dict[str, float] = {}
+        self.extend(DEFAULT_LEXICON if lexicon is None else lexicon)
+
+    def extend(self, entries: Dict[str, float]) -> None:
+        """Add or re-weight lexicon words; a weight of 0 removes a word."""
+        for word, weight in entries.items():
+            word = str(word).lower()
+            if float(weight):
+                self.lexicon[word] = float(weight)
+            else:
+                self.lexicon.pop(word, None)
+        # The separator marks text boundaries in a joined batch
+        self._weights = dict(self.lexicon)
+        self._weights[_SEPARATOR] = np.nan
+
+    def _totals(self, text: str) -> Tuple[float, float, int, int]:
+        """Return the weighted totals and match counts of one text."""
+        positive = negative = 0.0
+        positive_count = negative_count = 0
+        lookup = self.lexicon.get
+        for weight in map(lookup, tokenize(text)):
+            if weight is None:
+                continue
+            if weight > 0:
+                positive += weight
+                positive_count += 1
+            else:
+                negative -= weight
+                negative_count += 1
+        return positive, negative, positive_count, negative_count
+
+    def analyze(self, text: str) -> Dict[str, Any]:
+        """Return the ``sentiment_analyzer`` result for one text.
+
+        Equivalent to ``analyze_batch([text])[0]`` without the NumPy overhead
+        that only pays off for larger batches.
+        """
+        positive, negative, positive_count, negative_count = self._totals(text)
+        return _result(_score_one(positive, negative), positive_count, negative_count)
+
+    def score_batch(self, texts: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Return per-text sentiment arrays for a batch of texts.
+
+        Returns:
+            A dict of arrays, one entry per text: ``positive`` and
+            ``negative`` (weighted totals), ``positive_count`` and
+            ``negative_count`` (matched words) and ``score`` (-1 to 1)
+        """
+        size = len(texts)
+        if size < self.min_batch:
+            totals = [self._totals(text) for text in texts]
+            positive, negative = (np.array([t[i] for t in totals], dtype=np.float64) for i in (0, 1))
+            positive_count, negative_count = (np.array([t[i] for t in totals], dtype=np.int64) for i in (2, 3))
+            return {
+                "positive": positive,
+                "negative": negative,
+                "positive_count": positive_count,
+                "negative_count": negative_count,
+                "score": _score(positive, negative),
+            }
+        joined = f" {_SEPARATOR} ".join(texts)
+        words = joined.lower().translate(_WORD_TABLE).split()
+        weights = np.fromiter(map(self._weights.get, words, repeat(0.0)), dtype=np.float64, count=len(words))
+        # Only lexicon hits and the NaN text boundaries are non-zero
+        hits = weights[np.flatnonzero(weights)]
+        boundaries = np.isnan(hits)
+        if size and np.count_nonzero(boundaries) != size - 1:
+            # A text contained the separator token itself
+            return self.score_batch([text.replace(_SEPARATOR, " ") for text in texts])
+        doc = np.cumsum(boundaries)[~boundaries]
+        hits = hits[~boundaries]
+
+        is_positive = hits > 0
+        positive = np.bincount(doc[is_positive], weights=hits[is_positive], minlength=size)
+        negative = np.bincount(doc[~is_positive], weights=-hits[~is_positive], minlength=size)
+        positive_count = np.bincount(doc[is_positive], minlength=size)
+        negative_count = np.bincount(doc[~is_positive], minlength=size)
+        return {
+            "positive": positive,
+            "negative": negative,
+            "positive_count": positive_count,
+            "negative_count": negative_count,
+            "score": _score(positive, negative),
+        }
+
+    def analyze_batch(self, texts: Sequence[str]) -> List[Dict[str, Any]]:
+        """Return a ``sentiment_analyzer`` result for each text."""
+        if len(texts) < self.min_batch:
+            return [self.analyze(text) for text in texts]
+        scores = self.score_batch(texts)
+        return list(map(
+            _result,
+            scores["score"].tolist(),
+            scores["positive_count"].tolist(),
+            scores["negative_count"].tolist(),
+        ))
+
+
+def load_lexicon(settings: Optional[dict]) -> Dict[str, float]:
+    """Build the lexicon described by the ``sentiment`` section of config.yaml.
+
+    ``DEFAULT_LEXICON`` is extended by the mapping in ``lexicon_path`` (a
+    YAML or JSON file, relative to config.yaml) and then by the inline
+    ``lexicon`` mapping.
+    """
+    settings = settings or {}
+    lexicon = dict(DEFAULT_LEXICON)
+    path = settings.get('lexicon_path')
+    if path:
+        if not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(os.path.abspath(config_service.path)), path)
+        with open(path, 'r', encoding='utf-8') as f:
+            lexicon.update(yaml.safe_load(f) or {})
+    lexicon.update(settings.get('lexicon') or {})
+    return lexicon
+
+
+_analyzer: Optional[SentimentAnalyzer] = None
+_analyzer_settings: Any = None
+_analyzer_lock = threading.Lock()
+
+
+def get_sentiment_analyzer() -> SentimentAnalyzer:
+    """Return the shared analyzer, rebuilt only when the ``sentiment`` settings change."""
+    global _analyzer, _analyzer_settings
+    settings = config_service.get('sentiment')
+    with _analyzer_lock:
+        if _analyzer is None or settings != _analyzer_settings:
+            _analyzer = SentimentAnalyzer(load_lexicon(settings))
+            _analyzer_settings = settings
+        return _analyzer
@@ -12,14 +12,52 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Tools for interacting with the session state."""
 
+"""Tools for saving and retrieving notes.
+
+Note contents live in the shared NoteStore (see shared.note_store); the
+session state only keeps a ``note_refs`` map of note names to note ids.
+
+Agents called through an AgentTool (such as MemoryAgent) run in a new session
+that receives a copy of the caller's state. Notes are therefore keyed on the
+session id recorded in ``note_session_id`` by ``remember_note_session``, which
+the root agent sets before any tool runs, rather than on the session the tool
+happens to run in.
+"""
+
+from typing import Tuple
+
+from google.adk.agents.callback_context import CallbackContext
 from google.adk.tools import ToolContext
 
+from shared.note_store import get_note_store
+
+# State key holding the id of the user's (outermost) session
+NOTE_SESSION_KEY = "note_session_id"
+
+
+def remember_note_session(callback_context: CallbackContext) -> None:
+    """Record the current session as the one notes belong to, if not yet set.
+
+    Use as a ``before_agent_callback``. In the user's session this stores its
+    id; in an AgentTool's session the id copied from the caller is kept.
+    """
+    if not callback_context.state.get(NOTE_SESSION_KEY):
+        callback_context.state[NOTE_SESSION_KEY] = callback_context.session.id
+    return None
+
+
+def _owner(tool_context: ToolContext) -> Tuple[str, str]:
+    """Return the user id and the session id that notes are keyed on."""
+    session = tool_context.session
+    return session.user_id, tool_context.state.get(NOTE_SESSION_KEY) or session.id
+
+
 def save_note(note_name: str, note_content: str, tool_context: ToolContext) -> str:
-    """Saves a key-value pair as a note in the current session state.
+    """Saves a note for the current user and session.
 
     Use this to remember information provided by the user during the conversation.
+    Saving a note with an existing name replaces its content.
 
     Args:
         note_name: The name (key) of the note to save.
@@ -29,10 +67,49 @@ def save_note(note_name: str, note_content: str, tool_context: ToolContext) -> s
     Returns:
         A string confirming that the note was saved.
     """
-    # The ADK automatically tracks changes to the state dictionary.
-    # We can simply modify it directly.
-    if "notes" not in tool_context.state:
-        tool_context.state["notes"] = {}
-    
-    tool_context.state["notes"][note_name] = note_content
-    return f"Note '{{note_name}}' saved successfully."
+    user_id, session_id = _owner(tool_context)
+    note_id = get_note_store().save(user_id, session_id, note_name, note_content)
+    # Only a reference is kept in the session state. The map is replaced,
+    # not mutated, so the ADK records the state change. The most recently
+    # saved note is kept last, which the session state manager relies on
+    # when it trims the map.
+    refs = dict(tool_context.state.get("note_refs") or {})
+    refs.pop(note_name, None)
+    refs[note_name] = note_id
+    tool_context.state["note_refs"] = refs
+    return f"Note '{note_name}' saved successfully."
+
+
+def get_note(note_name: str, tool_context: ToolContext) -> dict:
+    """Retrieves a saved note by name.
+
+    Notes from the current session are preferred; otherwise the most recent
+    note with that name from any of the user's sessions is returned.
+
+    Args:
+        note_name: The name (key) of the note to retrieve.
+        tool_context: The context object provided by the ADK.
+
+    Returns:
+        A dictionary with the note's name and content, or an error message.
+    """
+    user_id, session_id = _owner(tool_context)
+    note = get_note_store().get(user_id, note_name, session_id=session_id)
+    if note is None:
+        return {"error": f"No note named '{note_name}' was found."}
+    return {"name": note["name"], "content": note["content"]}
+
+
+def search_notes(query: str, tool_context: ToolContext) -> dict:
+    """Searches all of the user's saved notes by keyword.
+
+    Args:
+        query: Words to look for in note names and contents.
+        tool_context: The context object provided by the ADK.
+
+    Returns:
+        A dictionary with the best matching notes (name and snippet).
+    """
+    user_id, _ = _owner(tool_context)
+    matches = get_note_store().search(user_id, query)
+    return {"matches": [{"name": m["name"], "snippet": m["snippet"]} for m in matches]}
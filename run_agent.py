@@ -16,12 +16,30 @@
 """Script to run the agent system locally.
 
 This script demonstrates how to run the agentic system programmatically
-using the ADK InMemoryRunner. It creates a session and sends a sample
-request to the currently configured root_agent.
+using the RunnerService, which drives the ADK runner through ``run_async``.
+Each query is sent in its own session and all sessions run concurrently,
+bounded by the ``runner`` settings in config.yaml. Sessions are kept in
+memory or in SQLite, as selected by the ``session_service`` settings.
+Throughput and time-to-first-event are printed once all queries have finished,
+along with each turn's latency breakdown when ``tracing`` is enabled.
+
+With ``--stream`` the queries run one after another with streaming enabled,
+and the ResponderAgent's summary is printed as it is generated, before its
+JSON response is complete. With ``--profile`` each turn is profiled with
+cProfile (one at a time; see the ``profiling`` settings) and the profile
+paths are printed.
+
+Usage:
+    python run_agent.py ["query 1" "query 2" ...] [--repeat N] [--stream] [--profile]
 """
 
+import argparse
+import asyncio
+import json
 import sys
 import os
+import time
+from typing import Optional
 
 # Add the project root to the path to enable imports
 project_root = os.path.abspath(os.path.dirname(__file__))
@@ -31,46 +49,179 @@ sys.path.insert(0, project_root)
 import dotenv
 dotenv.load_dotenv()
 
-# Import ADK components
-from google.adk.runners import InMemoryRunner
-from google.genai.types import Part, UserContent
+# Import the root agent (configured in my_agent_system.agent) and the runner service
+from my_agent_system import agent as agent_module
+from my_agent_system.services.runner_service import RunnerService, event_text
+from google.adk.agents.run_config import RunConfig, StreamingMode
+# Imported via the same path as the agents so the shared instance is reused
+from shared.config import config_service
+from shared.model_routing import usage_recorder
+from shared.streaming_json import IncrementalJsonParser
+from shared.tool_cache import get_tool_cache
+from shared.tracing import flush_tracing, format_trace_tree
+
+# The sample research query used when none is given on the command line
+DEFAULT_QUERY = "Research the latest developments in quantum computing and their potential applications."
 
-# Import the root agent (configured in my_agent_system.agent)
-from my_agent_system.agent import root_agent
+# The agent whose JSON FinalResponse is parsed and streamed to the user
+RESPONDER_NAME = "ResponderAgent"
 
 
-def run_agent():
-    """Run the agent system with a sample query.
-    
-    This function creates an InMemoryRunner, establishes a session,
-    and sends a sample research query to the agent system.
+async def stream_query(
+    service: RunnerService, user_id: str, session_id: str, query: str, profile: Optional[bool] = None
+) -> None:
+    """Run one query with SSE streaming and print the answer as it arrives.
+
+    Partial ResponderAgent output is fed to an incremental JSON parser, so the
+    summary is printed token by token and the sources once they are complete.
+    Other agents are shown as progress lines, and their final text is printed
+    only when no ResponderAgent output appears.
     """
-    # Create a runner with the configured root agent
-    runner = InMemoryRunner(agent=root_agent)
-    
-    # Create a session (required for agent interactions)
-    import asyncio
-    session = asyncio.run(runner.session_service.create_session(
-        app_name=runner.app_name, user_id="test_user"
-    ))
-    
-    # Define a sample research query
-    user_input = "Research the latest developments in quantum computing and their potential applications."
-    
-    # Display the query to the user
-    print(f"User: {user_input}\n")
-    print("Agent Response:")
-    print("=" * 50)
-    
-    # Run the agent and display responses as they arrive
-    content = UserContent(parts=[Part(text=user_input)])
-    for event in runner.run(
-        user_id=session.user_id, session_id=session.id, new_message=content
-    ):
-        for part in event.content.parts:
-            print(part.text)
+    print(f"User: {query}\n")
+    run_config = RunConfig(streaming_mode=StreamingMode.SSE)
+    parser = None
+    last_author = None
+    final_texts = []
+    first_token = None
+    started = time.perf_counter()
+    async for event in service.stream_turn(user_id, session_id, query, run_config=run_config, profile=profile):
+        text = event_text(event)
+        if event.author != last_author:
+            last_author = event.author
+            print(f"[{event.author}]", flush=True)
+        if event.author != RESPONDER_NAME or not text:
+            if text and not event.partial:
+                final_texts.append(text)
+            continue
+        if not event.partial and parser is not None:
+            # The aggregated final response repeats the streamed partials
+            continue
+        if parser is None:
+            parser = IncrementalJsonParser()
+        for field in parser.feed(text):
+            if field.key == "summary" and field.delta:
+                if first_token is None:
+                    first_token = time.perf_counter() - started
+                    print("\nSummary: ", end="")
+                print(field.delta, end="", flush=True)
+            elif field.complete and field.key == "sources":
+                print("\n\nSources:")
+                for source in field.value or []:
+                    print(f"- {source}")
+    if parser is None:
+        print("\n".join(final_texts))
+    print()
+    if first_token is not None:
+        print(f"(first summary token after {first_token * 1000:.0f} ms, "
+              f"complete after {(time.perf_counter() - started) * 1000:.0f} ms)\n")
+
+
+async def run_agent(queries, repeat: int = 1, stream: bool = False, profile: Optional[bool] = None):
+    """Run the agent system concurrently over a list of queries.
+
+    Each query (repeated ``repeat`` times) gets its own session; all turns are
+    submitted at once and executed by the RunnerService.
+
+    Args:
+        queries: The user queries to send
+        repeat: How many sessions to open per query
+        stream: Run the queries one at a time and stream each answer
+        profile: Profile every turn (True); by default the ``profiling``
+            settings decide
+    """
+    service = RunnerService.from_config(agent_module.root_agent, config_service.get())
+
+    if stream:
+        try:
+            for index in range(repeat):
+                for query in queries:
+                    user_id = f"user_{index}"
+                    session = await service.create_session(user_id)
+                    await stream_query(service, user_id, session.id, query, profile)
+        finally:
+            await service.close()
+            flush_tracing()
+        return
+
+    turns = []
+    for index in range(repeat):
+        for query in queries:
+            user_id = f"user_{index}"
+            session = await service.create_session(user_id)
+            turns.append((user_id, session.id, query))
+
+    try:
+        results = await service.run_many(turns, profile=profile)
+        sessions = [
+            await service.session_service.get_session(
+                app_name=service.app_name, user_id=user_id, session_id=session_id
+            )
+            for user_id, session_id, _ in turns
+        ]
+    finally:
+        await service.close()
+        flush_tracing()
+
+    # Display the responses to the user
+    for (_, _, query), result, session in zip(turns, results, sessions):
+        print(f"User: {query}\n")
+        print("Agent Response:")
+        print("=" * 50)
+        print(result.text if result.error is None else f"Error: {result.error}")
+        print()
+        if result.usage:
+            print("Budget usage:")
+            print(json.dumps(result.usage, indent=2))
+            print()
+        if session is not None:
+            report = agent_module.session_state_manager.report(session)
+            print(f"Session memory: {report['state_bytes']} state bytes in {len(report['keys'])} keys, "
+                  f"{report['events']} events ({report['event_bytes']} bytes)")
+            print()
+        if service.trace_collector is not None and result.trace_id:
+            print(f"Latency breakdown (trace {result.trace_id}):")
+            print(format_trace_tree(service.trace_collector.trace(result.trace_id)))
+            print()
+        if result.profile_path:
+            print(f"Profile: {result.profile_path}")
+            print()
+
+    print("Runner statistics:")
+    print(json.dumps(service.stats.summary(), indent=2))
+
+    rehydration = getattr(service.session_service, 'rehydration', None)
+    if rehydration is not None:
+        print("Session rehydration:")
+        print(json.dumps(rehydration.summary(), indent=2))
+
+    if config_service.get_bool('pre_router.enabled', False):
+        print("Pre-router statistics:")
+        print(json.dumps(agent_module.pre_router.stats(), indent=2))
+
+    if config_service.get_bool('session_state.enabled', False):
+        print("Session state evictions:")
+        print(json.dumps(agent_module.session_state_manager.stats(), indent=2))
+
+    tool_cache = get_tool_cache()
+    if tool_cache is not None:
+        print("Tool result cache:")
+        print(json.dumps(tool_cache.stats(), indent=2))
+
+    print("Model usage per agent:")
+    print(json.dumps(usage_recorder.summary(config_service.get('model_routing.pricing')), indent=2))
+
+
+def main():
+    """Parse command line arguments and run the agent."""
+    parser = argparse.ArgumentParser(description="Run the agent system locally.")
+    parser.add_argument("queries", nargs="*", default=[DEFAULT_QUERY], help="User queries to send")
+    parser.add_argument("--repeat", type=int, default=1, help="Sessions to open per query")
+    parser.add_argument("--stream", action="store_true", help="Stream each answer as it is generated")
+    parser.add_argument("--profile", action="store_true", default=None, help="Profile each turn with cProfile")
+    args = parser.parse_args()
+    asyncio.run(run_agent(args.queries, repeat=args.repeat, stream=args.stream, profile=args.profile))
 
 
 # Execute the script when run directly
 if __name__ == "__main__":
-    run_agent()
\ No newline at end of file
+    main()
@@ -0,0 +1,73 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Shared fixtures for the unit tests."""
+
+import sys
+import os
+import asyncio
+from typing import List
+
+import pytest
+from pydantic import Field
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import my_agent_system  # noqa: F401  (sets up the package import paths)
+from google.adk.agents import BaseAgent
+from google.adk.events import Event
+from google.genai import types
+
+
+class EchoAgent(BaseAgent):
+    """A model-free agent that echoes the user's message after a delay.
+
+    Every message it receives is recorded in ``calls``, and ``peak`` is the
+    largest number of turns it was running at the same time.
+    """
+
+    delay: float = 0.0
+    prefix: str = ""
+    # Yield no response at all
+    silent: bool = False
+    calls: List[str] = Field(default_factory=list)
+    running: int = 0
+    peak: int = 0
+
+    async def _run_async_impl(self, ctx):
+        text = ctx.user_content.parts[0].text
+        self.calls.append(text)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        if self.silent:
+            return
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            content=types.Content(role="model", parts=[types.Part(text=f"{self.prefix}{text}")]),
+        )
+
+
+@pytest.fixture
+def echo_agent():
+    """Return a factory for EchoAgents, e.g. ``echo_agent("Echo", delay=0.2)``."""
+    def _create(name: str = "Echo", **fields) -> EchoAgent:
+        return EchoAgent(name=name, **fields)
+
+    return _create
@@ -0,0 +1,62 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for the BaseAgent agent cache."""
+
+import sys
+import os
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from my_agent_system.agents.sub_agents.analyzer import AnalyzerAgent
+from my_agent_system.agents.sub_agents.search_agent import SearchAgent
+from agents.base_agent import BaseAgent
+
+
+def test_create_agent_is_memoized():
+    """Identical agent classes and configs share one ADK agent."""
+    first = AnalyzerAgent().create_agent()
+    second = AnalyzerAgent().create_agent()
+    assert first is second
+
+
+def test_cache_is_keyed_per_agent_class():
+    """Different agent classes never share cached agents."""
+    assert AnalyzerAgent().create_agent() is not SearchAgent().create_agent()
+
+
+def test_use_cache_false_builds_fresh_agent():
+    """Callers can opt out of the cache to get an unparented agent."""
+    analyzer = AnalyzerAgent()
+    assert analyzer.create_agent(use_cache=False) is not analyzer.create_agent()
+
+
+def test_invalidate_agent_cache():
+    """Explicit invalidation forces the next call to rebuild."""
+    analyzer = AnalyzerAgent()
+    first = analyzer.create_agent()
+    BaseAgent.invalidate_agent_cache()
+    assert analyzer.create_agent() is not first
+
+
+def test_config_change_invalidates_cache(monkeypatch):
+    """A changed effective config yields a different agent."""
+    analyzer = AnalyzerAgent()
+    first = analyzer.create_agent()
+    changed = {'agent_settings': {'model': 'gemini-2.5-pro'}}
+    monkeypatch.setattr(BaseAgent, '_load_config', classmethod(lambda cls: changed))
+    second = analyzer.create_agent()
+    assert second is not first
+    assert second.model == 'gemini-2.5-pro'
@@ -0,0 +1,99 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for per-agent budget enforcement."""
+
+import sys
+import os
+import asyncio
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import my_agent_system  # noqa: F401  (sets up the package import paths)
+from google.adk.agents import Agent
+from google.adk.tools import FunctionTool
+
+from agents.base_agent import merge_callbacks
+from llm.fake_llm import FakeLlm
+from my_agent_system.services.runner_service import RunnerService
+from shared.budgets import AgentBudget, BudgetEnforcer
+
+# A script that never stops calling the lookup tool
+LOOPING_RULES = [{"on": "any", "function_call": {"name": "lookup", "args": {"query": "more"}}}]
+
+tool_calls = []
+
+
+def lookup(query: str) -> dict:
+    """Look up a query."""
+    tool_calls.append(query)
+    return {"result": f"found {query}"}
+
+
+def _run(budget: AgentBudget):
+    enforcer = BudgetEnforcer("LoopingAgent", budget)
+    agent = Agent(
+        name="LoopingAgent",
+        model="fake/test",
+        instruction="Keep looking things up.",
+        tools=[FunctionTool(func=lookup)],
+        **enforcer.callbacks(),
+    )
+
+    async def _main():
+        service = RunnerService(agent)
+        session = await service.create_session("user")
+        return await service.run_turn("user", session.id, "Find everything")
+
+    return asyncio.run(_main())
+
+
+def test_budget_resolution_and_merging():
+    """Per-agent overrides win over defaults; callbacks merge in order."""
+    settings = {
+        'enabled': True,
+        'default': {'max_turns': 10, 'max_tool_calls': 5},
+        'agents': {'SearchAgent': {'max_tool_calls': 1}},
+    }
+    assert AgentBudget.from_config('SearchAgent', settings) == AgentBudget(max_turns=10, max_tool_calls=1)
+    assert AgentBudget.from_config('Other', settings).max_tool_calls == 5
+    assert BudgetEnforcer.from_config('SearchAgent', {'enabled': False}) is None
+
+    def first(): pass
+    def second(): pass
+    assert merge_callbacks({'before_model_callback': first},
+                           {'before_model_callback': [second]}) == {'before_model_callback': [first, second]}
+
+
+def test_runaway_agent_stops_gracefully(monkeypatch):
+    """Tool calls are refused past the limit and the turn limit ends the agent."""
+    monkeypatch.setattr(FakeLlm, "_settings", lambda self: {"rules": LOOPING_RULES})
+    tool_calls.clear()
+    result = _run(AgentBudget(max_turns=4, max_tool_calls=2))
+
+    assert result.error is None
+    assert "stopped early because its max_turns budget was exhausted" in result.text
+    usage = result.usage["LoopingAgent"]
+    assert (usage["turns"], usage["tool_calls"], usage["exceeded"]) == (4, 2, "max_turns")
+    assert usage["tokens"] > 0
+    assert len(tool_calls) == 2
+
+
+def test_token_and_deadline_limits(monkeypatch):
+    """Token and wall-clock budgets also end the agent early."""
+    monkeypatch.setattr(FakeLlm, "_settings", lambda self: {"rules": LOOPING_RULES})
+    assert _run(AgentBudget(max_tokens=1)).usage["LoopingAgent"]["exceeded"] == "max_tokens"
+    usage = _run(AgentBudget(deadline_seconds=1e-9)).usage["LoopingAgent"]
+    assert (usage["turns"], usage["exceeded"]) == (0, "deadline_seconds")
@@ -0,0 +1,62 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for the shared config service."""
+
+import sys
+import os
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from my_agent_system.shared.config import ConfigService
+
+
+def _write(path, text, mtime):
+    path.write_text(text, encoding='utf-8')
+    os.utime(path, (mtime, mtime))
+
+
+def test_typed_accessors(tmp_path):
+    """Dotted paths resolve to typed values with defaults."""
+    config_file = tmp_path / "config.yaml"
+    _write(config_file, "agent_settings:\n  model: m1\nlimits:\n  max_turns: '7'\n  strict: 'yes'\n", 1000)
+    service = ConfigService(str(config_file))
+    assert service.model_name == "m1"
+    assert service.get_int("limits.max_turns") == 7
+    assert service.get_bool("limits.strict") is True
+    assert service.get_float("limits.missing", 1.5) == 1.5
+
+
+def test_reload_notifies_callbacks_on_change(tmp_path):
+    """Changed file content triggers callbacks; an unchanged mtime does not re-parse."""
+    config_file = tmp_path / "config.yaml"
+    _write(config_file, "agent_settings:\n  model: m1\n", 1000)
+    service = ConfigService(str(config_file), check_interval=0)
+    changes = []
+    service.on_change(lambda old, new: changes.append((old, new)))
+
+    assert service.model_name == "m1"
+    assert service.reload_if_changed() is False
+
+    _write(config_file, "agent_settings:\n  model: m2\n", 2000)
+    assert service.model_name == "m2"
+    assert len(changes) == 1
+    assert changes[0][0]["agent_settings"]["model"] == "m1"
+
+
+def test_missing_file_uses_defaults(tmp_path):
+    """A missing config file falls back to the default model."""
+    service = ConfigService(str(tmp_path / "missing.yaml"))
+    assert service.model_name == "gemini-1.5-flash"
@@ -0,0 +1,106 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for context compaction between research pipeline stages."""
+
+import sys
+import os
+import asyncio
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import my_agent_system  # noqa: F401  (sets up the package import paths)
+from google.adk.agents import Agent, SequentialAgent
+
+from agents.sub_agents.compactor import FindingsCompactorAgent
+from llm.fake_llm import FakeLlm
+from my_agent_system.services.runner_service import RunnerService
+from shared.context_compaction import (
+    compact_findings,
+    estimate_tokens,
+    render_findings,
+    stage_context_callback,
+)
+
+REPORT = """## Research Findings
+
+### What is quantum computing?
+
+- Quantum computers use qubits. They exploit superposition (https://example.com/a).
+- quantum computers use QUBITS!
+1. Error correction remains the main obstacle, see https://example.com/b.
+"""
+
+
+def test_compaction_dedupes_and_collects_sources():
+    """Duplicate points and headings are dropped; URLs become sources."""
+    findings = compact_findings(REPORT)
+    assert findings["key_points"] == [
+        "Quantum computers use qubits.",
+        "They exploit superposition (https://example.com/a).",
+        "Error correction remains the main obstacle, see https://example.com/b.",
+    ]
+    assert findings["sources"] == ["https://example.com/a", "https://example.com/b"]
+    assert findings["token_estimate"] == estimate_tokens(render_findings(findings))
+
+
+def test_compaction_respects_budgets():
+    """The number of points and their token cost stay within the limits."""
+    long_report = " ".join(f"Finding number {i} is important." for i in range(500))
+    findings = compact_findings(long_report, max_tokens=100, max_points=50)
+    assert sum(estimate_tokens(p) + 1 for p in findings["key_points"]) <= 100
+    assert findings["source_tokens"] > 10 * findings["token_estimate"]
+    assert len(compact_findings(long_report, max_points=3)["key_points"]) == 3
+
+
+def test_downstream_stage_sees_only_compacted_context(monkeypatch):
+    """The analyzer receives the request plus findings, not the raw research."""
+    requests = []
+    original = FakeLlm._build_content
+
+    def _recording_build_content(self, llm_request, rules):
+        requests.append(llm_request)
+        return original(self, llm_request, rules)
+
+    monkeypatch.setattr(FakeLlm, "_build_content", _recording_build_content)
+    raw_research = "Raw search dump. " * 2000 + "See https://example.com/source."
+    monkeypatch.setattr(FakeLlm, "_settings", lambda self: {"rules": [
+        {"instruction": "You are Researcher", "text": raw_research},
+    ]})
+    pipeline = SequentialAgent(name="Pipeline", sub_agents=[
+        Agent(name="Researcher", model="fake/test", instruction="You are Researcher.",
+              output_key="research_output"),
+        FindingsCompactorAgent(name="Compactor"),
+        Agent(name="Analyzer", model="fake/test", instruction="You are Analyzer.",
+              output_key="analysis",
+              before_model_callback=stage_context_callback(200, ["research_findings"])),
+    ])
+
+    async def _main():
+        service = RunnerService(pipeline)
+        session = await service.create_session("user")
+        await service.run_turn("user", session.id, "Research quantum computing")
+        return await service.session_service.get_session(
+            app_name=service.app_name, user_id="user", session_id=session.id
+        )
+
+    session = asyncio.run(_main())
+    analyzer_request = requests[-1]
+    assert len(analyzer_request.contents) == 1
+    prompt = analyzer_request.contents[0].parts[0].text
+    assert prompt.startswith("Request: Research quantum computing")
+    assert estimate_tokens(prompt) <= 201
+    assert session.state["research_findings"]["sources"] == ["https://example.com/source"]
+    assert "analysis" in session.state
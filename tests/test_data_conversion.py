@@ -0,0 +1,111 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for the streaming data conversion engine and its tools."""
+
+import sys
+import os
+import asyncio
+import json
+
+import pytest
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import my_agent_system  # noqa: F401  (sets up the package import paths)
+from tools import custom_tools
+from tools.data_conversion import FORMATS, READERS, convert, convert_file
+
+RECORDS = [
+    {"name": "Ada & Co", "age": 36, "tags": ["a", "b"], "address": {"city": "<London>"}, "bad key": "x"},
+    {"name": "Bob \"B\"", "age": None, "tags": [], "address": {}, "bad key": "line\nbreak"},
+]
+
+
+def _chunked(text: str, size: int = 5):
+    return (text[i:i + size] for i in range(0, len(text), size))
+
+
+@pytest.mark.parametrize("target", FORMATS)
+def test_round_trip_through_small_chunks(target):
+    """Every format can be written and read back from arbitrarily split chunks."""
+    text = "".join(convert(json.dumps(RECORDS), "json", target))
+    back = list(READERS[target](_chunked(text)))
+    assert len(back) == 2
+    if target in ("json", "jsonl"):
+        assert back == RECORDS
+    else:
+        # CSV and XML carry text only
+        assert back[0]["name"] == "Ada & Co" and back[1]["name"] == 'Bob "B"'
+        assert back[1]["bad key"] == "line\nbreak"
+    if target == "xml":
+        assert "Ada &amp; Co" in text and "&lt;London&gt;" in text
+        assert back[0]["tags"] == ["a", "b"] and back[0]["address"] == {"city": "<London>"}
+        assert back[0]["bad key"] == "x"
+
+
+def test_json_arrays_are_decoded_incrementally():
+    """Elements are produced before the rest of the array has been read."""
+    consumed = []
+
+    def _source():
+        for chunk in ['[{"n": 1', '2}, 3', '4, {"n"', ': 5}', ']']:
+            consumed.append(chunk)
+            yield chunk
+
+    records = READERS["json"](_source())
+    assert next(records) == {"n": 12}
+    assert len(consumed) == 2
+    assert list(records) == [{"value": 34}, {"n": 5}]
+    with pytest.raises(ValueError):
+        list(READERS["json"](['[{"n": 1}, {"n":']))
+
+
+def test_convert_file_streams_large_files(tmp_path):
+    """A multi-megabyte file converts with bounded reads."""
+    source = tmp_path / "rows.jsonl"
+    with open(source, "w", encoding="utf-8") as f:
+        for i in range(20000):
+            f.write(json.dumps({"id": i, "text": f"review number {i} " * 5}) + "\n")
+    result = convert_file(str(source), str(tmp_path / "rows.csv"), chunk_size=4096)
+    assert result["records"] == 20000 and result["input_bytes"] > 2_000_000
+    back = convert_file(str(tmp_path / "rows.csv"), str(tmp_path / "rows.xml"))
+    assert back["records"] == 20000
+    last = list(READERS["xml"](open(tmp_path / "rows.xml", encoding="utf-8")))[-1]
+    assert last["id"] == "19999"
+
+
+def test_tools(tmp_path, monkeypatch):
+    """data_formatter converts structured text; convert_data_file stays in its directory."""
+    run = asyncio.run
+    assert run(custom_tools.data_formatter("name: John, age: 30", "json")) == '{"data": "name: John, age: 30"}'
+    assert run(custom_tools.data_formatter("a < b", "xml")) == "<data>a &lt; b</data>"
+    assert run(custom_tools.data_formatter('[{"a": 1}]', "json")) == '[{"a": 1}]'
+    assert run(custom_tools.data_formatter('{"a": 1}\n{"a": 2}', "csv")) == "a\r\n1\r\n2\r\n"
+
+    (tmp_path / "in.json").write_text('[{"a": 1}, {"a": 2}]')
+    settings = {'data_conversion.base_dir': str(tmp_path)}
+    monkeypatch.setattr(custom_tools.config_service, "get_str", lambda path, default="": settings.get(path, default))
+    result = run(custom_tools.convert_data_file("in.json", "out/in.jsonl"))
+    assert result["records"] == 2 and (tmp_path / "out" / "in.jsonl").exists()
+    assert "error" in run(custom_tools.convert_data_file("../in.json", "x.csv"))
+    assert "error" in run(custom_tools.convert_data_file("missing.json", "x.csv"))
+    # Converting a file onto itself is refused and leaves it intact
+    assert "error" in run(custom_tools.convert_data_file("in.json", "./out/../in.json", output_format="csv"))
+    assert (tmp_path / "in.json").read_text() == '[{"a": 1}, {"a": 2}]'
+    # The engine itself rewrites in place safely, via a temporary file
+    convert_file(str(tmp_path / "in.json"), str(tmp_path / "in.json"), target_format="jsonl")
+    assert (tmp_path / "in.json").read_text() == '{"a": 1}\n{"a": 2}\n'
+    assert sorted(os.listdir(tmp_path)) == ["in.json", "out"]
@@ -0,0 +1,80 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for near-duplicate detection of research findings."""
+
+import sys
+import os
+import random
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import my_agent_system  # noqa: F401  (sets up the package import paths)
+from agents.sub_agents.compactor import compactor_agent
+from shared.context_compaction import compact_findings
+from shared.dedup import NearDuplicateIndex, deduplicate, jaccard, shingles
+
+
+def test_near_duplicates_are_found_without_false_positives():
+    """Lightly edited copies are removed; unrelated texts are all kept."""
+    rng = random.Random(7)
+    vocabulary = [f"word{i}" for i in range(5000)]
+    originals = [" ".join(rng.choice(vocabulary) for _ in range(40)) for _ in range(300)]
+    texts = []
+    for text in originals:
+        texts.append(text)
+        words = text.split()
+        words[20] = "edited"
+        texts.append(" ".join(words))
+
+    result = deduplicate(texts, threshold=0.8)
+    # LSH may miss the odd pair, but never merges unrelated texts
+    assert len(result.duplicates) >= 290
+    assert all(original == copy - 1 for copy, original in result.duplicates.items())
+    assert result.summary()["bytes_removed"] == sum(len(texts[i]) for i in result.duplicates)
+
+
+def test_candidates_are_confirmed_exactly():
+    """Only pairs at or above the threshold are reported."""
+    index = NearDuplicateIndex(threshold=0.5, shingle_size=2)
+    first = "quantum computers use qubits that exploit superposition and entanglement"
+    assert index.add(first) is None
+    similar = "quantum computers use qubits that exploit superposition and interference"
+    different = "classical computers use bits that are either zero or one"
+    assert jaccard(shingles(first, 2), shingles(similar, 2)) >= 0.5
+    assert index.add(similar) == 0
+    assert index.add(different) is None
+    assert len(index) == 2
+
+
+def test_compaction_removes_overlapping_findings():
+    """Overlapping search results collapse into one point, with stats."""
+    report = """## Research Findings
+
+### What is quantum computing?
+- IBM unveiled Condor, a 1,121 qubit processor, in December 2023.
+- Quantum computers exploit superposition.
+
+### Latest developments
+- In December 2023 IBM unveiled Condor, a 1,121 qubit processor.
+- Error correction remains the main obstacle.
+"""
+    plain = compact_findings(report)
+    findings = compact_findings(report, dedup_threshold=0.6)
+    assert len(plain["key_points"]) == 4 and plain["dedup"]["removed"] == 0
+    assert len(findings["key_points"]) == 3
+    assert findings["key_points"][0].startswith("IBM unveiled Condor")
+    assert findings["dedup"]["removed"] == 1 and findings["dedup"]["tokens_removed"] > 10
+    assert compactor_agent.create_agent(use_cache=False).dedup_threshold == 0.6
@@ -0,0 +1,89 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for the parallel evaluation harness."""
+
+import sys
+import os
+import asyncio
+import json
+import time
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from my_agent_system.services.eval_harness import EvalCase, EvalHarness, ResponseCache, load_cases
+
+
+def _cases(count, start=0):
+    return [EvalCase(id=str(i), input=f"case {i}", expected=f"echo case {i}") for i in range(start, start + count)]
+
+
+def test_cases_run_concurrently_and_report_latency(echo_agent):
+    """Workers overlap cases; the report is in dataset order with scores and latency."""
+    agent = echo_agent(delay=0.2, prefix="echo ")
+    harness = EvalHarness(agent, workers=4)
+    report = asyncio.run(harness.run(iter(_cases(8))))
+
+    assert [result.id for result in report.results] == [str(i) for i in range(8)]
+    assert all(result.score == 1.0 and result.passed for result in report.results)
+    summary = report.summary()
+    assert summary["passed"] == 8 and summary["executed"] == 8
+    # Four workers keep four cases in flight at once, never more
+    assert agent.peak == 4
+    assert summary["latency_p50_ms"] >= 200
+
+
+def test_response_cache_makes_reruns_incremental(tmp_path, echo_agent):
+    """Re-runs only execute new prompts, or all prompts once the agent changes."""
+    path = str(tmp_path / "cache.jsonl")
+    first = echo_agent(delay=0.2, prefix="echo ")
+    asyncio.run(EvalHarness(first, cache=ResponseCache(path)).run(_cases(3)))
+    assert len(first.calls) == 3
+
+    rerun = echo_agent(delay=0.2, prefix="echo ")
+    report = asyncio.run(EvalHarness(rerun, cache=ResponseCache(path)).run(_cases(4)))
+    assert rerun.calls == ["case 3"]
+    assert [result.cached for result in report.results] == [True, True, True, False]
+    assert report.results[0].response == "echo case 0" and report.results[0].latency_s >= 0.2
+
+    changed = echo_agent("Echo2", delay=0.2, prefix="echo ")
+    asyncio.run(EvalHarness(changed, cache=ResponseCache(path)).run(_cases(2)))
+    assert len(changed.calls) == 2
+
+    # Empty responses are not cached, so they are retried on the next run
+    silent = echo_agent("Silent", silent=True)
+    for _ in range(2):
+        asyncio.run(EvalHarness(silent, cache=ResponseCache(path)).run(_cases(1)))
+    assert len(silent.calls) == 2
+
+
+def test_jsonl_dataset_and_rate_limit(tmp_path, echo_agent):
+    """Datasets load lazily from JSONL, and case starts respect the rate limit."""
+    path = tmp_path / "cases.jsonl"
+    lines = [{"id": "a", "input": "alpha", "expected": "echo alpha", "topic": "x"}, {"query": "beta"}]
+    lines += [{"input": f"gamma {i}"} for i in range(3)]
+    path.write_text("\n".join(json.dumps(line) for line in lines) + "\n\n", encoding="utf-8")
+
+    cases = list(load_cases(str(path)))
+    assert [case.id for case in cases] == ["a", "2", "3", "4", "5"]
+    assert cases[0].metadata == {"topic": "x"} and cases[1].input == "beta" and cases[1].expected == ""
+
+    started = time.perf_counter()
+    agent = echo_agent(delay=0.2, prefix="echo ")
+    report = asyncio.run(EvalHarness(agent, workers=5, rate_limit=10).run(load_cases(str(path))))
+    # Five starts spaced 100ms apart, then one 200ms case
+    assert time.perf_counter() - started >= 0.6
+    # Cases without an expected answer pass when the agent responds
+    assert all(result.passed for result in report.results)
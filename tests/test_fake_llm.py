@@ -0,0 +1,81 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for the offline FakeLlm backend."""
+
+import sys
+import os
+import asyncio
+import random
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import my_agent_system  # noqa: F401  (sets up the package import paths)
+from google.adk.agents import Agent
+from google.adk.tools import FunctionTool
+
+from llm.fake_llm import FakeLlm
+from my_agent_system.services.runner_service import RunnerService
+
+calls = []
+
+
+def lookup_weather(city: str) -> dict:
+    """Return the weather for a city."""
+    calls.append(city)
+    return {"city": city, "forecast": "sunny"}
+
+
+def _run(agent, text):
+    async def _main():
+        service = RunnerService(agent)
+        session = await service.create_session("user")
+        return await service.run_turn("user", session.id, text)
+    return asyncio.run(_main())
+
+
+def test_scripted_function_call_then_text(monkeypatch):
+    """A scripted rule emits a function call and the tool result is summarized."""
+    settings = {"rules": [{
+        "instruction": "weather bot",
+        "function_call": {"name": "lookup_weather", "args": {"city": "{input}"}},
+    }]}
+    monkeypatch.setattr(FakeLlm, "_settings", lambda self: settings)
+    calls.clear()
+    agent = Agent(
+        name="WeatherAgent",
+        model="fake/test",
+        instruction="You are a weather bot.",
+        tools=[FunctionTool(func=lookup_weather)],
+    )
+    result = _run(agent, "Paris")
+    assert result.error is None
+    assert calls == ["Paris"]
+    assert "sunny" in result.text
+
+
+def test_responses_are_deterministic():
+    """Identical requests produce identical text."""
+    agent = Agent(name="EchoAgent", model="fake/test", instruction="Echo.")
+    assert _run(agent, "hello").text == _run(agent, "hello").text
+
+
+def test_latency_distributions_are_bounded():
+    """Sampled latencies respect the configured distribution."""
+    rng = random.Random(0)
+    uniform = {"distribution": "uniform", "min_ms": 10, "max_ms": 20}
+    assert all(10 <= FakeLlm._sample_ms(uniform, rng) <= 20 for _ in range(100))
+    assert FakeLlm._sample_ms({"distribution": "fixed", "mean_ms": 5}, rng) == 5
+    assert FakeLlm._sample_ms({"distribution": "normal", "mean_ms": 0, "stddev_ms": 10}, rng) >= 0
@@ -0,0 +1,69 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for sentence segmentation and key-point ranking."""
+
+import sys
+import os
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import my_agent_system  # noqa: F401  (sets up the package import paths)
+from shared.context_compaction import compact_findings
+from shared.utils import extract_key_points, iter_key_points, iter_sentences, split_sentences
+
+TEXT = (
+    "Quantum computers use qubits, e.g. trapped ions. Qubits are fragile and need error correction. "
+    "Error correction for qubits needs many physical qubits per logical qubit. "
+    "The conference lunch was served at 12.30 p.m. in the main hall. "
+    "Dr. Smith expects error correction to make qubits practical by 2030."
+)
+
+
+def test_segmenter_handles_abbreviations_decimals_and_chunks():
+    """Abbreviations, initials and decimals do not end sentences, however the text is split."""
+    sentences = split_sentences(TEXT)
+    assert len(sentences) == 5
+    assert sentences[0] == "Quantum computers use qubits, e.g. trapped ions."
+    assert sentences[3] == "The conference lunch was served at 12.30 p.m. in the main hall."
+    assert sentences[4].startswith("Dr. Smith")
+    chunked = list(iter_sentences(TEXT[i:i + 7] for i in range(0, len(TEXT), 7)))
+    assert chunked == sentences
+    assert split_sentences("See Fig. 2. It shows J. R. Smith's data.\n\n## Next\nMore") == [
+        "See Fig. 2.", "It shows J. R. Smith's data.", "## Next\nMore",
+    ]
+
+
+def test_key_points_are_the_most_central_sentences():
+    """The off-topic sentence is ranked out; the points keep their text order."""
+    for method in ("textrank", "tfidf"):
+        points = extract_key_points(TEXT, 3, method=method)
+        assert len(points) == 3 and not any("lunch" in point for point in points)
+        assert points == sorted(points, key=TEXT.index)
+    assert extract_key_points(TEXT, 2, method="lead") == split_sentences(TEXT)[:2]
+
+    # Long texts are ranked window by window
+    text = " ".join(f"Filler remark number {i} here." for i in range(300)) + " " + TEXT
+    assert len(list(iter_key_points(text, 2, window=100))) == 8
+    points = extract_key_points(text, 3, window=50)
+    assert len(points) == 3 and points == sorted(points, key=text.index)
+
+
+def test_compaction_keeps_central_points_within_budget():
+    """When not every point fits, the findings keep the most central ones."""
+    findings = compact_findings(TEXT, max_points=3)
+    assert not any("lunch" in point for point in findings["key_points"])
+    lead = compact_findings(TEXT, max_points=3, ranking="lead")
+    assert lead["key_points"] == split_sentences(TEXT)[:3]
@@ -0,0 +1,75 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for per-agent model tiering and the model usage recorder."""
+
+import sys
+import os
+import asyncio
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import my_agent_system  # noqa: F401  (sets up the package import paths)
+from google.adk.agents import Agent
+
+from my_agent_system.services.runner_service import RunnerService
+from shared.model_routing import ModelUsageRecorder, resolve_model
+
+CONFIG = {
+    'agent_settings': {'model': 'gemini-2.0-flash'},
+    'model_routing': {
+        'tiers': {'fast': 'gemini-2.5-flash-lite', 'strong': 'gemini-2.5-pro'},
+        'agents': {'OrchestratorAgent': 'fast', 'AnalyzerAgent': 'strong', 'ToolDemoAgent': 'gemini-2.5-flash'},
+    },
+}
+
+
+def test_tiers_overrides_and_default():
+    """Agents get their tier's model, an explicit model, or the default."""
+    assert resolve_model(CONFIG, 'OrchestratorAgent') == 'gemini-2.5-flash-lite'
+    assert resolve_model(CONFIG, 'AnalyzerAgent') == 'gemini-2.5-pro'
+    assert resolve_model(CONFIG, 'ToolDemoAgent') == 'gemini-2.5-flash'
+    assert resolve_model(CONFIG, 'ResponderAgent') == 'gemini-2.0-flash'
+    assert resolve_model({'agent_settings': {'model': 'gemini-2.0-flash'}}, 'AnalyzerAgent') == 'gemini-2.0-flash'
+
+
+def test_fake_default_model_is_never_routed_away():
+    """Offline runs keep the fake model for every agent."""
+    offline = dict(CONFIG, agent_settings={'model': 'fake/test'})
+    assert resolve_model(offline, 'AnalyzerAgent') == 'fake/test'
+
+
+def test_recorder_reports_latency_tokens_and_cost():
+    """Each model call is recorded for its agent and priced per model."""
+    recorder = ModelUsageRecorder()
+    agent = Agent(name="Classifier", model="fake/test", instruction="Classify.", **recorder.callbacks())
+
+    async def _main():
+        service = RunnerService(agent)
+        for text in ["first request", "second request"]:
+            session = await service.create_session("user")
+            await service.run_turn("user", session.id, text)
+
+    asyncio.run(_main())
+    report = recorder.summary({"fake/test": {"input": 1.0, "output": 2.0}})["Classifier"]
+    assert report["model"] == "fake/test"
+    assert report["calls"] == 2
+    assert report["prompt_tokens"] > 0 and report["output_tokens"] > 0
+    expected = (report["prompt_tokens"] * 1.0 + report["output_tokens"] * 2.0) / 1e6
+    assert report["cost_usd"] == round(expected, 6)
+    assert report["latency_p95_ms"] >= report["latency_p50_ms"] >= 0
+
+    recorder.record("Classifier", "other-model", 0.5)
+    assert set(recorder.summary()) == {"Classifier (fake/test)", "Classifier (other-model)"}
@@ -0,0 +1,138 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for the persistent note store and the note tools."""
+
+import sys
+import os
+import asyncio
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import my_agent_system  # noqa: F401  (sets up the package import paths)
+from google.adk.agents import Agent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.tools import FunctionTool, ToolContext, agent_tool
+
+from llm.fake_llm import FakeLlm
+from my_agent_system.services.runner_service import RunnerService
+from shared.note_store import NoteStore
+from tools import session_tools
+
+
+def test_save_get_and_replace(tmp_path):
+    """Notes are keyed by user, session and name, and persist on disk."""
+    path = str(tmp_path / "notes.db")
+    store = NoteStore(path)
+    first = store.save("alice", "s1", "topic", "quantum computing")
+    assert store.save("alice", "s1", "topic", "quantum error correction") == first
+    store.save("alice", "s2", "topic", "fusion energy")
+    store.save("bob", "s3", "topic", "bob's topic")
+
+    assert store.get("alice", "topic", session_id="s1")["content"] == "quantum error correction"
+    assert store.get("alice", "topic", session_id="s9")["content"] == "fusion energy"
+    assert store.get("carol", "topic") is None
+    store.close()
+
+    reopened = NoteStore(path)
+    assert reopened.stats()["notes"] == 3
+    assert reopened.delete("alice", "s2", "topic")
+    assert reopened.get("alice", "topic")["session_id"] == "s1"
+
+
+def test_full_text_search_is_scoped_to_the_user():
+    """Search matches words in names and contents of the user's notes only."""
+    store = NoteStore()
+    store.save("alice", "s1", "physics", "Qubits lose coherence quickly.")
+    store.save("alice", "s2", "energy", "Fusion needs high temperatures.")
+    store.save("bob", "s3", "physics", "Qubits for bob.")
+
+    matches = store.search("alice", "qubits coherence")
+    assert [m["name"] for m in matches] == ["physics"]
+    assert "Qubits" in matches[0]["snippet"]
+    assert [m["name"] for m in store.search("alice", "energy")] == ["energy"]
+    assert store.search("alice", '"') == []
+
+
+def test_tools_keep_only_references_in_state(monkeypatch):
+    """save_note stores content in the note store and a reference in state."""
+    store = NoteStore()
+    monkeypatch.setattr(session_tools, "get_note_store", lambda: store)
+    agent = Agent(name="Notes", model="fake/test", instruction="Take notes.", tools=[
+        FunctionTool(func=session_tools.save_note),
+        FunctionTool(func=session_tools.get_note),
+        FunctionTool(func=session_tools.search_notes),
+    ])
+    service = RunnerService(agent)
+
+    async def _call(tool_name: str, args: dict, session_id: str):
+        session = await service.session_service.get_session(
+            app_name=service.app_name, user_id="alice", session_id=session_id
+        )
+        context = InvocationContext(
+            session_service=service.session_service, invocation_id="inv", agent=agent, session=session
+        )
+        tool_context = ToolContext(context)
+        result = getattr(session_tools, tool_name)(tool_context=tool_context, **args)
+        return result, tool_context.state.to_dict()
+
+    async def _main():
+        first = await service.create_session("alice")
+        second = await service.create_session("alice")
+        saved, state = await _call("save_note", {"note_name": "topic", "note_content": "Qubits " * 500}, first.id)
+        found, _ = await _call("get_note", {"note_name": "topic"}, second.id)
+        missing, _ = await _call("get_note", {"note_name": "nope"}, second.id)
+        searched, _ = await _call("search_notes", {"query": "qubits"}, second.id)
+        return saved, state, found, missing, searched
+
+    saved, state, found, missing, searched = asyncio.run(_main())
+    assert saved == "Note 'topic' saved successfully."
+    assert state["note_refs"] == {"topic": 1} and "notes" not in state
+    assert found["content"].startswith("Qubits")
+    assert "error" in missing
+    assert searched["matches"][0]["name"] == "topic"
+
+
+def test_notes_saved_through_an_agent_tool_belong_to_the_callers_session(monkeypatch):
+    """An AgentTool runs in its own session, but notes are keyed on the user's."""
+    store = NoteStore()
+    monkeypatch.setattr(session_tools, "get_note_store", lambda: store)
+    settings = {"rules": [
+        {"instruction": "note keeper", "function_call": {
+            "name": "save_note", "args": {"note_name": "topic", "note_content": "{input}"}}},
+        {"instruction": "delegator", "function_call": {"name": "MemoryAgent", "args": {"request": "{input}"}}},
+    ]}
+    monkeypatch.setattr(FakeLlm, "_settings", lambda self: settings)
+    memory = Agent(
+        name="MemoryAgent", model="fake/test", description="Saves notes.", instruction="You are a note keeper.",
+        tools=[FunctionTool(func=session_tools.save_note)],
+        before_agent_callback=session_tools.remember_note_session,
+    )
+    root = Agent(
+        name="Root", model="fake/test", instruction="You are a delegator.",
+        tools=[agent_tool.AgentTool(agent=memory)],
+        before_agent_callback=session_tools.remember_note_session,
+    )
+
+    async def _main():
+        service = RunnerService(root)
+        session = await service.create_session("alice")
+        result = await service.run_turn("alice", session.id, "fusion energy")
+        return session.id, result
+
+    session_id, result = asyncio.run(_main())
+    assert result.error is None
+    note = store.get("alice", "topic")
+    assert note["session_id"] == session_id and note["content"] == "fusion energy"
@@ -0,0 +1,79 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for the parallel fan-out research stage."""
+
+import sys
+import os
+import asyncio
+import json
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import my_agent_system  # noqa: F401  (sets up the package import paths)
+from google.adk.agents import Agent
+from google.adk.tools import agent_tool
+
+from agents.sub_agents.parallel_researcher import FanOutSearchAgent, parse_sub_questions
+from llm.fake_llm import FakeLlm
+from my_agent_system.services.runner_service import RunnerService
+
+
+def test_parse_sub_questions_json_and_lists():
+    """Planner output is accepted as JSON or as a Markdown list."""
+    assert parse_sub_questions('```json\n["a?", "b?", "a?"]\n```', 5) == ["a?", "b?"]
+    assert parse_sub_questions("1. first?\n2) second?\n- third?", 2) == ["first?", "second?"]
+    assert parse_sub_questions(None, 3) == []
+
+
+def test_fan_out_runs_searches_concurrently(monkeypatch):
+    """Searches overlap, but never more than max_concurrency at once."""
+    settings = {"latency": {"distribution": "fixed", "mean_ms": 50}}
+    monkeypatch.setattr(FakeLlm, "_settings", lambda self: settings)
+    in_flight = [0]
+    peak = [0]
+    original = agent_tool.AgentTool.run_async
+
+    async def _counting_run_async(self, **kwargs):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        try:
+            return await original(self, **kwargs)
+        finally:
+            in_flight[0] -= 1
+
+    monkeypatch.setattr(agent_tool.AgentTool, "run_async", _counting_run_async)
+    search = Agent(name="SearchAgent", model="fake/test", instruction="Answer the question.")
+    fan_out = FanOutSearchAgent(
+        name="FanOutSearchAgent",
+        search_tool=agent_tool.AgentTool(agent=search),
+        max_concurrency=3,
+    )
+    questions = ["q1?", "q2?", "q3?", "q4?", "q5?", "q6?"]
+
+    async def _main():
+        service = RunnerService(fan_out)
+        session = await service.create_session("user", state={"research_questions": json.dumps(questions)})
+        result = await service.run_turn("user", session.id, "topic")
+        stored = await service.session_service.get_session(
+            app_name=service.app_name, user_id="user", session_id=session.id
+        )
+        return result, stored.state
+
+    result, state = asyncio.run(_main())
+    assert result.error is None
+    assert all(f"### {q}" in result.text for q in questions)
+    assert state["research_output"] == result.text
+    assert peak[0] == 3 and in_flight[0] == 0
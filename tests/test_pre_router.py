@@ -0,0 +1,132 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for the rule-based pre-router in front of OrchestratorAgent."""
+
+import sys
+import os
+import asyncio
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import my_agent_system  # noqa: F401  (sets up the package import paths)
+from google.adk.agents import Agent
+from google.adk.tools import agent_tool
+
+from llm.fake_llm import FakeLlm
+from my_agent_system.services.runner_service import RunnerService
+from shared.pre_router import NaiveBayesClassifier, PreRouter
+
+
+def test_rules_classifier_and_fallback():
+    """Rules win, a confident classifier dispatches, anything else falls back."""
+    router = PreRouter(rules=[{"pattern": r"(?i)^define\b", "target": "SearchAgent"}])
+    assert router.route("What is 17 * 23?")[:2] == ("CodingAgent", "rule")
+    assert router.route("Research solar power adoption")[:2] == ("ModularResearchAssistant", "rule")
+    assert router.route("Define entropy")[:2] == ("SearchAgent", "rule")
+    assert router.route("Who is the president of France?")[:2] == ("SearchAgent", "classifier")
+    assert router.route("hello")[1] == "fallback"
+    assert PreRouter(use_classifier=False).route("Who is the president of France?") == (None, "fallback", 0.0)
+
+
+def test_research_and_prose_requests_are_not_sent_to_coding():
+    """Year ranges, hyphenated numbers and prose verbs never hit the coding rules."""
+    router = PreRouter()
+    for text in (
+        "Research the 2008-2009 financial crisis",
+        "Research how to run a Python program on AWS Lambda",
+    ):
+        assert router.route(text)[:2] == ("ModularResearchAssistant", "rule")
+    for text in (
+        "Who won the 2022-23 Premier League?",
+        "Evaluate the 2024 election results",
+        "Convert this text to French",
+        "2008-2009",
+        "555-123-4567",
+    ):
+        target, source, _ = router.route(text)
+        assert source != "rule" and not (target == "CodingAgent" and source == "classifier"), text
+    assert router.route("12 * (3 + 4)")[:2] == ("CodingAgent", "rule")
+
+
+def test_classifier_probabilities_and_evaluation():
+    """Posteriors are probabilities, and evaluate() reports coverage and accuracy."""
+    classifier = NaiveBayesClassifier([("apples and pears", "fruit"), ("cars and trucks", "vehicle")])
+    label, confidence = classifier.predict("pears")
+    assert label == "fruit" and 0.5 < confidence <= 1.0
+
+    report = PreRouter().evaluate([
+        ("Compute 2 ** 10", "CodingAgent"),
+        ("Analyze trends in global shipping", "ModularResearchAssistant"),
+        ("Who invented the telephone?", "SearchAgent"),
+        ("hello", "SearchAgent"),
+    ])
+    assert report == {"examples": 4, "coverage": 0.75, "accuracy": 1.0}
+
+
+def _orchestrator(router: PreRouter) -> Agent:
+    search = Agent(name="SearchAgent", model="fake/test", description="Searches.", instruction="Answer.")
+    return Agent(
+        name="OrchestratorAgent",
+        model="fake/test",
+        instruction="You are a master orchestrator.",
+        tools=[agent_tool.AgentTool(agent=search)],
+        **router.callbacks(),
+    )
+
+
+def _run(agent: Agent, text: str, monkeypatch) -> tuple:
+    calls = []
+    original = FakeLlm._build_content
+
+    def _recording_build_content(self, llm_request, rules):
+        calls.append(llm_request)
+        return original(self, llm_request, rules)
+
+    monkeypatch.setattr(FakeLlm, "_build_content", _recording_build_content)
+
+    async def _main():
+        service = RunnerService(agent)
+        session = await service.create_session("user")
+        return await service.run_turn("user", session.id, text)
+
+    return asyncio.run(_main()), calls
+
+
+def test_dispatch_skips_orchestrator_model_calls(monkeypatch):
+    """A routed request reaches the tool and returns its answer directly."""
+    router = PreRouter()
+    result, calls = _run(_orchestrator(router), "Who is the president of France?", monkeypatch)
+
+    assert result.error is None
+    assert "Response to: Who is the president of France?" in result.text
+    # Only SearchAgent called a model; the orchestrator made no model calls
+    assert len(calls) == 1 and "master orchestrator" not in calls[0].config.system_instruction
+    stats = router.stats()
+    assert (stats["classifier"], stats["model_calls_saved"]) == (1, 2)
+    assert stats["targets"] == {"SearchAgent": 1}
+
+
+def test_uncertain_requests_fall_back_to_the_model(monkeypatch):
+    """The model routes uncertain requests and is checked against the local guess."""
+    router = PreRouter()
+    result, calls = _run(_orchestrator(router), "hello", monkeypatch)
+
+    assert result.error is None
+    assert any("master orchestrator" in str(c.config.system_instruction) for c in calls)
+    stats = router.stats()
+    assert stats["fallback"] == 1 and stats["model_calls_saved"] == 0
+    assert stats["shadow_checks"] == 1 and stats["shadow_accuracy"] == 1.0
+    assert stats["llm_route_ms_mean"] is not None
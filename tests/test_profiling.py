@@ -0,0 +1,95 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for per-request profiling."""
+
+import sys
+import os
+import asyncio
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import my_agent_system  # noqa: F401  (sets up the package import paths)
+from opentelemetry import propagate
+
+from my_agent_system.services.runner_service import RunnerService
+from shared import profiling
+from shared.tracing import extract_context
+
+
+def _settings(monkeypatch, tmp_path, **overrides):
+    settings = {"enabled": True, "output_dir": str(tmp_path), "sessions": [], "sample_rate": 0.0}
+    settings.update(overrides)
+    monkeypatch.setattr(profiling, "_settings", lambda: settings)
+    return settings
+
+
+def test_turns_are_profiled_on_request_or_by_session(monkeypatch, tmp_path, echo_agent):
+    """Requested turns and listed sessions are profiled; other turns are not."""
+    settings = _settings(monkeypatch, tmp_path)
+
+    async def _main():
+        service = RunnerService(echo_agent(delay=0.01))
+        session = await service.create_session("user")
+        requested = await service.run_turn("user", session.id, "one", profile=True)
+        unprofiled = await service.run_turn("user", session.id, "two")
+        settings["sessions"] = [session.id]
+        listed = await service.run_turn("user", session.id, "three")
+        return requested, unprofiled, listed
+
+    requested, unprofiled, listed = asyncio.run(_main())
+    assert requested.text == "one" and unprofiled.text == "two"
+    assert unprofiled.profile_path is None
+    for result in (requested, listed):
+        assert os.path.dirname(result.profile_path) == str(tmp_path)
+        assert os.path.basename(result.profile_path).startswith("turn-")
+        with open(result.profile_path[:-len(".prof")] + ".txt", encoding="utf-8") as f:
+            assert "function calls" in f.read()
+    assert requested.profile_path != listed.profile_path
+
+
+def test_profile_request_travels_with_the_trace_context(monkeypatch, tmp_path):
+    """MCP calls made while a turn is profiled ask the server for a profile."""
+    _settings(monkeypatch, tmp_path, enabled=False)
+    # McpTool sends the global propagator's headers in the request's _meta field
+    meta = {}
+    with profiling.profile_request("abc", "turn"):
+        propagate.get_global_textmap().inject(carrier=meta)
+    server_context = extract_context(meta)
+    assert profiling.profile_requested(server_context)
+    assert profiling.should_profile(requested=True if profiling.profile_requested(server_context) else None)
+
+    meta = {}
+    propagate.get_global_textmap().inject(carrier=meta)
+    assert not profiling.profile_requested(extract_context(meta))
+    assert not profiling.should_profile(requested=None)
+
+
+def test_one_profile_at_a_time_and_old_profiles_pruned(monkeypatch, tmp_path):
+    """Nested requests are not profiled, and only max_profiles files are kept."""
+    _settings(monkeypatch, tmp_path, max_profiles=2)
+    paths = []
+    for index in range(3):
+        with profiling.profile_request(f"request-{index}", "mcp") as outer:
+            with profiling.profile_request(f"nested-{index}", "mcp") as inner:
+                sum(range(1000))
+        assert inner.skipped and inner.path is None
+        paths.append(outer.path)
+        # Distinct modification times for the pruning order
+        os.utime(outer.path, (index, index))
+
+    remaining = sorted(name for name in os.listdir(tmp_path) if name.endswith(".prof"))
+    assert remaining == ["mcp-request-1.prof", "mcp-request-2.prof"]
+    assert not os.path.exists(paths[0][:-len(".prof")] + ".txt")
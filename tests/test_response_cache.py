@@ -0,0 +1,131 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for the semantic response cache."""
+
+import sys
+import os
+import asyncio
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import my_agent_system  # noqa: F401  (sets up the package import paths)
+from google.adk.agents import Agent
+
+from agents.sub_agents.responder import is_valid_final_response
+from llm.fake_llm import FakeLlm
+from my_agent_system.services.runner_service import RunnerService
+from shared.response_cache import HashingVectorizer, SemanticResponseCache
+
+RESPONSE = '{"summary": "Qubits are improving.", "sources": ["https://example.com"]}'
+
+
+def test_near_duplicate_prompts_hit():
+    """Rephrasings of the same prompt are served; unrelated prompts miss."""
+    cache = SemanticResponseCache(similarity_threshold=0.8)
+    cache.store("Research", "Research quantum computing developments", RESPONSE)
+
+    match = cache.lookup("Research", "research the quantum computing developments please")
+    assert match is not None and match[0] == RESPONSE
+    assert cache.lookup("Research", "Research renewable energy adoption") is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_scopes_ttl_and_eviction():
+    """Entries are isolated per scope, expire, and are capped per scope."""
+    cache = SemanticResponseCache(max_entries=2)
+    cache.store("A", "quantum computing", RESPONSE)
+    assert cache.lookup("B", "quantum computing") is None
+
+    cache.store("A", "renewable energy", "2")
+    cache.store("A", "solar panels", "3")
+    assert cache.stats()["entries"] == {"A": 2}
+    assert cache.lookup("A", "quantum computing") is None
+    assert cache.lookup("A", "solar panels")[0] == "3"
+
+    expiring = SemanticResponseCache(ttl_seconds=0)
+    expiring.store("A", "quantum computing", RESPONSE)
+    assert expiring.lookup("A", "quantum computing") is None
+
+
+def test_embeddings_are_normalized():
+    """Embeddings have unit length, so dot products are cosine similarities."""
+    vector = HashingVectorizer(64).transform("quantum quantum computing")
+    assert abs(float(vector @ vector) - 1.0) < 1e-5
+    assert not HashingVectorizer(64).transform("the of and").any()
+
+
+def test_final_response_validation():
+    """Only complete FinalResponse JSON, optionally fenced, is cacheable."""
+    assert is_valid_final_response(RESPONSE)
+    assert is_valid_final_response(f"```json\n{RESPONSE}\n```")
+    assert not is_valid_final_response('{"summary": "no sources"}')
+    assert not is_valid_final_response("not json")
+
+
+def test_cache_hit_skips_the_agent(monkeypatch):
+    """A near-duplicate prompt is answered without calling the model."""
+    model_calls = []
+    original = FakeLlm._build_content
+
+    def _counting_build_content(self, llm_request, rules):
+        model_calls.append(llm_request)
+        return original(self, llm_request, rules)
+
+    monkeypatch.setattr(FakeLlm, "_build_content", _counting_build_content)
+    cache = SemanticResponseCache(similarity_threshold=0.8, validate=is_valid_final_response)
+    agent = Agent(
+        name="ResponderAgent",
+        model="fake/test",
+        instruction='Respond with JSON containing "summary" and "sources".',
+        output_key="final_response",
+        before_agent_callback=cache.before_agent_callback,
+        after_agent_callback=cache.after_agent_callback,
+    )
+
+    async def _main():
+        service = RunnerService(agent)
+        results = []
+        for text in ["Research quantum computing developments",
+                     "Please research the quantum computing developments"]:
+            session = await service.create_session("user")
+            results.append(await service.run_turn("user", session.id, text))
+        return results
+
+    first, second = asyncio.run(_main())
+    assert len(model_calls) == 1
+    assert is_valid_final_response(first.text)
+    assert second.text == first.text
+
+
+def test_stale_responses_from_earlier_turns_are_not_cached():
+    """A final_response left in the session by an earlier turn is not stored."""
+    cache = SemanticResponseCache(similarity_threshold=0.8)
+    agent = Agent(
+        name="ResponderAgent",
+        model="fake/test",
+        instruction="Answer briefly.",
+        after_agent_callback=cache.after_agent_callback,
+    )
+
+    async def _main():
+        service = RunnerService(agent)
+        session = await service.session_service.create_session(
+            app_name=service.app_name, user_id="user", state={"final_response": RESPONSE}
+        )
+        return await service.run_turn("user", session.id, "Research renewable energy adoption")
+
+    assert asyncio.run(_main()).error is None
+    assert cache.stats()["entries"] == {}
@@ -0,0 +1,65 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for the concurrent RunnerService."""
+
+import sys
+import os
+import asyncio
+
+import pytest
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from my_agent_system.services.runner_service import RunnerService, SessionBusyError
+
+
+def test_sessions_run_concurrently(echo_agent):
+    """Independent sessions overlap instead of running back to back."""
+    agent = echo_agent(delay=0.2, prefix="echo: ")
+
+    async def _main():
+        service = RunnerService(agent, max_concurrency=10)
+        turns = []
+        for i in range(10):
+            session = await service.create_session(f"user_{i}")
+            turns.append((f"user_{i}", session.id, f"hello {i}"))
+        results = await service.run_many(turns)
+        return service, results
+
+    service, results = asyncio.run(_main())
+    assert [r.text for r in results] == [f"echo: hello {i}" for i in range(10)]
+    summary = service.stats.summary()
+    assert summary["completed"] == 10
+    # All ten turns were in flight at once
+    assert agent.peak == 10
+    assert summary["ttfe_p50_ms"] is not None
+
+
+def test_per_session_backpressure_rejects_excess_turns(echo_agent):
+    """Turns beyond max_pending_per_session are rejected for that session."""
+    async def _main():
+        service = RunnerService(echo_agent(delay=0.2, prefix="echo: "), max_pending_per_session=2)
+        session = await service.create_session("user")
+        first = asyncio.ensure_future(service.run_turn("user", session.id, "one"))
+        second = asyncio.ensure_future(service.run_turn("user", session.id, "two"))
+        await asyncio.sleep(0)
+        with pytest.raises(SessionBusyError):
+            await service.run_turn("user", session.id, "three")
+        return service, await asyncio.gather(first, second)
+
+    service, results = asyncio.run(_main())
+    assert [r.text for r in results] == ["echo: one", "echo: two"]
+    assert service.stats.rejected == 1
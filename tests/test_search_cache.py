@@ -0,0 +1,115 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for the SearchAgent result cache."""
+
+import sys
+import os
+import asyncio
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import my_agent_system  # noqa: F401  (sets up the package import paths)
+from google.adk.agents import Agent
+
+from agents.sub_agents.search_agent import SearchAgent
+from llm.fake_llm import FakeLlm
+from my_agent_system.services.runner_service import RunnerService
+from shared.search_cache import SearchCache, normalize_query
+
+
+def test_normalized_queries_share_entries():
+    """Case, whitespace and trailing punctuation do not change the key."""
+    cache = SearchCache()
+    cache.set("What is ADK?", "An agent framework.")
+    assert normalize_query("  what   is ADK ") == "what is adk"
+    assert cache.get("what is  adk") == "An agent framework."
+    assert cache.stats()["hits"] == 1
+
+
+def test_ttl_and_lru_eviction():
+    """Expired entries miss and the least recently used entry is evicted."""
+    cache = SearchCache(ttl_seconds=0, max_entries=2)
+    cache.set("a", "1")
+    assert cache.get("a") is None
+
+    cache = SearchCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_sqlite_persistence_is_shared(tmp_path):
+    """A second cache on the same SQLite file sees earlier answers."""
+    path = str(tmp_path / "search.db")
+    SearchCache(sqlite_path=path).set("query", "answer")
+    assert SearchCache(sqlite_path=path).get("QUERY") == "answer"
+
+
+def test_repeated_search_skips_the_model(monkeypatch):
+    """The second identical query is answered without any model call."""
+    model_calls = []
+    original = FakeLlm._build_content
+
+    def _counting_build_content(self, llm_request, rules):
+        model_calls.append(llm_request)
+        return original(self, llm_request, rules)
+
+    monkeypatch.setattr(FakeLlm, "_build_content", _counting_build_content)
+    cache = SearchCache()
+    agent = Agent(
+        name="SearchAgent",
+        model="fake/test",
+        instruction="Answer questions.",
+        before_model_callback=cache.before_model_callback,
+        after_model_callback=cache.after_model_callback,
+    )
+
+    async def _main():
+        service = RunnerService(agent)
+        results = []
+        for text in ["Who wrote Hamlet?", "who wrote hamlet"]:
+            session = await service.create_session("user")
+            results.append(await service.run_turn("user", session.id, text))
+        return results
+
+    first, second = asyncio.run(_main())
+    assert len(model_calls) == 1
+    assert first.text == second.text
+    assert cache.stats()["hits"] == 1
+
+
+def test_search_agent_rebuilds_the_cache_when_its_settings_change(monkeypatch, tmp_path):
+    """A config reload with new search_cache settings replaces the cache."""
+    agent = SearchAgent()
+    settings = {"enabled": True, "ttl_seconds": 5, "max_entries": 3, "sqlite_path": str(tmp_path / "s.db")}
+    config = dict(agent.config, search_cache=settings)
+    monkeypatch.setattr(SearchAgent, "_load_config", classmethod(lambda cls: config))
+
+    built = agent.create_agent(use_cache=False)
+    cache = agent.search_cache
+    assert (cache.ttl_seconds, cache.max_entries) == (5, 3)
+    assert cache.before_model_callback in built.before_model_callback
+    agent.create_agent(use_cache=False)
+    assert agent.search_cache is cache
+
+    config["search_cache"] = dict(settings, enabled=False)
+    disabled = agent.create_agent(use_cache=False)
+    assert agent.search_cache is not cache
+    assert agent.search_cache.before_model_callback not in (disabled.before_model_callback or [])
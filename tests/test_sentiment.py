@@ -0,0 +1,80 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for the batch sentiment analyzer and its tools."""
+
+import sys
+import os
+import asyncio
+
+import numpy as np
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import my_agent_system  # noqa: F401  (sets up the package import paths)
+from tools import sentiment
+from tools.custom_tools import batch_sentiment_analyzer, sentiment_analyzer
+from tools.sentiment import SentimentAnalyzer, load_lexicon
+
+
+def test_whole_words_and_weights():
+    """Lexicon words only match whole words and are weighted."""
+    analyzer = SentimentAnalyzer()
+    results = analyzer.analyze_batch([
+        "It is unlikely to be badly received.",
+        "I love it, but the battery is bad.",
+        "This is TERRIBLE and awful!",
+        "",
+    ])
+    assert [r["sentiment"] for r in results] == ["neutral", "positive", "negative", "neutral"]
+    # love (2.0) against bad (1.0): 2 / (2 + 1 + 1)
+    assert results[1]["score"] == 0.5
+    assert results[1]["explanation"] == "Identified 1 positive and 1 negative sentiment words."
+    assert results[2]["score"] == -0.8
+
+
+def test_batch_matches_single_text_scoring():
+    """Scoring a batch gives the same results as scoring texts one at a time."""
+    analyzer = SentimentAnalyzer()
+    texts = [f"review {i}: " + ("great " * (i % 3)) + ("poor " * (i % 4)) for i in range(200)]
+    batch = analyzer.analyze_batch(texts)
+    assert batch == [analyzer.analyze(text) for text in texts]
+    assert analyzer.analyze_batch([]) == []
+    assert analyzer.score_batch([])["score"].shape == (0,)
+    # Small batches are scored per text, with the same results as NumPy
+    vectorized = SentimentAnalyzer(min_batch=0)
+    assert analyzer.analyze_batch(texts[:5]) == vectorized.analyze_batch(texts[:5])
+    small, full = analyzer.score_batch(texts[:5]), vectorized.score_batch(texts[:5])
+    assert all(np.array_equal(small[key], full[key]) for key in full)
+    # A text holding the internal separator token does not shift the others
+    assert vectorized.analyze_batch(["good \x00 bad", "sad"])[1]["sentiment"] == "negative"
+
+
+def test_lexicon_is_extensible(tmp_path, monkeypatch):
+    """Words can be added from a file and inline, and removed with weight 0."""
+    path = tmp_path / "lexicon.yaml"
+    path.write_text("superb: 2\nmeh: -0.5\n")
+    lexicon = load_lexicon({'lexicon_path': str(path), 'lexicon': {'like': 0}})
+    analyzer = SentimentAnalyzer(lexicon)
+    assert "like" not in analyzer.lexicon
+    assert [r["sentiment"] for r in analyzer.analyze_batch(["superb", "meh", "I like it"])] == [
+        "positive", "negative", "neutral"
+    ]
+
+    monkeypatch.setattr(sentiment.config_service, "get", lambda *args, **kwargs: {'lexicon': {'superb': 2}})
+    single = asyncio.run(sentiment_analyzer("A superb result"))
+    batch = asyncio.run(batch_sentiment_analyzer(["A superb result", "So sad", "Fine"]))
+    assert single["sentiment"] == "positive"
+    assert batch["summary"] == {"positive": 1, "negative": 1, "neutral": 1}
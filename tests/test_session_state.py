@@ -0,0 +1,113 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for session state size accounting and eviction."""
+
+import sys
+import os
+import asyncio
+import time
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import my_agent_system  # noqa: F401  (sets up the package import paths)
+from google.adk.agents import Agent
+from google.adk.events import Event, EventActions
+from google.adk.sessions import Session
+
+from my_agent_system.services.runner_service import RunnerService
+from shared.session_state import SessionStateManager, value_size
+
+
+def test_age_size_and_lru_eviction():
+    """Stale and oversized evictable keys go first, then the least recently updated."""
+    manager = SessionStateManager(max_total_bytes=200, max_key_bytes=120, max_age_seconds=60)
+    state = {
+        'analysis': 'a' * 50,
+        'final_response': 'f' * 150,
+        'research_output': 'r' * 50,
+        'research_findings': 'k' * 50,
+        'user_profile': 'p' * 100,
+        'budget:SearchAgent': {'turns': 1},
+    }
+    updated = {'analysis': 900.0, 'final_response': 990.0, 'research_output': 995.0,
+               'research_findings': 999.0, 'user_profile': 0.0, 'budget:SearchAgent': 999.0}
+
+    delta = manager.plan(state, updated, now=1000.0)
+    # analysis is stale and final_response oversized; research_output is then
+    # the least recently updated key while the state is over its cap
+    assert delta == {'analysis': None, 'final_response': None, 'research_output': None}
+    assert manager.stats()['evictions'] == {'age': 1, 'size': 1, 'lru': 1}
+
+    # Keys that are not evictable are never touched
+    assert manager.plan({'user_profile': 'p' * 1000}, {}, now=1000.0) == {}
+    assert value_size({'a': 'é'}) == len('{"a": "é"}'.encode('utf-8'))
+
+
+def test_note_refs_are_trimmed_to_the_most_recent():
+    """Only the most recently saved note references are kept."""
+    manager = SessionStateManager(max_note_refs=2)
+    delta = manager.plan({'note_refs': {'a': 1, 'b': 2, 'c': 3}}, {})
+    assert delta == {'note_refs': {'b': 2, 'c': 3}}
+
+
+def test_keys_written_by_archived_events_still_age_out():
+    """Keys no live event wrote are dated to the oldest live event."""
+    manager = SessionStateManager(max_total_bytes=120, max_age_seconds=60)
+    events = [
+        Event(author='Analyst', timestamp=1000.0,
+              actions=EventActions(state_delta={'research_output': 'r' * 50})),
+        Event(author='Analyst', timestamp=1030.0,
+              actions=EventActions(state_delta={'final_response': 'f' * 50})),
+    ]
+    # analysis was written by an event that has since been archived
+    state = {'analysis': 'a' * 50, 'research_output': 'r' * 50, 'final_response': 'f' * 50}
+    session = Session(id='s', app_name='app', user_id='user', state=state,
+                      events=events, last_update_time=1030.0)
+
+    # Over the size cap, the undated key is the least recently updated
+    assert manager.plan(state, {'research_output': 1000.0, 'final_response': 1030.0},
+                        now=1030.0, undated=1000.0) == {'analysis': None}
+    # Once the oldest live event is stale, so is the undated key
+    manager.max_total_bytes = 0
+    manager.max_age_seconds = time.time() - 1000.0
+    assert manager.enforce(session) == {'analysis': None, 'research_output': None}
+
+
+def test_eviction_runs_after_the_turn_and_report():
+    """The root agent's after_agent_callback evicts and the report reflects it."""
+    manager = SessionStateManager(max_key_bytes=10)
+    agent = Agent(
+        name="Analyst",
+        model="fake/test",
+        instruction="Analyze the request.",
+        output_key="analysis",
+        after_agent_callback=manager.after_agent_callback,
+    )
+
+    async def _main():
+        service = RunnerService(agent)
+        session = await service.create_session("user", state={'user_profile': 'keep me'})
+        await service.run_turn("user", session.id, "Analyze quantum computing")
+        return await service.session_service.get_session(
+            app_name=service.app_name, user_id="user", session_id=session.id
+        )
+
+    session = asyncio.run(_main())
+    assert session.state['analysis'] is None
+    report = manager.report(session)
+    assert list(report['keys']) == ['user_profile']
+    assert report['keys']['user_profile'] == {'bytes': 9, 'age_s': None, 'evictable': False}
+    assert report['events'] == len(session.events) and report['event_bytes'] > 0
@@ -0,0 +1,159 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for the SQLite-backed session service."""
+
+import sys
+import os
+import asyncio
+import sqlite3
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from google.adk.agents import BaseAgent
+from google.adk.events import Event, EventActions
+from google.adk.sessions import InMemorySessionService
+from google.adk.sessions.base_session_service import GetSessionConfig
+from google.genai import types
+
+from my_agent_system.services.runner_service import RunnerService
+from my_agent_system.services.sqlite_session_service import (
+    SqliteSessionService,
+    create_session_service,
+)
+from shared.config import config_service
+
+APP = "app"
+
+
+class CounterAgent(BaseAgent):
+    """A model-free agent that counts its turns in session state."""
+
+    async def _run_async_impl(self, ctx):
+        turns = ctx.session.state.get("turns", 0) + 1
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            content=types.Content(role="model", parts=[types.Part(text=f"turn {turns}")]),
+            actions=EventActions(state_delta={"turns": turns}),
+        )
+
+
+def _event(index: int, delta: dict) -> Event:
+    return Event(author="agent", invocation_id=f"inv-{index}", timestamp=1000.0 + index,
+                 actions=EventActions(state_delta=delta))
+
+
+def test_state_scopes_and_snapshots_survive_reopening(tmp_path):
+    """Session, user and app state are restored from snapshots plus recent deltas."""
+    path = str(tmp_path / "sessions.db")
+
+    async def _write():
+        service = SqliteSessionService(path, snapshot_interval=4, batch_size=8)
+        session = await service.create_session(
+            app_name=APP, user_id="u", session_id="s1", state={"topic": "qubits", "user:name": "Ada"}
+        )
+        for i in range(1, 11):
+            await service.append_event(session, _event(i, {"count": i, "temp:scratch": i, "app:version": i}))
+        await service.create_session(app_name=APP, user_id="u", session_id="s2")
+        service.close()
+        return session
+
+    async def _read():
+        service = SqliteSessionService(path)
+        full = await service.get_session(app_name=APP, user_id="u", session_id="s1")
+        recent = await service.get_session(app_name=APP, user_id="u", session_id="s1",
+                                           config=GetSessionConfig(num_recent_events=3))
+        since = await service.get_session(app_name=APP, user_id="u", session_id="s1",
+                                          config=GetSessionConfig(after_timestamp=1009.0))
+        other = await service.get_session(app_name=APP, user_id="u", session_id="s2")
+        snapshots = service._db.execute("SELECT seq FROM snapshots WHERE session_id = 's1'").fetchall()
+        listed = await service.list_sessions(app_name=APP, user_id="u")
+        await service.delete_session(app_name=APP, user_id="u", session_id="s2")
+        missing = await service.get_session(app_name=APP, user_id="u", session_id="s2")
+        return full, recent, since, other, snapshots, listed, missing
+
+    written = asyncio.run(_write())
+    full, recent, since, other, snapshots, listed, missing = asyncio.run(_read())
+
+    assert [seq for (seq,) in snapshots] == [0, 4, 8]
+    assert full.state == {"topic": "qubits", "count": 10, "user:name": "Ada", "app:version": 10}
+    assert full.state == {k: v for k, v in written.state.items() if not k.startswith("temp:")}
+    assert [e.invocation_id for e in full.events] == [f"inv-{i}" for i in range(1, 11)]
+    assert [e.invocation_id for e in recent.events] == ["inv-8", "inv-9", "inv-10"]
+    assert recent.state == full.state
+    assert [e.invocation_id for e in since.events] == ["inv-9", "inv-10"]
+    assert other.state == {"user:name": "Ada", "app:version": 10}
+    assert [s.id for s in listed.sessions] == ["s1", "s2"]
+    assert missing is None
+
+
+def test_runner_resumes_sessions_after_restart(tmp_path, monkeypatch):
+    """A new RunnerService over the same database continues existing sessions."""
+    settings = {'backend': 'sqlite', 'sqlite': {'path': str(tmp_path / "sessions.db"), 'batch_size': 100}}
+    assert isinstance(create_session_service({}), InMemorySessionService)
+    # Relative paths are resolved against the directory of config.yaml
+    monkeypatch.setattr(config_service, 'path', str(tmp_path / "config.yaml"))
+    relative = create_session_service({'backend': 'sqlite', 'sqlite': {'path': "data/other.db"}})
+    assert relative.path == str(tmp_path / "data" / "other.db")
+    relative.close()
+
+    async def _turn(session_id=None):
+        service = RunnerService.from_config(CounterAgent(name="Counter"), {'session_service': settings})
+        if session_id is None:
+            session_id = (await service.create_session("u")).id
+        result = await service.run_turn("u", session_id, "count")
+        # The turn's events are committed when it ends, not when the batch fills
+        with sqlite3.connect(settings['sqlite']['path']) as reader:
+            committed = reader.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+        await service.close()
+        return session_id, result.text, committed
+
+    session_id, first, committed = asyncio.run(_turn())
+    _, second, _ = asyncio.run(_turn(session_id))
+    assert (first, second) == ("turn 1", "turn 2")
+    assert committed >= 2
+
+
+def test_old_events_are_archived_and_loads_stay_small(tmp_path):
+    """Loads read the latest snapshot plus live events; older events are archived."""
+    async def _main():
+        service = SqliteSessionService(str(tmp_path / "sessions.db"), snapshot_interval=4, keep_events=3)
+        session = await service.create_session(app_name=APP, user_id="u", session_id="s")
+        for i in range(1, 13):
+            await service.append_event(session, _event(i, {"count": i}))
+        loaded = await service.get_session(app_name=APP, user_id="u", session_id="s")
+        archived = await service.get_archived_events(app_name=APP, user_id="u", session_id="s")
+        snapshots = service._db.execute("SELECT seq FROM snapshots").fetchall()
+        for i in range(13, 15):
+            await service.append_event(session, _event(i, {"count": i}))
+        moved = await service.compact_session(app_name=APP, user_id="u", session_id="s")
+        compacted = await service.get_session(app_name=APP, user_id="u", session_id="s")
+        return service, loaded, archived, snapshots, moved, compacted
+
+    service, loaded, archived, snapshots, moved, compacted = asyncio.run(_main())
+    assert [e.invocation_id for e in loaded.events] == ["inv-10", "inv-11", "inv-12"]
+    assert loaded.state == {"count": 12}
+    assert [e.invocation_id for e in archived] == [f"inv-{i}" for i in range(1, 10)]
+    assert [seq for (seq,) in snapshots] == [8, 12]
+    assert moved == 2
+    assert [e.invocation_id for e in compacted.events] == ["inv-12", "inv-13", "inv-14"]
+    assert compacted.state == {"count": 14}
+
+    stats = service.rehydration.summary()
+    assert stats["loads"] == 3
+    # 3 live events, then 5 before compact_session archived two, then 3
+    assert stats["events_decoded_per_load"] == round(11 / 3, 1)
+    assert stats["load_p50_ms"] is not None
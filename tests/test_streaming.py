@@ -0,0 +1,94 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for streaming responses and the incremental JSON parser."""
+
+import sys
+import os
+import asyncio
+import json
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import my_agent_system  # noqa: F401  (sets up the package import paths)
+from google.adk.agents import Agent
+from google.adk.agents.run_config import StreamingMode
+
+from llm.fake_llm import FakeLlm
+from my_agent_system.services.runner_service import RunnerService
+from shared.streaming_json import IncrementalJsonParser
+
+RESPONSE = {
+    "summary": 'Qubits "entangle" \\ cool — 😀\nNew line  and   spaces',
+    "sources": ["https://example.com/a", "https://example.com/{b}"],
+    "confidence": 0.9,
+    "extra": {"nested": [1, None, True, "]"]},
+}
+
+
+def _feed(text: str, chunk_size: int):
+    parser = IncrementalJsonParser()
+    events = []
+    for i in range(0, len(text), chunk_size):
+        events.extend(parser.feed(text[i:i + chunk_size]))
+    return parser, events
+
+
+def test_parser_matches_json_loads_for_any_chunking():
+    """Streamed deltas and completed fields match a full parse."""
+    texts = [json.dumps(RESPONSE), json.dumps(RESPONSE, ensure_ascii=False, indent=2),
+             "```json\n" + json.dumps(RESPONSE) + "\n```"]
+    for text in texts:
+        for chunk_size in (1, 2, 5, 64, len(text)):
+            parser, events = _feed(text, chunk_size)
+            assert parser.close() == RESPONSE
+            assert "".join(e.delta for e in events if e.key == "summary") == RESPONSE["summary"]
+            assert [e.key for e in events if e.complete] == list(RESPONSE)
+
+
+def test_summary_is_available_before_the_object_completes():
+    """The summary streams out while sources are still being generated."""
+    text = json.dumps(RESPONSE)
+    cut = text.index("https://example.com/a")
+    parser, events = _feed(text[:cut], 3)
+    assert parser.values == {"summary": RESPONSE["summary"]}
+    assert not parser.done
+    try:
+        parser.close()
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("close() should reject an incomplete object")
+
+
+def test_streaming_runner_reports_time_to_first_token(monkeypatch):
+    """With streaming enabled, partial text arrives before the turn finishes."""
+    monkeypatch.setattr(FakeLlm, "_settings", lambda self: {"tokens_per_second": 200})
+    agent = Agent(name="Responder", model="fake/test", instruction="Reply with a long answer.")
+    service = RunnerService.from_config(agent, {"runner": {"streaming": True}})
+    assert service.run_config.streaming_mode == StreamingMode.SSE
+
+    async def _main():
+        session = await service.create_session("user")
+        partials = []
+        async for event in service.stream_turn("user", session.id, "Tell me about qubits " * 10):
+            partials.append(event.partial)
+        result = await service.run_turn("user", session.id, "Tell me about qubits " * 10)
+        return partials, result
+
+    partials, result = asyncio.run(_main())
+    assert partials.count(True) > 5 and partials[-1] is not True
+    assert result.time_to_first_token < result.duration / 2
+    assert service.stats.summary()["ttft_p50_ms"] is not None
@@ -0,0 +1,103 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for tool call result memoization."""
+
+import sys
+import os
+import asyncio
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import my_agent_system  # noqa: F401  (sets up the package import paths)
+from google.adk.tools import FunctionTool
+
+from agents.sub_agents.tool_demo import tool_demo_agent
+from shared.tool_cache import MemoizedFunctionTool, ToolResultCache, memoize_tools
+
+calls = []
+
+
+def lookup(table: str, columns: list) -> dict:
+    """Look up rows of a table."""
+    calls.append((table, columns))
+    if table == "missing":
+        return {"success": False, "message": "no such table"}
+    return {"success": True, "rows": [{"table": table}]}
+
+
+def save_note(name: str) -> dict:
+    """Save a note."""
+    calls.append(name)
+    return {"saved": name}
+
+
+def test_lru_eviction_and_per_tool_ttl():
+    """Argument order does not matter; TTLs apply per tool; the LRU entry goes first."""
+    cache = ToolResultCache(max_entries=2, tool_ttl_seconds={"volatile": 0})
+    cache.set("lookup", {"a": 1, "b": [1, 2]}, {"rows": 1})
+    assert cache.get("lookup", {"b": [1, 2], "a": 1}) == (True, {"rows": 1})
+    assert not cache.is_cacheable("volatile") and not cache.is_cacheable("save_note")
+
+    cache.set("lookup", {"a": 2}, "two")
+    cache.get("lookup", {"a": 1, "b": [1, 2]})
+    cache.set("lookup", {"a": 3}, "three")
+    assert cache.get("lookup", {"a": 2}) == (False, None)
+    assert cache.get("lookup", {"a": 1, "b": [1, 2]})[0]
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["tools"]["lookup"] == {"hits": 3, "misses": 1}
+
+    # A configured exclude list adds to the built-in one
+    configured = ToolResultCache.from_config({"exclude": ["lookup"]})
+    assert not configured.is_cacheable("lookup") and not configured.is_cacheable("save_note")
+
+    expiring = ToolResultCache(ttl_seconds=-1)
+    expiring.set("lookup", {}, "stale")
+    assert expiring.get("lookup", {}) == (False, None) and expiring.stats()["expirations"] == 1
+
+
+def test_memoized_tools_skip_errors_and_excluded_tools():
+    """Hits skip the function, errors are recomputed and save_note always runs."""
+    cache = ToolResultCache()
+    tools = memoize_tools([FunctionTool(func=lookup), FunctionTool(func=save_note)], cache)
+    assert isinstance(tools[0], MemoizedFunctionTool) and type(tools[1]) is FunctionTool
+    assert tools[0]._get_declaration().name == "lookup"
+
+    async def _main():
+        calls.clear()
+        for _ in range(3):
+            result = await tools[0].run_async(args={"table": "t", "columns": ["a"]}, tool_context=None)
+            result["rows"].append("mutated by the caller")
+            await tools[0].run_async(args={"table": "missing", "columns": []}, tool_context=None)
+            await tools[1].run_async(args={"name": "n"}, tool_context=None)
+        return await tools[0].run_async(args={"columns": ["a"], "table": "t"}, tool_context=None)
+
+    assert asyncio.run(_main()) == {"success": True, "rows": [{"table": "t"}]}
+    assert calls.count(("t", ["a"])) == 1
+    assert calls.count(("missing", [])) == 3 and calls.count("n") == 3
+    assert cache.invalidate(["lookup"]) == 1 and cache.stats()["entries"] == 0
+
+
+def test_agents_memoize_their_function_tools(monkeypatch):
+    """Agents built by BaseAgent wrap cacheable tools only when the cache is enabled."""
+    cache = ToolResultCache()
+    monkeypatch.setattr("shared.tool_cache.get_tool_cache", lambda: cache)
+    tools = {tool.name: tool for tool in tool_demo_agent.create_agent(use_cache=False).tools}
+    assert isinstance(tools["sentiment_analyzer"], MemoizedFunctionTool)
+    assert type(tools["convert_data_file"]) is FunctionTool
+
+    monkeypatch.setattr("shared.tool_cache.get_tool_cache", lambda: None)
+    tools = tool_demo_agent.create_agent(use_cache=False).tools
+    assert all(type(tool) is FunctionTool for tool in tools)
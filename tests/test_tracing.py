@@ -0,0 +1,112 @@
+# Copyright 2025 Praveen Rachamreddy
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for per-request tracing."""
+
+import sys
+import os
+import asyncio
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import my_agent_system  # noqa: F401  (sets up the package import paths)
+from google.adk.agents import Agent
+from google.adk.tools import FunctionTool
+from opentelemetry import propagate
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+
+from llm.fake_llm import FakeLlm
+from my_agent_system.services.runner_service import RunnerService
+from shared.tracing import (
+    JsonLinesSpanExporter,
+    extract_context,
+    folded_stacks,
+    format_trace_tree,
+    inject_context,
+    load_spans,
+)
+
+
+def lookup_weather(city: str) -> dict:
+    """Return the weather for a city."""
+    return {"city": city, "forecast": "sunny"}
+
+
+def test_turn_trace_covers_agent_model_and_tool_spans(monkeypatch):
+    """A turn's spans form one tree under run_turn, ready for a flame graph."""
+    settings = {"rules": [{
+        "instruction": "weather bot",
+        "function_call": {"name": "lookup_weather", "args": {"city": "{input}"}},
+    }]}
+    monkeypatch.setattr(FakeLlm, "_settings", lambda self: settings)
+    agent = Agent(
+        name="WeatherAgent",
+        model="fake/test",
+        instruction="You are a weather bot.",
+        tools=[FunctionTool(func=lookup_weather)],
+    )
+
+    async def _main():
+        service = RunnerService.from_config(agent, {"tracing": {"enabled": True, "exporters": []}})
+        session = await service.create_session("user")
+        return service, await service.run_turn("user", session.id, "Paris")
+
+    service, result = asyncio.run(_main())
+    assert result.error is None and result.trace_id
+    spans = service.trace_collector.trace(result.trace_id)
+    names = {span["name"] for span in spans}
+    assert {"run_turn", "invoke_agent WeatherAgent", "call_llm", "execute_tool lookup_weather"} <= names
+
+    tree = format_trace_tree(spans).splitlines()
+    assert tree[0].startswith("run_turn ")
+    assert any(line.startswith("  ") and "invoke_agent WeatherAgent" in line for line in tree)
+    stacks = [line.rsplit(" ", 1)[0] for line in folded_stacks(spans)]
+    assert all(stack.startswith("run_turn") for stack in stacks)
+    assert any(stack.endswith(";execute_tool lookup_weather") for stack in stacks)
+
+
+def test_trace_context_round_trip_through_mcp_meta():
+    """The context ADK's McpTool sends in ``_meta`` continues the trace on the server."""
+    tracer = TracerProvider().get_tracer(__name__)
+    with tracer.start_as_current_span("execute_tool query_db_table") as client:
+        # What McpTool.run_async puts in the request's _meta field
+        meta = {}
+        propagate.get_global_textmap().inject(carrier=meta)
+        assert meta == inject_context()
+    with tracer.start_as_current_span("mcp.call_tool", context=extract_context(meta)) as server:
+        pass
+    assert server.context.trace_id == client.context.trace_id
+    assert server.parent.span_id == client.context.span_id
+
+    # Outside a recorded span nothing is sent
+    assert inject_context() == {}
+
+
+def test_file_exporter_writes_json_lines(tmp_path):
+    """Spans are appended as JSON lines that load back into a latency tree."""
+    path = str(tmp_path / "traces" / "spans.jsonl")
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(JsonLinesSpanExporter(path, max_attribute_length=8)))
+    tracer = provider.get_tracer(__name__)
+    with tracer.start_as_current_span("run_turn"):
+        with tracer.start_as_current_span("call_llm", attributes={"llm.request": "x" * 100}):
+            pass
+
+    spans = load_spans(path)
+    assert [span["name"] for span in spans] == ["call_llm", "run_turn"]
+    assert spans[0]["parent_id"] == spans[1]["span_id"]
+    assert spans[0]["attributes"]["llm.request"] == "x" * 8 + "..."
+    assert format_trace_tree(spans).splitlines()[1].startswith("  call_llm ")